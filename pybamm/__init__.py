@@ -64,7 +64,7 @@ PARAMETER_PATH = [
 #
 # Utility classes and methods
 #
-from .util import Timer, TimerTime, FuzzyDict
+from .util import Timer, TimerTime, FuzzyDict, LazyFuzzyDict
 from .util import root_dir, load_function, rmse, get_infinite_nested_dict, load
 from .util import get_parameters_filepath
 from .logger import logger, set_logging_level
@@ -107,10 +107,24 @@ if system() != "Windows":
     from .expression_tree.operations.evaluate import EvaluatorJax
     from .expression_tree.operations.evaluate import JaxCooMatrix
 
+from .expression_tree.operations.evaluate_numba import (
+    EvaluatorNumba,
+    have_numba,
+    set_numba_cache,
+)
+
 from .expression_tree.operations.jacobian import Jacobian
 from .expression_tree.operations.convert_to_casadi import CasadiConverter
 from .expression_tree.operations.unpack_symbols import SymbolUnpacker
 from .expression_tree.operations.replace_symbols import SymbolReplacer
+from .expression_tree.operations.common_subexpressions import (
+    CommonSubexpressionEliminator,
+    count_distinct_nodes,
+)
+from .expression_tree.operations.matrix_chains import (
+    MatrixChainOptimiser,
+    count_flops,
+)
 
 #
 # Model classes
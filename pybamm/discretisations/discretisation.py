@@ -1,6 +1,7 @@
 #
 # Interface for discretisation
 #
+import copy
 import pybamm
 import numpy as np
 from collections import defaultdict, OrderedDict
@@ -197,11 +198,10 @@ class Discretisation(object):
         model_disc.initial_conditions = ics
         model_disc.concatenated_initial_conditions = concat_ics
 
-        # Discretise variables (applying boundary conditions)
+        # Keep the variables to discretise them (applying boundary conditions) later
         # Note that we **do not** discretise the keys of model.rhs,
         # model.initial_conditions and model.boundary_conditions
-        pybamm.logger.verbose("Discretise variables for {}".format(model.name))
-        model_disc.variables = self.process_dict(model.variables)
+        variables = model.variables
 
         # Process parabolic and elliptic equations
         pybamm.logger.verbose("Discretise model equations for {}".format(model.name))
@@ -209,6 +209,22 @@ class Discretisation(object):
         model_disc.rhs, model_disc.concatenated_rhs = rhs, concat_rhs
         model_disc.algebraic, model_disc.concatenated_algebraic = alg, concat_alg
 
+        # Precompute the constant matrix chains of the equations evaluated by the
+        # solvers
+        if pybamm.settings.simplify:
+            pybamm.logger.verbose(
+                "Fold constant matrix chains for {}".format(model.name)
+            )
+            optimiser = pybamm.MatrixChainOptimiser()
+            model_disc.concatenated_rhs = optimiser.optimise(concat_rhs)
+            model_disc.concatenated_algebraic = optimiser.optimise(concat_alg)
+            pybamm.logger.info(
+                "Folding constant matrix chains reduced the flops per evaluation of "
+                "{} from {} to {}".format(
+                    model.name, optimiser.flops_before, optimiser.flops_after
+                )
+            )
+
         # Process events
         processed_events = []
         pybamm.logger.verbose("Discretise events for {}".format(model.name))
@@ -225,6 +241,13 @@ class Discretisation(object):
             self.process_symbol(var) for var in model.external_variables
         ]
 
+        # Discretise the variables lazily, the first time they are accessed, since
+        # usually only a few of them are used
+        pybamm.logger.verbose("Set up variables for {}".format(model.name))
+        model_disc.variables = pybamm.LazyFuzzyDict(
+            variables, self._copy_for_variables().process_symbol
+        )
+
         # Create mass matrix
         pybamm.logger.verbose("Create mass matrix for {}".format(model.name))
         model_disc.mass_matrix, model_disc.mass_matrix_inv = self.create_mass_matrix(
@@ -771,6 +794,20 @@ class Discretisation(object):
 
         return jac, jac_rhs, jac_algebraic
 
+    def _copy_for_variables(self):
+        """
+        Return a copy of the discretisation, with its own boundary conditions, slices
+        and discretised symbols, to discretise the variables of the model that has
+        just been discretised. The copy is not affected if this discretisation is used
+        again (e.g. to discretise another model).
+        """
+        disc = copy.copy(self)
+        disc.bcs = dict(self.bcs)
+        disc.y_slices = dict(self.y_slices)
+        disc.external_variables = dict(self.external_variables)
+        disc._discretised_symbols = dict(self._discretised_symbols)
+        return disc
+
     def process_dict(self, var_eqn_dict):
         """Discretise a dictionary of {variable: equation}, broadcasting if necessary
         (can be model.rhs, model.algebraic, model.initial_conditions or
@@ -3,7 +3,7 @@
 #
 import numpy as np
 import pybamm
-from scipy.sparse import issparse, csr_matrix
+from scipy.sparse import csr_matrix
 
 
 class Array(pybamm.Symbol):
@@ -23,7 +23,8 @@ class Array(pybamm.Symbol):
     auxiliary_domainds : dict, optional
         dictionary of auxiliary domains, defaults to empty dict
     entries_string : str
-        String representing the entries (slow to recalculate when copying)
+        String identifying the entries, see :func:`pybamm.entries_digest` (slow to
+        recalculate when copying)
 
     *Extends:* :class:`Symbol`
     """
@@ -73,15 +74,11 @@ class Array(pybamm.Symbol):
         if value is not None:
             self._entries_string = value
         else:
-            entries = self._entries
-            if issparse(entries):
-                self._entries_string = str(entries.__dict__)
-            else:
-                self._entries_string = entries.tobytes()
+            self._entries_string = pybamm.entries_digest(self._entries)
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()`. """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name, self.entries_string) + tuple(self.domain)
         )
 
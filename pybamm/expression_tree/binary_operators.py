@@ -158,6 +158,13 @@ class BinaryOperator(pybamm.Symbol):
         right = self.children[1].evaluate_for_shape()
         return self._binary_evaluate(left, right)
 
+    def _shape_from_children(self, children_shapes):
+        """
+        Default behaviour: elementwise operation, so children are broadcast together
+        See :meth:`pybamm.Symbol._shape_from_children()`
+        """
+        return pybamm.elementwise_shape(*children_shapes)
+
     def _binary_jac(self, left_jac, right_jac):
         """ Calculate the jacobian of a binary operator. """
         raise NotImplementedError
@@ -350,6 +357,17 @@ class MatrixMultiplication(BinaryOperator):
         """ See :meth:`pybamm.BinaryOperator._binary_evaluate()`. """
         return left @ right
 
+    def _shape_from_children(self, children_shapes):
+        """ See :meth:`pybamm.Symbol._shape_from_children()`. """
+        left_shape, right_shape = children_shapes
+        if len(left_shape) != 2 or len(right_shape) != 2:
+            raise NotImplementedError
+        if left_shape[1] != right_shape[0]:
+            raise ValueError(
+                "dimension mismatch: {} @ {}".format(left_shape, right_shape)
+            )
+        return (left_shape[0], right_shape[1])
+
 
 class Division(BinaryOperator):
     """A node in the expression tree representing a division operator
@@ -643,6 +661,18 @@ class Maximum(BinaryOperator):
         return pybamm.maximum(left, right)
 
 
+def _without_domains(symbol):
+    """
+    Return `symbol` without domains. Symbols are shared by the expression trees that
+    use them, so the domains of a copy are cleared if necessary.
+    """
+    if symbol.domains == {"primary": []}:
+        return symbol
+    new_symbol = symbol.new_copy()
+    new_symbol.clear_domains()
+    return new_symbol
+
+
 def simplify_elementwise_binary_broadcasts(left, right):
     left, right = preprocess_binary(left, right)
 
@@ -890,7 +920,7 @@ def simplified_multiplication(left, right):
         l_left, l_right = left.orphans
         new_left = right * l_left
         # be careful about domains to avoid weird errors
-        new_left.clear_domains()
+        new_left = _without_domains(new_left)
         new_mul = new_left @ l_right
         # Keep the domain of the old left
         new_mul.copy_domains(left)
@@ -923,7 +953,7 @@ def simplified_multiplication(left, right):
         r_left, r_right = right.orphans
         new_left = left * r_left
         # be careful about domains to avoid weird errors
-        new_left.clear_domains()
+        new_left = _without_domains(new_left)
         new_mul = new_left @ r_right
         # Keep the domain of the old right
         new_mul.copy_domains(right)
@@ -986,7 +1016,7 @@ def simplified_division(left, right):
         new_left = l_left / right
         if new_left.is_constant():
             # be careful about domains to avoid weird errors
-            new_left.clear_domains()
+            new_left = _without_domains(new_left)
             new_division = new_left @ l_right
             # Keep the domain of the old left
             new_division.copy_domains(left)
@@ -1043,7 +1073,7 @@ def simplified_matrix_multiplication(left, right):
         r_left, r_right = right.orphans
         new_left = left @ r_left
         # be careful about domains to avoid weird errors
-        new_left.clear_domains()
+        new_left = _without_domains(new_left)
         new_mul = new_left @ r_right
         # Keep the domain of the old right
         new_mul.copy_domains(right)
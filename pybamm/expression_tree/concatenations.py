@@ -68,7 +68,7 @@ class Concatenation(pybamm.Symbol):
 
     def evaluate(self, t=None, y=None, y_dot=None, inputs=None, known_evals=None):
         """ See :meth:`pybamm.Symbol.evaluate()`. """
-        children = self.cached_children
+        children = self.children
         if known_evals is not None:
             if self.id not in known_evals:
                 children_eval = [None] * len(children)
@@ -109,6 +109,29 @@ class Concatenation(pybamm.Symbol):
                 [child.evaluate_for_shape() for child in self.children]
             )
 
+    def _shape_from_children(self, children_shapes):
+        """ See :meth:`pybamm.Symbol._shape_from_children()`. """
+        if len(children_shapes) == 0:
+            return (0,)
+        concatenation_function = self.concatenation_function or np.concatenate
+        if concatenation_function in (np.vstack, vstack):
+            # children are stacked as 2D arrays (see `np.atleast_2d`)
+            children_shapes = [
+                (1,) * (2 - len(shape)) + shape for shape in children_shapes
+            ]
+        elif concatenation_function is not np.concatenate:
+            raise NotImplementedError
+        if any(len(shape) == 0 for shape in children_shapes) or any(
+            shape[1:] != children_shapes[0][1:] for shape in children_shapes
+        ):
+            raise ValueError(
+                "cannot concatenate children of shapes {}".format(
+                    ", ".join(str(shape) for shape in children_shapes)
+                )
+            )
+        n_rows = sum(shape[0] for shape in children_shapes)
+        return (n_rows,) + children_shapes[0][1:]
+
     def is_constant(self):
         """ See :meth:`pybamm.Symbol.is_constant()`. """
         return all(child.is_constant() for child in self.children)
@@ -147,7 +170,7 @@ class NumpyConcatenation(Concatenation):
 
     def _concatenation_jac(self, children_jacs):
         """ See :meth:`pybamm.Concatenation.concatenation_jac()`. """
-        children = self.cached_children
+        children = self.children
         if len(children) == 0:
             return pybamm.Scalar(0)
         else:
@@ -206,7 +229,7 @@ class DomainConcatenation(Concatenation):
 
             # create disc of domain => slice for each child
             self._children_slices = [
-                self.create_slices(child) for child in self.cached_children
+                self.create_slices(child) for child in self.children
             ]
         else:
             self._full_mesh = copy.copy(copy_this._full_mesh)
@@ -67,6 +67,16 @@ class Function(pybamm.Symbol):
         out = out[:-2] + ")"
         return out
 
+    def _interns_as(self, other):
+        """ See :meth:`pybamm.Symbol._interns_as()`. """
+        # the id only contains the name of the function
+        return (
+            type(other) is type(self)
+            and other.function is self.function
+            and other.derivative == self.derivative
+            and other.differentiated_function is self.differentiated_function
+        )
+
     def get_children_domains(self, children_list):
         """Obtains the unique domain of the children. If the
         children have different domains then raise an error"""
@@ -194,6 +204,19 @@ class Function(pybamm.Symbol):
         evaluated_children = [child.evaluate_for_shape() for child in self.children]
         return self._function_evaluate(evaluated_children)
 
+    def _shape_from_children(self, children_shapes):
+        """
+        Numpy ufuncs (e.g. `np.exp`) act elementwise and `np.max`, `np.min` return a
+        number. The shape of any other function is found by evaluating it.
+        See :meth:`pybamm.Symbol._shape_from_children()`
+        """
+        if isinstance(self.function, np.ufunc):
+            return pybamm.elementwise_shape(*children_shapes)
+        elif self.function in (np.max, np.min):
+            return ()
+        else:
+            raise NotImplementedError
+
     def _function_evaluate(self, evaluated_children):
         return self.function(*evaluated_children)
 
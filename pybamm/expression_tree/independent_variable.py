@@ -108,6 +108,10 @@ class SpatialVariable(IndependentVariable):
             self.name, self.domain, self.auxiliary_domains, self.coord_sys
         )
 
+    def _interns_as(self, other):
+        """ See :meth:`pybamm.Symbol._interns_as()`. """
+        return type(other) is type(self) and other.coord_sys == self.coord_sys
+
 
 class SpatialVariableEdge(SpatialVariable):
     """A node in the expression tree representing a spatial variable, which evaluates
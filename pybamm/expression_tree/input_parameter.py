@@ -32,6 +32,10 @@ class InputParameter(pybamm.Symbol):
         new_input_parameter._expected_size = self._expected_size
         return new_input_parameter
 
+    def _interns_as(self, other):
+        """ See :meth:`pybamm.Symbol._interns_as()`. """
+        return type(other) is type(self) and other._expected_size == self._expected_size
+
     def set_expected_size(self, size):
         """Specify the size that the input parameter should be."""
         self._expected_size = size
@@ -40,6 +44,7 @@ class InputParameter(pybamm.Symbol):
         self._saved_size = size
         self._saved_shape = (size, 1)
         self._saved_evaluate_for_shape = self._evaluate_for_shape()
+        self._saved_shape_for_testing = np.shape(self._saved_evaluate_for_shape)
 
     def _evaluate_for_shape(self):
         """
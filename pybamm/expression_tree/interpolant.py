@@ -110,15 +110,15 @@ class Interpolant(pybamm.Function):
             name = "interpolating function ({})".format(name)
         else:
             name = "interpolating function"
+        # Store information as attributes
         self.x = x
         self.y = y
         self.entries_string = entries_string
+        self.interpolator = interpolator
+        self.extrapolate = extrapolate
         super().__init__(
             interpolating_function, *children, name=name, derivative="derivative"
         )
-        # Store information as attributes
-        self.interpolator = interpolator
-        self.extrapolate = extrapolate
 
     @property
     def entries_string(self):
@@ -132,17 +132,27 @@ class Interpolant(pybamm.Function):
         if value is not None:
             self._entries_string = value
         else:
-            self._entries_string = ""
-            for i, x in enumerate(self.x):
-                self._entries_string += "x" + str(i) + "_" + str(x.tobytes())
-            self._entries_string += "y_" + str(self.y.tobytes())
+            self._entries_string = pybamm.entries_digest(*self.x, self.y)
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()`. """
-        self._id = hash(
-            (self.__class__, self.name, self.entries_string) + tuple(self.domain)
+        self._id = pybamm.stable_hash(
+            (
+                self.__class__,
+                self.name,
+                self.entries_string,
+                self.interpolator,
+                self.extrapolate,
+            )
+            + tuple([child.id for child in self.children])
+            + tuple(self.domain)
         )
 
+    def _interns_as(self, other):
+        """ See :meth:`pybamm.Symbol._interns_as()`. """
+        # the id contains the data and options of the interpolant
+        return pybamm.Symbol._interns_as(self, other)
+
     def _function_new_copy(self, children):
         """ See :meth:`Function._function_new_copy()` """
         return pybamm.Interpolant(
@@ -0,0 +1,204 @@
+#
+# Eliminate common subexpressions from an expression tree
+#
+import pybamm
+import logging
+import numpy as np
+
+
+class CommonSubexpressionEliminator(object):
+    """
+    Helper class to put an expression tree in a canonical form, so that subexpressions
+    that are algebraically identical but were built in a different order (e.g.
+    ``a * b`` and ``b * a``, or ``c + (a * b)`` and ``(b * a) + c``) have the same id.
+    The code generated by :class:`pybamm.EvaluatorPython` and
+    :class:`pybamm.EvaluatorJax`, and the expressions created by
+    :class:`pybamm.CasadiConverter`, calculate each id only once, so each of these
+    subexpressions is then only calculated once. :meth:`pybamm.BaseSolver.set_up`
+    applies it to the equations of a model before converting them, and the
+    evaluators apply it when they are created with
+    `eliminate_common_subexpressions=True`.
+
+    The operands of sums and products are ordered by id. Chains of sums and products
+    are not reassociated, since this would change the rounding errors of the result.
+
+    Parameters
+    ----------
+    processed_symbols: dict {variable ids -> :class:`pybamm.Symbol`}, optional
+        cached canonical symbols
+    """
+
+    # binary operators whose operands can be swapped
+    _commutative_operators = (
+        pybamm.Addition,
+        pybamm.Multiplication,
+        pybamm.Minimum,
+        pybamm.Maximum,
+    )
+
+    def __init__(self, processed_symbols=None):
+        self._processed_symbols = processed_symbols or {}
+        self.nodes_before = 0
+        self.nodes_after = 0
+
+    @property
+    def nodes_removed(self):
+        """
+        The number of distinct subexpressions removed by all the calls to
+        :meth:`eliminate` while debug logging is enabled
+        """
+        return self.nodes_before - self.nodes_after
+
+    def eliminate(self, symbol):
+        """
+        Return the canonical form of `symbol`. If debug logging is enabled, the
+        number of distinct subexpressions of `symbol` before and after is logged and
+        added to :attr:`nodes_before` and :attr:`nodes_after`; they are not counted
+        otherwise, since this takes as long as putting `symbol` in canonical form.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The expression tree to process
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            The expression tree in canonical form
+        """
+        new_symbol = self.process_symbol(symbol)
+        if not pybamm.logger.isEnabledFor(logging.DEBUG):
+            return new_symbol
+        nodes_before = count_distinct_nodes(symbol)
+        nodes_after = count_distinct_nodes(new_symbol)
+        self.nodes_before += nodes_before
+        self.nodes_after += nodes_after
+        pybamm.logger.debug(
+            "Common subexpression elimination removed {} of {} nodes".format(
+                nodes_before - nodes_after, nodes_before
+            )
+        )
+        return new_symbol
+
+    def process_symbol(self, symbol):
+        """
+        This function recurses down the tree, putting each node in canonical form
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol to process
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            Symbol in canonical form. This is `symbol` itself if it is already in
+            canonical form
+        """
+        try:
+            return self._processed_symbols[symbol.id]
+        except KeyError:
+            processed_symbol = self._process_symbol(symbol)
+            self._processed_symbols[symbol.id] = processed_symbol
+            return processed_symbol
+
+    def _process_symbol(self, symbol):
+        """ See :meth:`CommonSubexpressionEliminator.process_symbol()`. """
+        children = symbol.children
+        new_children = [self.process_symbol(child) for child in children]
+        unchanged = all(new.id == old.id for new, old in zip(new_children, children))
+
+        if type(symbol) in self._commutative_operators:
+            return self._process_commutative(symbol, new_children, unchanged)
+
+        elif unchanged:
+            # nodes are immutable, so can be shared
+            return symbol
+
+        elif isinstance(symbol, pybamm.BinaryOperator):
+            # the tree has already been simplified, so the operator is created
+            # directly instead of with `_binary_new_copy`, which simplifies it again
+            new_symbol = type(symbol)(*new_children)
+            new_symbol.copy_domains(symbol)
+            return new_symbol
+
+        elif isinstance(symbol, pybamm.UnaryOperator):
+            return symbol._unary_new_copy(new_children[0])
+
+        elif isinstance(symbol, pybamm.Function):
+            return symbol._function_new_copy(new_children)
+
+        elif isinstance(symbol, pybamm.Concatenation):
+            return symbol._concatenation_new_copy(new_children)
+
+        else:
+            raise NotImplementedError(
+                "Cannot eliminate common subexpressions from symbol of type "
+                "'{}'".format(type(symbol))
+            )
+
+    def _process_commutative(self, symbol, new_children, unchanged):
+        """
+        Order the operands of a commutative operator by id. Swapping them doesn't
+        change the result, even in floating point arithmetic
+        """
+        left, right = new_children
+        # numpy matrices (e.g. sums of sparse and dense matrices) are multiplied with
+        # matrix products, whose order only matters if an operand has more than one
+        # column
+        if right.id < left.id and not (
+            isinstance(symbol, pybamm.Multiplication)
+            and any(_may_be_numpy_matrix(child) for child in new_children)
+        ):
+            left, right = right, left
+        elif unchanged:
+            return symbol
+        new_symbol = type(symbol)(left, right)
+        new_symbol.copy_domains(symbol)
+        return new_symbol
+
+
+def _may_be_numpy_matrix(symbol):
+    """
+    Whether `symbol` may evaluate to a numpy matrix with more than one column. Only
+    the operands with such a shape that are not matrices of the expression tree are
+    evaluated to find out.
+    """
+    shape = symbol.shape
+    if len(shape) != 2 or shape[1] == 1:
+        return False
+    if isinstance(symbol, pybamm.Matrix):
+        return isinstance(symbol.entries, np.matrix)
+    return isinstance(symbol.evaluate_for_shape(), np.matrix)
+
+
+def count_distinct_nodes(symbol):
+    """
+    Return the number of distinct nodes (i.e. with different ids) in an expression
+    tree, which is the number of subexpressions calculated by the code generated for
+    it by :class:`pybamm.EvaluatorPython`.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The expression tree
+
+    Returns
+    -------
+    int
+        The number of distinct nodes
+    """
+    return sum(1 for _ in _distinct_nodes(symbol))
+
+
+def _distinct_nodes(symbol):
+    """ Iterate over the nodes of an expression tree with different ids. """
+    seen = {symbol.id}
+    stack = [symbol]
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in node.children:
+            if child.id not in seen:
+                seen.add(child.id)
+                stack.append(child)
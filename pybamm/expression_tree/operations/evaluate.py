@@ -10,6 +10,13 @@ from collections import OrderedDict
 import numbers
 from platform import system
 
+try:
+    # the public API of scipy only returns the product of a sparse matrix and a
+    # vector in a new array
+    from scipy.sparse._sparsetools import csr_matvec
+except ImportError:  # pragma: no cover
+    csr_matvec = None
+
 if system() != "Windows":
     import jax
 
@@ -133,7 +140,9 @@ def is_scalar(arg):
         return np.all(np.array(arg.shape) == 1)
 
 
-def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
+def find_symbols(
+    symbol, constant_symbols, variable_symbols, output_jax=False, buffers=None
+):
     """
     This function converts an expression tree to a dictionary of node id's and strings
     specifying valid python code to calculate that nodes value, given y and t.
@@ -164,6 +173,12 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
         raises NotImplNotImplementedError if any SparseStack or Mat-Mat multiply
         operations are used
 
+    buffers: collections.OrderedDict, optional
+        If given, the dense vectors calculated by the code are written into arrays
+        that are preallocated once and added to `buffers`, a dictionary of symbol ids
+        to arrays, instead of new arrays at each evaluation (see
+        :func:`buffer_python_variable`)
+
     """
     # constant symbols that are not numbers are stored in a list of constants, which are
     # passed into the generated function constant symbols that are numbers are written
@@ -181,7 +196,7 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
 
     # process children recursively
     for child in symbol.children:
-        find_symbols(child, constant_symbols, variable_symbols, output_jax)
+        find_symbols(child, constant_symbols, variable_symbols, output_jax, buffers)
 
     # calculate the variable names that will hold the result of calculating the
     # children variables
@@ -291,6 +306,11 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
             symbol_str = "{}[{}:{}]".format(
                 children_vars[0], symbol.slice.start, symbol.slice.stop
             )
+        elif isinstance(
+            symbol, (pybamm.AbsoluteValue, pybamm.Sign, pybamm.Floor, pybamm.Ceiling)
+        ):
+            # the names of these operators are the names of the numpy functions
+            symbol_str = "np.{}({})".format(symbol.name, children_vars[0])
         else:
             symbol_str = symbol.name + children_vars[0]
 
@@ -379,10 +399,209 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
             "Not implemented for a symbol of type '{}'".format(type(symbol))
         )
 
+    if buffers is not None:
+        symbol_str = preallocated_str(
+            symbol, symbol_str, children_vars, constant_symbols, buffers
+        )
+
     variable_symbols[symbol.id] = symbol_str
 
 
-def to_python(symbol, debug=False, output_jax=False):
+def buffer_python_variable(symbol_id):
+    """
+    This function defines the format for the names of the preallocated arrays that
+    hold the values of the nodes calculated in place (see :func:`find_symbols`)
+    """
+    return "buf_{:05d}".format(symbol_id).replace("-", "m")
+
+
+# numpy ufuncs that calculate the elementwise operators, which can write their result
+# into a preallocated array with the `out` argument
+ELEMENTWISE_UFUNCS = {
+    pybamm.Addition: "add",
+    pybamm.Subtraction: "subtract",
+    pybamm.Multiplication: "multiply",
+    pybamm.Division: "divide",
+    pybamm.Power: "power",
+    pybamm.Minimum: "minimum",
+    pybamm.Maximum: "maximum",
+    pybamm.Negate: "negative",
+    pybamm.AbsoluteValue: "absolute",
+}
+
+
+def preallocated_str(symbol, symbol_str, children_vars, constant_symbols, buffers):
+    """
+    Return the code that calculates `symbol` in place, i.e. writes its value into an
+    array that is preallocated and added to `buffers`. If `symbol` can't be calculated
+    in place (e.g. its value is a sparse matrix), `symbol_str` is returned.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The symbol to calculate
+    symbol_str : str
+        The code that calculates `symbol` in a new array
+    children_vars : list of str
+        The variables that hold the values of the children of `symbol`
+    constant_symbols : collections.OrderedDict
+        The dictionary of constant symbol ids to values, see :func:`find_symbols`
+    buffers : collections.OrderedDict
+        The dictionary of symbol ids to preallocated arrays
+
+    Returns
+    -------
+    str
+        The code that calculates `symbol`
+    """
+    value = symbol.evaluate_for_shape()
+    if not _is_dense(value):
+        return symbol_str
+    children_values = [child.evaluate_for_shape() for child in symbol.children]
+    buffer_var = buffer_python_variable(symbol.id)
+
+    def elementwise():
+        return (
+            all(
+                isinstance(child_value, numbers.Number) or _is_dense(child_value)
+                for child_value in children_values
+            )
+            and np.broadcast(*children_values, value).shape == value.shape
+        )
+
+    if type(symbol) in ELEMENTWISE_UFUNCS and elementwise():
+        new_str = "np.{}({}, out={})".format(
+            ELEMENTWISE_UFUNCS[type(symbol)], ", ".join(children_vars), buffer_var
+        )
+
+    elif (
+        isinstance(symbol, pybamm.Function)
+        and isinstance(symbol.function, np.ufunc)
+        and symbol.function.nout == 1
+        and elementwise()
+    ):
+        new_str = "np.{}({}, out={})".format(
+            symbol.function.__name__, ", ".join(children_vars), buffer_var
+        )
+
+    elif isinstance(symbol, pybamm.MatrixMultiplication):
+        left, right = symbol.children
+        left_value, right_value = children_values
+        if not _is_dense(right_value):
+            return symbol_str
+        if (
+            scipy.sparse.issparse(left_value)
+            and left.id in constant_symbols
+            and constant_symbols[left.id].dtype == np.float64
+        ):
+            # sparse matrix-vector product into the preallocated vector
+            constant_symbols[left.id] = scipy.sparse.csr_matrix(
+                constant_symbols[left.id]
+            )
+            new_str = "matvec_into({}, {}, {})".format(
+                children_vars[0], children_vars[1], buffer_var
+            )
+        elif _is_dense(left_value):
+            new_str = "np.matmul({}, {}, out={})".format(
+                children_vars[0], children_vars[1], buffer_var
+            )
+        else:
+            return symbol_str
+
+    elif isinstance(symbol, pybamm.NumpyConcatenation) and len(children_vars) > 1:
+        # precomputed slices of the concatenated vector
+        sizes = [np.size(child_value, 0) for child_value in children_values]
+        stops = np.cumsum(sizes)
+        slices = tuple(slice(stop - size, stop) for size, stop in zip(sizes, stops))
+        new_str = "concatenate_into({}, {}, {})".format(
+            buffer_var,
+            _add_constant(constant_symbols, symbol, slices),
+            ", ".join(children_vars),
+        )
+
+    elif isinstance(symbol, pybamm.DomainConcatenation) and (
+        len(children_vars) > 1 or symbol.secondary_dimensions_npts > 1
+    ):
+        # precomputed indices of the entries of each child in the concatenated vector
+        indices = []
+        for child_value, slices in zip(children_values, symbol._children_slices):
+            child_indices = np.empty(np.size(child_value, 0), dtype=np.int64)
+            for child_dom, child_slice in slices.items():
+                for i, _slice in enumerate(child_slice):
+                    dom_slice = symbol._slices[child_dom][i]
+                    child_indices[_slice] = np.arange(dom_slice.start, dom_slice.stop)
+            indices.append(child_indices)
+        new_str = "scatter_into({}, {}, {})".format(
+            buffer_var,
+            _add_constant(constant_symbols, symbol, tuple(indices)),
+            ", ".join(children_vars),
+        )
+
+    else:
+        return symbol_str
+
+    buffers[symbol.id] = np.empty(value.shape)
+    return new_str
+
+
+def _is_dense(value):
+    return (
+        isinstance(value, np.ndarray)
+        and not isinstance(value, np.matrix)
+        and value.ndim > 0
+        and value.dtype == np.float64
+    )
+
+
+def _add_constant(constant_symbols, symbol, value):
+    """
+    Add `value`, which is used to calculate `symbol` in place, to the constants, and
+    return the name of its variable
+    """
+    constant_id = pybamm.stable_hash("preallocated", symbol.id)
+    constant_symbols[constant_id] = value
+    return id_to_python_variable(constant_id, True)
+
+
+def matvec_into(matrix, vector, out):
+    """
+    Write the product of a :class:`scipy.sparse.csr_matrix` and a column vector into
+    the preallocated column vector `out`, and return `out`. If the sparse kernel of
+    scipy can't be imported, the product is calculated with the public API of scipy
+    and copied into `out`
+    """
+    if csr_matvec is None:
+        out[...] = matrix @ vector
+        return out
+    out.fill(0)
+    vector = np.ascontiguousarray(vector, dtype=matrix.dtype)
+    csr_matvec(
+        matrix.shape[0],
+        matrix.shape[1],
+        matrix.indptr,
+        matrix.indices,
+        matrix.data,
+        vector.reshape(-1),
+        out.reshape(-1),
+    )
+    return out
+
+
+def concatenate_into(out, slices, *children):
+    """Write `children` into the `slices` of the preallocated vector `out`."""
+    for _slice, child in zip(slices, children):
+        out[_slice] = child
+    return out
+
+
+def scatter_into(out, indices, *children):
+    """Write `children` into the entries `indices` of the preallocated `out`."""
+    for child_indices, child in zip(indices, children):
+        out[child_indices] = child
+    return out
+
+
+def to_python(symbol, debug=False, output_jax=False, buffers=None):
     """
     This function converts an expression tree into a dict of constant input values, and
     valid python code that acts like the tree's :func:`pybamm.Symbol.evaluate` function
@@ -406,11 +625,14 @@ def to_python(symbol, debug=False, output_jax=False):
         If True, only numpy and jax operations will be used in the generated code.
         Raises NotImplNotImplementedError if any SparseStack or Mat-Mat multiply
         operations are used
+    buffers: collections.OrderedDict, optional
+        If given, the dense vectors are calculated in preallocated arrays, which are
+        added to `buffers`. See :func:`find_symbols`
 
     """
     constant_values = OrderedDict()
     variable_symbols = OrderedDict()
-    find_symbols(symbol, constant_values, variable_symbols, output_jax)
+    find_symbols(symbol, constant_values, variable_symbols, output_jax, buffers)
 
     line_format = "{} = {}"
 
@@ -444,20 +666,83 @@ class EvaluatorPython:
 
     symbol : :class:`pybamm.Symbol`
         The symbol to convert to python code
-
+    preallocate : bool, optional
+        If True, the dense vectors calculated by the code are written into arrays that
+        are allocated once, when the evaluator is created, with in-place numpy
+        functions (e.g. `np.add(a, b, out=buffer)`) and sparse matrix-vector
+        products, instead of into new arrays at each evaluation. Only the result is
+        copied, so it can be kept by the caller. If the shapes of `y`, `t` or the
+        inputs don't match those of the arrays, the vectors are calculated in new
+        arrays. Default is False.
+    eliminate_common_subexpressions : bool, optional
+        If True, the tree is first put in canonical form with
+        :class:`pybamm.CommonSubexpressionEliminator`, so that algebraically identical
+        subexpressions are only calculated once. :meth:`pybamm.BaseSolver.set_up`
+        already does this for the equations of a model. Default is False.
 
     """
 
-    def __init__(self, symbol):
+    def __init__(
+        self, symbol, preallocate=False, eliminate_common_subexpressions=False
+    ):
+        if eliminate_common_subexpressions:
+            # calculate algebraically identical subexpressions only once
+            symbol = pybamm.CommonSubexpressionEliminator().eliminate(symbol)
         constants, python_str = pybamm.to_python(symbol, debug=False)
 
+        # constants passed in as an ordered dict, convert to list
+        self._constants = list(constants.values())
+        python_str = self._function_str("evaluate", symbol, constants, python_str)
+
+        if preallocate:
+            # second version of the code, which calculates the dense vectors in place
+            buffers = OrderedDict()
+            constants_in_place, python_str_in_place = pybamm.to_python(
+                symbol, debug=False, buffers=buffers
+            )
+            # the preallocated arrays are passed in after the constants
+            self._constants_in_place = list(constants_in_place.values()) + list(
+                buffers.values()
+            )
+            python_str += "\n" + self._function_str(
+                "evaluate_in_place",
+                symbol,
+                constants_in_place,
+                python_str_in_place,
+                buffers,
+            )
+            # the preallocated arrays have the shapes for these sizes of the inputs
+            self._input_sizes = {
+                node.name: node._expected_size
+                for node in symbol.pre_order()
+                if isinstance(node, pybamm.InputParameter)
+            }
+        self._preallocate = preallocate
+
+        result_var = id_to_python_variable(symbol.id, symbol.is_constant())
+        self._python_str = python_str
+        self._result_var = result_var
+        self._symbol = symbol
+
+        # compile and run the generated python code,
+        compiled_function = compile(python_str, result_var, "exec")
+        exec(compiled_function)
+
+    def _function_str(self, name, symbol, constants, python_str, buffers=None):
+        """
+        Return the code of the function `name`, which calculates `symbol` with the
+        lines of code `python_str` generated by :func:`to_python`
+        """
         # extract constants in generated function
         for i, symbol_id in enumerate(constants.keys()):
             const_name = id_to_python_variable(symbol_id, True)
             python_str = "{} = constants[{}]\n".format(const_name, i) + python_str
-
-        # constants passed in as an ordered dict, convert to list
-        self._constants = list(constants.values())
+        for i, symbol_id in enumerate((buffers or {}).keys()):
+            buffer_name = buffer_python_variable(symbol_id)
+            python_str = (
+                "{} = constants[{}]\n".format(buffer_name, len(constants) + i)
+                + python_str
+            )
 
         # indent code
         python_str = "   " + python_str
@@ -465,8 +750,8 @@ class EvaluatorPython:
 
         # add function def to first line
         python_str = (
-            "def evaluate(constants, t=None, y=None, "
-            "y_dot=None, inputs=None, known_evals=None):\n" + python_str
+            "def {}(constants, t=None, y=None, "
+            "y_dot=None, inputs=None, known_evals=None):\n".format(name) + python_str
         )
 
         # calculate the final variable that will output the result of calling `evaluate`
@@ -478,19 +763,16 @@ class EvaluatorPython:
         # add return line
         if symbol.is_constant() and isinstance(result_value, numbers.Number):
             python_str = python_str + "\n   return " + str(result_value)
+        elif buffers and _is_dense(symbol.evaluate_for_shape()):
+            # the result may be (a view of) a preallocated array, which is overwritten
+            # at the next evaluation
+            python_str = python_str + "\n   return " + result_var + ".copy()"
         else:
             python_str = python_str + "\n   return " + result_var
 
         # store a copy of examine_jaxpr
-        python_str = python_str + "\nself._evaluate = evaluate"
-
-        self._python_str = python_str
-        self._result_var = result_var
-        self._symbol = symbol
-
-        # compile and run the generated python code,
-        compiled_function = compile(python_str, result_var, "exec")
-        exec(compiled_function)
+        python_str = python_str + "\nself._{0} = {0}".format(name)
+        return python_str
 
     def evaluate(self, t=None, y=None, y_dot=None, inputs=None, known_evals=None):
         """
@@ -500,7 +782,12 @@ class EvaluatorPython:
         if y is not None and y.ndim == 1:
             y = y.reshape(-1, 1)
 
-        result = self._evaluate(self._constants, t, y, y_dot, inputs, known_evals)
+        if self._preallocate and self._fits_preallocated(t, y, y_dot, inputs):
+            result = self._evaluate_in_place(
+                self._constants_in_place, t, y, y_dot, inputs, known_evals
+            )
+        else:
+            result = self._evaluate(self._constants, t, y, y_dot, inputs, known_evals)
 
         # don't need known_evals, but need to reproduce Symbol.evaluate signature
         if known_evals is not None:
@@ -508,12 +795,37 @@ class EvaluatorPython:
         else:
             return result
 
+    def _fits_preallocated(self, t, y, y_dot, inputs):
+        """
+        Whether the results can be calculated in the preallocated arrays, which have
+        the shapes for a scalar `t`, column vectors `y` and `y_dot`, and inputs of
+        their expected sizes (with vectors as columns)
+        """
+        if np.size(t) != 1:
+            return False
+        for vector in [y, y_dot]:
+            if vector is not None and (vector.ndim != 2 or vector.shape[1] != 1):
+                return False
+        for name, size in self._input_sizes.items():
+            try:
+                value = inputs[name]
+            except (KeyError, TypeError):
+                # let the evaluation raise the error
+                return False
+            if size == 1:
+                if np.size(value) != 1:
+                    return False
+            elif np.shape(value) != (size, 1):
+                return False
+        return True
+
     def __getstate__(self):
         # Control the state of instances of EvaluatorPython
         # before pickling. Method "_evaluate" cannot be pickled.
         # See https://github.com/pybamm-team/PyBaMM/issues/1283
         state = self.__dict__.copy()
         del state["_evaluate"]
+        state.pop("_evaluate_in_place", None)
         return state
 
     def __setstate__(self, state):
@@ -541,11 +853,18 @@ class EvaluatorJax:
 
     symbol : :class:`pybamm.Symbol`
         The symbol to convert to python code
-
+    eliminate_common_subexpressions : bool, optional
+        If True, the tree is first put in canonical form with
+        :class:`pybamm.CommonSubexpressionEliminator`, so that algebraically identical
+        subexpressions are only calculated once. :meth:`pybamm.BaseSolver.set_up`
+        already does this for the equations of a model. Default is False.
 
     """
 
-    def __init__(self, symbol):
+    def __init__(self, symbol, eliminate_common_subexpressions=False):
+        if eliminate_common_subexpressions:
+            # calculate algebraically identical subexpressions only once
+            symbol = pybamm.CommonSubexpressionEliminator().eliminate(symbol)
         constants, python_str = pybamm.to_python(symbol, debug=False, output_jax=True)
 
         # replace numpy function calls to jax numpy calls
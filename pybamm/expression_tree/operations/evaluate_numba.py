@@ -0,0 +1,657 @@
+#
+# Write a symbol to python code compiled with numba
+#
+import pybamm
+
+import hashlib
+import importlib.util
+import numbers
+import os
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse
+
+numba_spec = importlib.util.find_spec("numba")
+
+
+def have_numba():
+    return numba_spec is not None
+
+
+# default directory of the persistent cache of compiled functions, see
+# `set_numba_cache`
+_cache_dir = None
+
+
+def set_numba_cache(cache_dir):
+    """
+    Store the functions compiled by :class:`pybamm.EvaluatorNumba` (e.g. for the
+    solvers, when the model is in "numba" format) in a persistent cache in
+    `cache_dir`, so that new processes load them from disk instead of compiling them
+    again.
+
+    The generated code of each function is written to a module in `cache_dir`, whose
+    name is a hash of the code and of its constant arrays, and is compiled with
+    numba's `cache=True` option. Numba checks its version and the CPU when it loads a
+    compiled function, so the same directory can be shared by different models and
+    versions of numba.
+
+    Parameters
+    ----------
+    cache_dir : str or None
+        The directory of the cache, which is created if it doesn't exist. If None,
+        the functions are compiled in memory in each process (the default).
+    """
+    global _cache_dir
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+    _cache_dir = cache_dir
+
+
+# numpy ufuncs that calculate the elementwise operators
+ELEMENTWISE_UFUNCS = {
+    pybamm.Addition: "add",
+    pybamm.Subtraction: "subtract",
+    pybamm.Multiplication: "multiply",
+    pybamm.Inner: "multiply",
+    pybamm.Division: "divide",
+    pybamm.Power: "power",
+    pybamm.EqualHeaviside: "less_equal",
+    pybamm.NotEqualHeaviside: "less",
+    pybamm.Modulo: "remainder",
+    pybamm.Minimum: "minimum",
+    pybamm.Maximum: "maximum",
+    pybamm.Negate: "negative",
+    pybamm.AbsoluteValue: "absolute",
+    pybamm.Sign: "sign",
+    pybamm.Floor: "floor",
+    pybamm.Ceiling: "ceil",
+}
+
+
+class EvaluatorNumba:
+    """
+    Converts a pybamm expression tree into python code that will calculate the result
+    of calling `evaluate(t, y)` on the given expression tree, and compiles it with
+    numba's `njit`. The code is compiled the first time the evaluator is called.
+
+    The sparse matrices calculated by the code (e.g. in a Jacobian) are represented by
+    the array of their nonzero values only. Their sparsity pattern is computed once,
+    when the code is generated, along with the indices that map the nonzero values of
+    the children of each node to the nonzero values of the node. The pattern includes
+    all the entries that can be nonzero, so it is the same at each evaluation. Sparse
+    results are returned as :class:`scipy.sparse.csr_matrix`.
+
+    Column vectors are calculated as one-dimensional arrays, which numba compiles
+    much faster than two-dimensional arrays. Elementwise operations call small
+    functions that apply the numpy ufunc, which are compiled once for each combination
+    of argument types and shared by all the evaluators, rather than being compiled
+    into each generated function. Constant arrays are compiled into the code, so only
+    `t`, `y` and the inputs are passed to the compiled function.
+
+    Limitations: functions other than numpy ufuncs, :func:`pybamm.min` and
+    :func:`pybamm.max` (e.g. interpolants) can't be compiled, and raise a
+    NotImplementedError
+
+    Parameters
+    ----------
+
+    symbol : :class:`pybamm.Symbol`
+        The symbol to convert to python code
+    cache_dir : str, optional
+        The directory of the persistent cache of compiled functions. Default is the
+        directory set by :func:`pybamm.set_numba_cache`. If neither is set, the
+        function is compiled in memory.
+    eliminate_common_subexpressions : bool, optional
+        If True, the tree is first put in canonical form with
+        :class:`pybamm.CommonSubexpressionEliminator`, so that algebraically identical
+        subexpressions are only calculated once. :meth:`pybamm.BaseSolver.set_up`
+        already does this for the equations of a model. Default is False.
+
+    """
+
+    def __init__(self, symbol, cache_dir=None, eliminate_common_subexpressions=False):
+        if not have_numba():
+            raise ImportError("numba is not installed")
+
+        if eliminate_common_subexpressions:
+            # calculate algebraically identical subexpressions only once
+            symbol = pybamm.CommonSubexpressionEliminator().eliminate(symbol)
+
+        self._constants = OrderedDict()
+        self._variable_symbols = OrderedDict()
+        # sparsity patterns of the sparse nodes, as csr matrices in canonical format
+        self._patterns = {}
+        self._input_names = []
+        # functions of `numba_kernels` called by the generated code
+        self._kernels = set()
+        self._y_size = 0
+        self._symbol = symbol
+        self._cache_dir = cache_dir
+
+        if symbol.is_constant():
+            # nothing to compile
+            self._value = symbol.evaluate()
+            self._python_str = None
+            return
+        self._value = None
+
+        result_var = self._find_symbols(symbol)
+        self._python_str = self._function_str(result_var)
+        self._result_shape = np.shape(symbol.evaluate_for_shape())
+        pattern = self._patterns.get(symbol.id)
+        if pattern is not None:
+            self._result_pattern = (pattern.indices, pattern.indptr, pattern.shape)
+        else:
+            self._result_pattern = None
+        self._compile()
+
+    def _compile(self):
+        """Compile the generated code, which must be called `evaluate_numba`"""
+        constants = {
+            pybamm.id_to_python_variable(symbol_id, True): value
+            for symbol_id, value in self._constants.items()
+        }
+        cache_dir = self._cache_dir or _cache_dir
+        if cache_dir is not None:
+            self._evaluate = _load_cached_function(
+                cache_dir, self._python_str, sorted(self._kernels), constants
+            )
+            return
+
+        import numba
+        from pybamm.expression_tree.operations import numba_kernels
+
+        namespace = {"np": np, **constants}
+        for name in self._kernels:
+            namespace[name] = getattr(numba_kernels, name)
+        compiled_function = compile(self._python_str, "evaluate_numba", "exec")
+        exec(compiled_function, namespace)
+
+        # numpy's handling of division by zero, as in `Symbol.evaluate`
+        self._evaluate = numba.njit(error_model="numpy")(namespace["evaluate_numba"])
+
+    def _kernel_str(self, name, args):
+        """
+        Return the code that calls the function `name` of `numba_kernels`, e.g. the
+        function that applies a numpy ufunc
+        """
+        self._kernels.add(name)
+        return "{}({})".format(name, ", ".join(str(arg) for arg in args))
+
+    def _function_str(self, result_var):
+        """Return the code of the function that calculates the result"""
+        lines = [
+            "{} = {}".format(pybamm.id_to_python_variable(symbol_id), symbol_str)
+            for symbol_id, symbol_str in self._variable_symbols.items()
+        ]
+        lines.append("return {}".format(result_var))
+        args = ["t", "y"] + [_input_variable(i) for i in range(len(self._input_names))]
+        return "def evaluate_numba({}):\n   {}".format(
+            ", ".join(args), "\n   ".join(lines)
+        )
+
+    def _find_symbols(self, symbol):
+        """
+        Add the line of code that calculates `symbol`, and the lines of its children,
+        to the variable symbols, and return the name of the variable or constant that
+        holds its value
+        """
+        if symbol.is_constant():
+            return self._constant_str(symbol)
+        if symbol.id not in self._variable_symbols:
+            children_vars = [self._find_symbols(child) for child in symbol.children]
+            if scipy.sparse.issparse(symbol.evaluate_for_shape()):
+                symbol_str = self._sparse_str(symbol, children_vars)
+            else:
+                symbol_str = self._dense_str(symbol, children_vars)
+            self._variable_symbols[symbol.id] = symbol_str
+        return pybamm.id_to_python_variable(symbol.id)
+
+    def _constant_str(self, symbol):
+        """
+        Return the code for the value of a constant symbol. Numbers are written into
+        the code, and arrays are added to the constants. Sparse matrices are
+        represented by the array of their nonzero values.
+        """
+        value = symbol.evaluate()
+        if isinstance(value, numbers.Number):
+            return _number_str(value)
+        if scipy.sparse.issparse(value):
+            pattern = _canonical_csr(value)
+            self._patterns[symbol.id] = pattern
+            value = pattern.data
+        else:
+            value = np.ascontiguousarray(value, dtype=np.float64)
+            if _is_column(value):
+                value = value.reshape(-1)
+        return self._add_constant(symbol.id, value)
+
+    def _add_constant(self, constant_id, value):
+        self._constants[constant_id] = value
+        return pybamm.id_to_python_variable(constant_id, True)
+
+    def _add_index_constant(self, name, symbol, value):
+        """Add an array of indices computed when generating the code for `symbol`"""
+        constant_id = pybamm.stable_hash("numba", name, symbol.id)
+        return self._add_constant(constant_id, np.ascontiguousarray(value, np.int64))
+
+    def _dense_str(self, symbol, children_vars):
+        """Return the code that calculates the dense or scalar value of `symbol`"""
+        value = symbol.evaluate_for_shape()
+        if isinstance(value, np.matrix):
+            raise NotImplementedError(
+                "Cannot compile '{}' with numba, as it is a numpy matrix".format(
+                    symbol.name
+                )
+            )
+
+        if isinstance(symbol, pybamm.MatrixMultiplication):
+            left, right = symbol.children
+            if left.id in self._patterns:
+                pattern = self._patterns[left.id]
+                return self._kernel_str(
+                    "csr_matvec",
+                    [
+                        self._add_index_constant("indptr", left, pattern.indptr),
+                        self._add_index_constant("indices", left, pattern.indices),
+                        children_vars[0],
+                        children_vars[1],
+                        pattern.shape[0],
+                    ],
+                )
+            if _is_column(left.evaluate_for_shape()):
+                # the right child is a 1x1 array
+                return "{} * {}".format(*children_vars)
+            return "np.dot({}, np.ascontiguousarray({}))".format(*children_vars)
+
+        elif type(symbol) in ELEMENTWISE_UFUNCS:
+            return self._kernel_str(ELEMENTWISE_UFUNCS[type(symbol)], children_vars)
+
+        elif isinstance(symbol, pybamm.Index):
+            if symbol.slice.step not in (None, 1):
+                raise NotImplementedError("Index with a step is not implemented")
+            return "{}[{}:{}]".format(
+                children_vars[0], symbol.slice.start, symbol.slice.stop
+            )
+
+        elif isinstance(symbol, pybamm.Function):
+            function = symbol.function
+            if isinstance(function, np.ufunc):
+                return self._kernel_str(function.__name__, children_vars)
+            elif function in (np.min, np.max):
+                # numba only reduces arrays
+                if isinstance(symbol.children[0].evaluate_for_shape(), numbers.Number):
+                    return children_vars[0]
+                return "np.{}({})".format(function.__name__, children_vars[0])
+            raise NotImplementedError(
+                "Cannot compile function '{}' with numba. Use the 'python' or "
+                "'casadi' format instead".format(symbol.name)
+            )
+
+        elif isinstance(symbol, pybamm.NumpyConcatenation):
+            if len(children_vars) == 1:
+                return children_vars[0]
+            # scalars are concatenated as arrays of size 1
+            children_vars = [
+                "np.full(1, {})".format(child_var)
+                if isinstance(child.evaluate_for_shape(), numbers.Number)
+                else child_var
+                for child, child_var in zip(symbol.children, children_vars)
+            ]
+            return "np.concatenate(({},))".format(", ".join(children_vars))
+
+        elif isinstance(symbol, pybamm.DomainConcatenation):
+            if len(children_vars) == 1 and symbol.secondary_dimensions_npts == 1:
+                return children_vars[0]
+            # same ordering as the code generated by `pybamm.find_symbols`
+            slice_starts = []
+            all_child_vectors = []
+            for i in range(symbol.secondary_dimensions_npts):
+                child_vectors = []
+                for child_var, slices in zip(children_vars, symbol._children_slices):
+                    for child_dom, child_slice in slices.items():
+                        slice_starts.append(symbol._slices[child_dom][i].start)
+                        child_vectors.append(
+                            "{}[{}:{}]".format(
+                                child_var, child_slice[i].start, child_slice[i].stop
+                            )
+                        )
+                all_child_vectors.extend(
+                    [v for _, v in sorted(zip(slice_starts, child_vectors))]
+                )
+            return "np.concatenate(({},))".format(", ".join(all_child_vectors))
+
+        elif isinstance(symbol, pybamm.StateVector):
+            self._y_size = max(self._y_size, len(symbol.evaluation_array))
+            indices = np.argwhere(symbol.evaluation_array).reshape(-1)
+            if len(indices) == 1 or np.all(np.diff(indices) == 1):
+                return "y[{}:{}]".format(indices[0], indices[-1] + 1)
+            return "y[{}]".format(self._add_index_constant("y", symbol, indices))
+
+        elif isinstance(symbol, pybamm.Time):
+            return "t"
+
+        elif isinstance(symbol, pybamm.InputParameter):
+            if symbol.name not in self._input_names:
+                self._input_names.append(symbol.name)
+            return _input_variable(self._input_names.index(symbol.name))
+
+        raise NotImplementedError(
+            "Not implemented for a symbol of type '{}'".format(type(symbol))
+        )
+
+    def _sparse_str(self, symbol, children_vars):
+        """
+        Return the code that calculates the nonzero values of the sparse value of
+        `symbol`, and store its sparsity pattern
+        """
+        shape = symbol.evaluate_for_shape().shape
+        children_patterns = [self._patterns.get(child.id) for child in symbol.children]
+
+        if isinstance(symbol, pybamm.Negate):
+            pattern = children_patterns[0]
+            symbol_str = self._kernel_str("negative", children_vars)
+
+        elif isinstance(symbol, (pybamm.Multiplication, pybamm.Inner)) or (
+            isinstance(symbol, pybamm.Division) and children_patterns[1] is None
+        ):
+            if all(p is not None for p in children_patterns):
+                raise NotImplementedError(
+                    "Elementwise product of sparse matrices is not implemented"
+                )
+            # scale the nonzero values by the matching entries of the dense child
+            i_sparse = 0 if children_patterns[0] is not None else 1
+            pattern = children_patterns[i_sparse]
+            dense = symbol.children[1 - i_sparse]
+            factor = self._dense_factor_str(
+                symbol, dense, children_vars[1 - i_sparse], pattern
+            )
+            symbol_str = self._kernel_str(
+                "divide" if isinstance(symbol, pybamm.Division) else "multiply",
+                [children_vars[i_sparse], factor],
+            )
+
+        elif isinstance(symbol, (pybamm.Addition, pybamm.Subtraction)):
+            if any(p is None for p in children_patterns):
+                raise NotImplementedError(
+                    "Sum of a sparse and a dense matrix is not implemented"
+                )
+            left_keys, right_keys = [_pattern_keys(p) for p in children_patterns]
+            keys = np.union1d(left_keys, right_keys)
+            pattern = _pattern_from_keys(keys, shape)
+            right_var = children_vars[1]
+            if isinstance(symbol, pybamm.Subtraction):
+                right_var = self._kernel_str("negative", [right_var])
+            symbol_str = self._kernel_str(
+                "sparse_add",
+                [
+                    len(keys),
+                    self._add_index_constant(
+                        "left", symbol, np.searchsorted(keys, left_keys)
+                    ),
+                    children_vars[0],
+                    self._add_index_constant(
+                        "right", symbol, np.searchsorted(keys, right_keys)
+                    ),
+                    right_var,
+                ],
+            )
+
+        elif isinstance(symbol, pybamm.MatrixMultiplication):
+            if any(p is None for p in children_patterns):
+                raise NotImplementedError(
+                    "Product of a sparse and a dense matrix is not implemented"
+                )
+            keys, left_pos, right_pos = _matmul_pattern(*children_patterns)
+            unique_keys = np.unique(keys)
+            pattern = _pattern_from_keys(unique_keys, shape)
+            symbol_str = self._kernel_str(
+                "sparse_matmul",
+                [
+                    len(unique_keys),
+                    self._add_index_constant(
+                        "out", symbol, np.searchsorted(unique_keys, keys)
+                    ),
+                    self._add_index_constant("left", symbol, left_pos),
+                    self._add_index_constant("right", symbol, right_pos),
+                    *children_vars,
+                ],
+            )
+
+        elif isinstance(symbol, pybamm.Index):
+            if symbol.slice.step not in (None, 1):
+                raise NotImplementedError("Index with a step is not implemented")
+            child_pattern = children_patterns[0]
+            pattern = child_pattern[symbol.slice]
+            symbol_str = "{}[{}:{}]".format(
+                children_vars[0],
+                child_pattern.indptr[symbol.slice.start],
+                child_pattern.indptr[symbol.slice.stop],
+            )
+
+        elif isinstance(symbol, pybamm.SparseStack):
+            pattern = scipy.sparse.vstack(children_patterns, format="csr")
+            if len(children_vars) == 1:
+                symbol_str = children_vars[0]
+            else:
+                symbol_str = "np.concatenate(({},))".format(", ".join(children_vars))
+
+        else:
+            raise NotImplementedError(
+                "Cannot compile sparse symbol of type '{}' with numba".format(
+                    type(symbol)
+                )
+            )
+
+        self._patterns[symbol.id] = pattern
+        return symbol_str
+
+    def _dense_factor_str(self, symbol, dense, dense_var, pattern):
+        """
+        Return the code for the entries of `dense` that multiply (or divide) each
+        nonzero value of the sparse matrix with sparsity `pattern`, following numpy's
+        broadcasting rules
+        """
+        value = dense.evaluate_for_shape()
+        if isinstance(value, numbers.Number):
+            return dense_var
+        if value.size == 1:
+            if dense.is_constant():
+                return _number_str(dense.evaluate().item())
+            return "{}[0]".format(dense_var)
+        rows = np.repeat(np.arange(pattern.shape[0]), np.diff(pattern.indptr))
+        n_rows, n_cols = value.shape
+        flat_indices = (rows if n_rows > 1 else 0) * n_cols + (
+            pattern.indices if n_cols > 1 else 0
+        )
+        return self._kernel_str(
+            "gather",
+            [dense_var, self._add_index_constant("factor", symbol, flat_indices)],
+        )
+
+    def evaluate(self, t=None, y=None, y_dot=None, inputs=None, known_evals=None):
+        """
+        Acts as a drop-in replacement for :func:`pybamm.Symbol.evaluate`
+        """
+        if self._value is not None:
+            result = self._value
+        else:
+            # generated code assumes y is a one-dimensional array of floats
+            if y is None:
+                y = np.full((self._y_size, 1), np.nan)
+            y = np.asarray(y, dtype=np.float64)
+            if y.ndim == 1:
+                y = y.reshape(-1, 1)
+            t = np.nan if t is None else float(t)
+            input_values = []
+            inputs = inputs or {}
+            for name in self._input_names:
+                try:
+                    value = inputs[name]
+                except KeyError:
+                    raise KeyError("Input parameter '{}' not found".format(name))
+                if isinstance(value, numbers.Number):
+                    input_values.append(float(value))
+                else:
+                    input_values.append(np.asarray(value, dtype=np.float64).reshape(-1))
+
+            if self._result_pattern is not None:
+                indices, indptr, shape = self._result_pattern
+                data = self._evaluate(t, np.ascontiguousarray(y[:, 0]), *input_values)
+                result = scipy.sparse.csr_matrix((data, indices, indptr), shape)
+            else:
+                # evaluate each column of y
+                results = [
+                    np.reshape(
+                        self._evaluate(t, np.ascontiguousarray(y_col), *input_values),
+                        self._result_shape,
+                    )
+                    for y_col in y.T
+                ]
+                if len(results) == 1 or not self._result_shape:
+                    result = results[0]
+                else:
+                    result = np.concatenate(results, axis=1)
+
+        # don't need known_evals, but need to reproduce Symbol.evaluate signature
+        if known_evals is not None:
+            return result, known_evals
+        else:
+            return result
+
+    def __getstate__(self):
+        # the compiled function can't be pickled, so is compiled again when unpickled
+        state = self.__dict__.copy()
+        state.pop("_evaluate", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._python_str is not None:
+            self._compile()
+
+
+def _input_variable(i):
+    return "input_{}".format(i)
+
+
+def _is_column(value):
+    return isinstance(value, np.ndarray) and value.ndim == 2 and value.shape[1] == 1
+
+
+def _number_str(value):
+    """Write a number into the generated code"""
+    value = float(value)
+    if np.isnan(value):
+        return "np.nan"
+    elif np.isinf(value):
+        return "np.inf" if value > 0 else "(-np.inf)"
+    return repr(value)
+
+
+def _canonical_csr(matrix):
+    """
+    Copy of a sparse matrix in csr format with sorted indices and no duplicates.
+    Explicit zeros are kept, so that the pattern includes all the entries that can be
+    nonzero
+    """
+    matrix = scipy.sparse.csr_matrix(matrix, dtype=np.float64, copy=True)
+    matrix.sum_duplicates()
+    matrix.sort_indices()
+    return matrix
+
+
+def _pattern_keys(pattern):
+    """Linear indices of the entries of a sparsity pattern, in csr order"""
+    rows = np.repeat(np.arange(pattern.shape[0]), np.diff(pattern.indptr))
+    return rows.astype(np.int64) * pattern.shape[1] + pattern.indices
+
+
+def _pattern_from_keys(keys, shape):
+    """Sparsity pattern with the entries at the sorted linear indices `keys`"""
+    rows, cols = np.divmod(keys, shape[1])
+    indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+    return scipy.sparse.csr_matrix((np.zeros(len(keys)), cols, indptr), shape)
+
+
+def _matmul_pattern(left, right):
+    """
+    Return the linear index in the product of the sparsity patterns `left` and
+    `right` of each product of a nonzero value of `left` and a nonzero value of
+    `right`, and the positions of these two values in the arrays of nonzero values
+    """
+    left_rows = np.repeat(np.arange(left.shape[0]), np.diff(left.indptr))
+    # each nonzero value of the left matrix multiplies the nonzero values of the row
+    # of the right matrix given by its column
+    counts = np.diff(right.indptr)[left.indices]
+    left_pos = np.repeat(np.arange(len(left.indices)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    right_pos = right.indptr[left.indices][left_pos] + offsets
+    keys = (
+        left_rows[left_pos].astype(np.int64) * right.shape[1] + right.indices[right_pos]
+    )
+    return keys, left_pos, right_pos
+
+
+# module of a function compiled by numba and stored in the persistent cache
+CACHED_MODULE = """#
+# Generated by pybamm.EvaluatorNumba
+#
+import os
+
+import numba
+import numpy as np
+{imports}
+
+with np.load(os.path.splitext(__file__)[0] + ".npz") as constants:
+    globals().update(constants)
+
+
+@numba.njit(cache=True, error_model="numpy")
+{python_str}
+"""
+
+
+def _load_cached_function(cache_dir, python_str, kernels, constants):
+    """
+    Return the function `evaluate_numba` defined by `python_str` and compiled with
+    numba's cache in `cache_dir`, see :func:`set_numba_cache`
+    """
+    imports = ""
+    if kernels:
+        imports = "from pybamm.expression_tree.operations.numba_kernels import "
+        imports += ", ".join(kernels)
+    module_str = CACHED_MODULE.format(imports=imports, python_str=python_str)
+
+    # the module is named after its code and constants, so is never modified
+    key = hashlib.sha256(module_str.encode())
+    for name, value in sorted(constants.items()):
+        key.update("{}{}{}".format(name, value.dtype, value.shape).encode())
+        key.update(value.tobytes())
+    module_name = "pybamm_numba_{}".format(key.hexdigest()[:32])
+    path = os.path.join(cache_dir, module_name)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if not (os.path.exists(path + ".py") and os.path.exists(path + ".npz")):
+        # write to temporary files first, so that other processes never read
+        # incomplete files
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **constants)
+        os.replace(tmp_path, path + ".npz")
+        with open(tmp_path, "w") as f:
+            f.write(module_str)
+        os.replace(tmp_path, path + ".py")
+
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, path + ".py")
+        module = importlib.util.module_from_spec(spec)
+        # numba's cache can only be loaded for functions of modules that it can find
+        # in `sys.modules`
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name].evaluate_numba
@@ -3,6 +3,11 @@
 #
 import pybamm
 
+import numbers
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
 
 class Jacobian(object):
     """
@@ -52,6 +57,34 @@ class Jacobian(object):
             self._known_jacs[symbol.id] = jac
             return jac
 
+    def jac_and_sparsity(self, symbol, variable):
+        """
+        Return the Jacobian of `symbol` with respect to `variable`, as calculated by
+        :meth:`Jacobian.jac()`, and its sparsity pattern.
+
+        The Jacobians of the equations of a model are memoised on the model by
+        :meth:`pybamm.BaseSolver.set_up`, so that they are not calculated again when
+        the same model is set up again.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol to calculate the Jacobian of
+        variable : :class:`pybamm.Symbol`
+            The variable with respect to which to differentiate
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            Symbol representing the Jacobian
+        :class:`scipy.sparse.csr_matrix`
+            Boolean matrix that is True at the entries of the Jacobian that can be
+            nonzero, for any value of `t`, `y` and the inputs
+        """
+        jac = self.jac(symbol, variable)
+        sparsity = jacobian_sparsity(jac, (symbol.size, variable.size))
+        return jac, sparsity
+
     def _jac(self, symbol, variable):
         """ See :meth:`Jacobian.jac()`. """
 
@@ -77,7 +110,7 @@ class Jacobian(object):
 
         elif isinstance(symbol, pybamm.Concatenation):
             children_jacs = [
-                self.jac(child, variable) for child in symbol.cached_children
+                self.jac(child, variable) for child in symbol.children
             ]
             if len(children_jacs) == 1:
                 jac = children_jacs[0]
@@ -98,3 +131,72 @@ class Jacobian(object):
         if self._clear_domain:
             jac.clear_domains()
         return jac
+
+
+def jacobian_sparsity(jac, shape):
+    """
+    Return the sparsity pattern of a Jacobian, i.e. the entries that can be nonzero
+    for any value of `t`, `y` and the inputs.
+
+    The pattern is found by evaluating the expression tree with nonnegative values
+    only, so that no entries cancel out: constant subtrees are replaced by their
+    absolute values, other dense subtrees by ones, and subtractions by additions.
+
+    Parameters
+    ----------
+    jac : :class:`pybamm.Symbol`
+        The Jacobian, e.g. calculated by :meth:`Jacobian.jac()`
+    shape : tuple
+        The shape of the Jacobian, used if `jac` evaluates to a scalar
+
+    Returns
+    -------
+    :class:`scipy.sparse.csr_matrix`
+        Boolean matrix that is True at the entries that can be nonzero
+    """
+    value = _nonnegative_evaluate(jac, {})
+    if isinstance(value, numbers.Number):
+        value = np.full(shape, value)
+    sparsity = csr_matrix(value != 0, dtype=bool)
+    sparsity.sort_indices()
+    return sparsity
+
+
+def _nonnegative_evaluate(symbol, known_evals):
+    """See :func:`jacobian_sparsity`"""
+    try:
+        return known_evals[symbol.id]
+    except KeyError:
+        pass
+
+    if symbol.is_constant():
+        value = abs(symbol.evaluate())
+    else:
+        shape_value = symbol.evaluate_for_shape()
+        if isinstance(shape_value, numbers.Number):
+            value = 1
+        elif not issparse(shape_value):
+            # the dense values that depend on t, y or the inputs can be anything
+            value = np.ones(shape_value.shape)
+        else:
+            children = [
+                _nonnegative_evaluate(child, known_evals) for child in symbol.children
+            ]
+            if isinstance(symbol, pybamm.Subtraction):
+                value = children[0] + children[1]
+            elif isinstance(symbol, pybamm.BinaryOperator):
+                value = symbol._binary_evaluate(*children)
+            elif isinstance(symbol, (pybamm.Negate, pybamm.AbsoluteValue)):
+                value = children[0]
+            elif isinstance(symbol, pybamm.UnaryOperator):
+                value = symbol._unary_evaluate(children[0])
+            elif isinstance(symbol, pybamm.Concatenation):
+                value = symbol._concatenation_evaluate(children)
+            elif isinstance(symbol, pybamm.Function):
+                value = symbol._function_evaluate(children)
+            else:
+                value = shape_value
+            value = abs(value)
+
+    known_evals[symbol.id] = value
+    return value
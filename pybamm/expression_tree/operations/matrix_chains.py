@@ -0,0 +1,351 @@
+#
+# Fold constant matrix chains and scalings in discretised expression trees
+#
+import pybamm
+import numbers
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+
+class MatrixChainOptimiser(object):
+    """
+    Helper class to precompute the constant parts of the matrix products in a
+    discretised expression tree. Discretisation creates chains of constant matrices
+    (e.g. from gradient, divergence, ghost nodes and boundary values) and vectors
+    (e.g. from broadcasts of parameters), which are otherwise multiplied again each
+    time the expression tree is evaluated:
+
+    - scalings of the argument or the result of a constant matrix by a constant
+      vector or scalar (``A @ (v * x)``, ``v * (A @ x)``, ``A @ (x / v)``, ``-(A @ x)``)
+      are folded into the matrix, as diagonal matrices
+    - products of constant matrices (``A @ (B @ x)``) are precomputed if the product
+      has no more nonzero entries than the two matrices together, so that the chain
+      is calculated in the cheapest order
+    - diagonal matrices are replaced by elementwise multiplications by a vector, and
+      identity matrices are removed
+
+    Parameters
+    ----------
+    processed_symbols: dict {variable ids -> :class:`pybamm.Symbol`}, optional
+        cached optimised symbols
+    """
+
+    def __init__(self, processed_symbols=None):
+        self._processed_symbols = processed_symbols or {}
+        # ids of the (optimised) subexpressions that are used more than once
+        self._shared_ids = set()
+        self.flops_before = 0
+        self.flops_after = 0
+
+    @property
+    def flops_saved(self):
+        """
+        The number of floating point operations per evaluation saved by all the calls
+        to :meth:`optimise`, as estimated by :func:`count_flops`
+        """
+        return self.flops_before - self.flops_after
+
+    def optimise(self, symbol):
+        """
+        Return the optimised form of `symbol`, and add the estimated number of
+        floating point operations to evaluate `symbol` before and after to
+        :attr:`flops_before` and :attr:`flops_after`.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The (discretised) expression tree to optimise
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            The optimised expression tree
+        """
+        self._shared_ids.update(_shared_node_ids(symbol))
+        new_symbol = self.process_symbol(symbol)
+        flops_before = count_flops(symbol)
+        flops_after = count_flops(new_symbol)
+        self.flops_before += flops_before
+        self.flops_after += flops_after
+        pybamm.logger.debug(
+            "Folding constant matrix chains reduced the flops per evaluation from {} "
+            "to {}".format(flops_before, flops_after)
+        )
+        return new_symbol
+
+    def process_symbol(self, symbol):
+        """
+        This function recurses down the tree, folding the constant matrix chains
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The symbol to process
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            Optimised symbol. This is `symbol` itself if it cannot be optimised
+        """
+        try:
+            return self._processed_symbols[symbol.id]
+        except KeyError:
+            processed_symbol = self._process_symbol(symbol)
+            self._processed_symbols[symbol.id] = processed_symbol
+            if symbol.id in self._shared_ids:
+                self._shared_ids.add(processed_symbol.id)
+            return processed_symbol
+
+    def _process_symbol(self, symbol):
+        """ See :meth:`MatrixChainOptimiser.process_symbol()`. """
+        if symbol.is_constant():
+            # constant subtrees are only calculated once
+            return symbol
+
+        children = symbol.children
+        new_children = [self.process_symbol(child) for child in children]
+        if all(new.id == old.id for new, old in zip(new_children, children)):
+            # nodes are immutable, so can be shared
+            new_symbol = symbol
+        elif isinstance(symbol, pybamm.BinaryOperator):
+            # the tree has already been simplified, so the operator is created
+            # directly instead of with `_binary_new_copy`, which simplifies it again
+            new_symbol = type(symbol)(*new_children)
+            new_symbol.copy_domains(symbol)
+        elif isinstance(symbol, pybamm.UnaryOperator):
+            new_symbol = symbol._unary_new_copy(new_children[0])
+        elif isinstance(symbol, pybamm.Function):
+            new_symbol = symbol._function_new_copy(new_children)
+        elif isinstance(symbol, pybamm.Concatenation):
+            new_symbol = symbol._concatenation_new_copy(new_children)
+        else:
+            raise NotImplementedError(
+                "Cannot optimise symbol of type '{}'".format(type(symbol))
+            )
+
+        # Fold the scalings of the result of a matrix product into the matrix
+        if isinstance(new_symbol, pybamm.MatrixMultiplication):
+            matrix = _constant_matrix(new_symbol.left)
+            if matrix is not None:
+                return self._fold_matrix_product(matrix, new_symbol.right, new_symbol)
+        elif isinstance(new_symbol, pybamm.Multiplication):
+            for scaling, product in [new_symbol.children, new_symbol.children[::-1]]:
+                folded = self._fold_row_scaling(scaling, product, new_symbol)
+                if folded is not None:
+                    return folded
+        elif isinstance(new_symbol, pybamm.Division):
+            scaling = _constant_scaling(new_symbol.right, invert=True)
+            if scaling is not None:
+                folded = self._fold_row_scaling(scaling, new_symbol.left, new_symbol)
+                if folded is not None:
+                    return folded
+        elif isinstance(new_symbol, pybamm.Negate):
+            folded = self._fold_row_scaling(-1, new_symbol.child, new_symbol)
+            if folded is not None:
+                return folded
+        return new_symbol
+
+    def _fold_row_scaling(self, scaling, product, symbol):
+        """
+        Fold `scaling * product` into the matrix of `product`, if `product` is the
+        product of a constant matrix and `scaling` is a constant scalar or column
+        vector. Returns None otherwise.
+        """
+        # if the product is also used elsewhere, it would be calculated twice
+        if (
+            not isinstance(product, pybamm.MatrixMultiplication)
+            or product.id in self._shared_ids
+        ):
+            return None
+        matrix = _constant_matrix(product.left)
+        if matrix is None:
+            return None
+        if isinstance(scaling, pybamm.Symbol):
+            scaling = _constant_scaling(scaling)
+        if not _is_scaling_of(scaling, matrix.shape[0]):
+            return None
+        return self._fold_matrix_product(
+            _scale_rows(matrix, scaling), product.right, symbol
+        )
+
+    def _fold_matrix_product(self, matrix, right, symbol):
+        """
+        Return an expression for `matrix @ right`, where `matrix` is a constant
+        matrix, folding the constant scalings and matrices of `right` into `matrix`.
+        The domains are copied from `symbol`.
+        """
+        while True:
+            if isinstance(right, pybamm.Negate):
+                matrix = -matrix
+                right = right.child
+                continue
+            if isinstance(right, pybamm.Multiplication):
+                # A @ (v * x) = (A @ diag(v)) @ x, if v doesn't change the shape of x
+                folded = False
+                for scaling, other in [right.children, right.children[::-1]]:
+                    scaling = _constant_scaling(scaling)
+                    if _is_scaling_of(scaling, matrix.shape[1]) and (
+                        other.shape_for_testing == right.shape_for_testing
+                    ):
+                        matrix = _scale_columns(matrix, scaling)
+                        right = other
+                        folded = True
+                        break
+                if folded:
+                    continue
+            if isinstance(right, pybamm.Division):
+                # A @ (x / v) = (A @ diag(1 / v)) @ x
+                scaling = _constant_scaling(right.right, invert=True)
+                if _is_scaling_of(scaling, matrix.shape[1]) and (
+                    right.left.shape_for_testing == right.shape_for_testing
+                ):
+                    matrix = _scale_columns(matrix, scaling)
+                    right = right.left
+                    continue
+            if isinstance(right, pybamm.MatrixMultiplication):
+                # A @ (B @ x) = (A @ B) @ x, if this is cheaper (B @ x is still
+                # calculated if it is also used elsewhere)
+                inner = _constant_matrix(right.left)
+                if inner is not None:
+                    product = matrix @ inner
+                    max_nnz = _nnz(matrix)
+                    if right.id not in self._shared_ids:
+                        max_nnz += _nnz(inner)
+                    if _nnz(product) <= max_nnz:
+                        matrix = product
+                        right = right.right
+                        continue
+            break
+
+        # replace diagonal matrices by elementwise multiplications
+        if _is_diagonal(matrix):
+            diagonal = np.asarray(matrix.diagonal()).reshape(-1, 1)
+            if np.all(diagonal == 1):
+                return right
+            new_symbol = pybamm.Multiplication(pybamm.Vector(diagonal), right)
+        else:
+            if issparse(matrix):
+                matrix = csr_matrix(matrix)
+            new_symbol = pybamm.MatrixMultiplication(pybamm.Matrix(matrix), right)
+        new_symbol.copy_domains(symbol)
+        return new_symbol
+
+
+def count_flops(symbol):
+    """
+    Return an estimate of the number of floating point operations needed to evaluate
+    an expression tree, with each distinct subexpression calculated once and the
+    constant subexpressions precomputed. A product by a constant sparse matrix costs
+    two operations for each of its nonzero entries and for each column of the
+    result; elementwise operations cost one operation for each entry of the result.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The expression tree
+
+    Returns
+    -------
+    int
+        The estimated number of floating point operations
+    """
+    flops = 0
+    seen = {symbol.id}
+    stack = [symbol]
+    while stack:
+        node = stack.pop()
+        if node.is_constant():
+            continue
+        if isinstance(node, pybamm.MatrixMultiplication):
+            matrix = _constant_matrix(node.left)
+            n_entries = node.left.size if matrix is None else _nnz(matrix)
+            n_columns = node.shape[1] if len(node.shape) == 2 else 1
+            flops += 2 * n_entries * n_columns
+        elif isinstance(
+            node, (pybamm.BinaryOperator, pybamm.UnaryOperator, pybamm.Function)
+        ) and not isinstance(node, (pybamm.Index, pybamm.NotConstant)):
+            flops += node.size
+        for child in node.children:
+            if child.id not in seen:
+                seen.add(child.id)
+                stack.append(child)
+    return int(flops)
+
+
+def _shared_node_ids(symbol):
+    """ The ids of the nodes of an expression tree with more than one parent. """
+    n_parents = {}
+    stack = [symbol]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            if child.id in n_parents:
+                n_parents[child.id] += 1
+            else:
+                n_parents[child.id] = 1
+                stack.append(child)
+    return {id for id, n in n_parents.items() if n > 1}
+
+
+def _constant_matrix(symbol):
+    """ The value of `symbol` if it is a constant matrix, and None otherwise. """
+    if symbol.is_constant() and len(symbol.shape) == 2:
+        return symbol.evaluate()
+    return None
+
+
+def _constant_scaling(symbol, invert=False):
+    """
+    The value of `symbol` (or its inverse, if `invert` is True) if it is a constant
+    number or dense column vector (with no zeros, if `invert` is True), and None
+    otherwise.
+    """
+    if not symbol.is_constant() or not (
+        symbol.shape == () or (len(symbol.shape) == 2 and symbol.shape[1] == 1)
+    ):
+        return None
+    value = symbol.evaluate()
+    if issparse(value) or (invert and np.any(value == 0)):
+        return None
+    if isinstance(value, np.ndarray) and value.ndim == 0:
+        value = value.item()
+    return 1 / value if invert else value
+
+
+def _is_scaling_of(scaling, size):
+    """ Whether `scaling` can scale `size` rows or columns of a matrix. """
+    return isinstance(scaling, numbers.Number) or (
+        isinstance(scaling, np.ndarray) and scaling.shape in [(size, 1), (1, 1)]
+    )
+
+
+def _scale_rows(matrix, scaling):
+    """ Return `diag(scaling) @ matrix`. """
+    if issparse(matrix) and not isinstance(scaling, numbers.Number):
+        return csr_matrix(matrix.multiply(scaling))
+    return matrix * scaling
+
+
+def _scale_columns(matrix, scaling):
+    """ Return `matrix @ diag(scaling)`. """
+    if isinstance(scaling, numbers.Number):
+        return matrix * scaling
+    elif issparse(matrix):
+        return csr_matrix(matrix.multiply(scaling.T))
+    return matrix * scaling.T
+
+
+def _nnz(matrix):
+    """ The number of stored entries of a sparse or dense matrix. """
+    return matrix.nnz if issparse(matrix) else matrix.size
+
+
+def _is_diagonal(matrix):
+    """ Whether `matrix` is a square diagonal matrix. """
+    n_rows, n_columns = matrix.shape
+    if n_rows != n_columns:
+        return False
+    if issparse(matrix):
+        matrix = matrix.tocoo()
+        return bool(np.all(matrix.data[matrix.row != matrix.col] == 0))
+    return np.count_nonzero(matrix - np.diag(np.diagonal(matrix))) == 0
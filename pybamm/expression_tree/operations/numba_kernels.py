@@ -0,0 +1,63 @@
+#
+# Functions compiled with numba that are called by the code generated by
+# pybamm.EvaluatorNumba. This module is only imported if numba is installed.
+#
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True, error_model="numpy")
+def csr_matvec(indptr, indices, data, x, n_rows):
+    """Product of a csr matrix, given by its arrays, and a vector"""
+    out = np.zeros(n_rows)
+    for i in range(n_rows):
+        for k in range(indptr[i], indptr[i + 1]):
+            out[i] += data[k] * x[indices[k]]
+    return out
+
+
+@numba.njit(cache=True)
+def gather(x, indices):
+    """The entries `indices` of the flattened array `x`"""
+    flat = np.ascontiguousarray(x).ravel()
+    out = np.empty(len(indices))
+    for k in range(len(indices)):
+        out[k] = flat[indices[k]]
+    return out
+
+
+@numba.njit(cache=True)
+def sparse_add(nnz, left_map, left, right_map, right):
+    """
+    Nonzero values of the sum of two sparse matrices, given the positions of the
+    nonzero values of each matrix in those of the sum
+    """
+    out = np.zeros(nnz)
+    for k in range(len(left_map)):
+        out[left_map[k]] += left[k]
+    for k in range(len(right_map)):
+        out[right_map[k]] += right[k]
+    return out
+
+
+@numba.njit(cache=True)
+def sparse_matmul(nnz, out_map, left_pos, right_pos, left, right):
+    """
+    Nonzero values of the product of two sparse matrices, given the positions in the
+    nonzero values of the product and of each matrix of each product of two values
+    """
+    out = np.zeros(nnz)
+    for k in range(len(out_map)):
+        out[out_map[k]] += left[left_pos[k]] * right[right_pos[k]]
+    return out
+
+
+# One function for each numpy ufunc, which is compiled for each combination of
+# argument types the first time it is called. The generated code calls these
+# functions rather than the ufuncs, so that the loops of the ufuncs are compiled once
+# and shared by all the evaluators, instead of being compiled into each of them.
+for _name, _ufunc in vars(np).items():
+    if isinstance(_ufunc, np.ufunc) and _name == _ufunc.__name__:
+        _args = ", ".join("x{}".format(i) for i in range(_ufunc.nin))
+        exec("def {0}({1}):\n    return np.{0}({1})".format(_name, _args))
+        globals()[_name] = numba.njit(error_model="numpy")(globals()[_name])
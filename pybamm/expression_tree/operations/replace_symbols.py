@@ -162,7 +162,7 @@ class SymbolReplacer(object):
         try:
             return self._processed_symbols[symbol.id]
         except KeyError:
-            replaced_symbol = self._process_symbol(symbol)
+            replaced_symbol = pybamm.intern_symbol(self._process_symbol(symbol))
 
             self._processed_symbols[symbol.id] = replaced_symbol
 
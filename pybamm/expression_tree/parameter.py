@@ -121,8 +121,12 @@ class FunctionParameter(pybamm.Symbol):
 
     def set_id(self):
         """See :meth:`pybamm.Symbol.set_id` """
-        self._id = hash(
-            (self.__class__, self.name, self.diff_variable)
+        if self.diff_variable is None:
+            diff_variable_id = None
+        else:
+            diff_variable_id = self.diff_variable.id
+        self._id = pybamm.stable_hash(
+            (self.__class__, self.name, diff_variable_id)
             + tuple([child.id for child in self.children])
             + tuple(self.domain)
         )
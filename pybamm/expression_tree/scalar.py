@@ -44,7 +44,7 @@ class Scalar(pybamm.Symbol):
         """ See :meth:`pybamm.Symbol.set_id()`. """
         # We must include the value in the hash, since different scalars can be
         # indistinguishable by class, name and domain alone
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name) + tuple(self.domain) + tuple(str(self._value))
         )
 
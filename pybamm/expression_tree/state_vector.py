@@ -101,7 +101,7 @@ class StateVectorBase(pybamm.Symbol):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name, tuple(self.evaluation_array))
             + tuple(self.domain)
         )
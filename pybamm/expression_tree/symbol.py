@@ -4,9 +4,10 @@
 import pybamm
 
 import anytree
+import hashlib
 import numbers
-import copy
 import numpy as np
+import weakref
 from anytree.exporter import DotExporter
 from scipy.sparse import issparse, csr_matrix
 
@@ -17,8 +18,8 @@ def domain_size(domain):
 
     Empty domain has size 1.
     If the domain falls within the list of standard battery domains, the size is read
-    from a dictionary of standard domain sizes. Otherwise, the hash of the domain string
-    is used to generate a `random` domain size.
+    from a dictionary of standard domain sizes. Otherwise, the (stable) hash of the
+    domain string is used to generate a `random` domain size.
     """
     fixed_domain_sizes = {
         "current collector": 3,
@@ -37,10 +38,73 @@ def domain_size(domain):
     elif all(dom in fixed_domain_sizes for dom in domain):
         size = sum(fixed_domain_sizes[dom] for dom in domain)
     else:
-        size = sum(hash(dom) % 100 for dom in domain)
+        size = sum(stable_hash(dom) % 100 for dom in domain)
     return size
 
 
+def stable_hash(*parts):
+    """
+    Return a 64-bit integer hash of `parts`, computed with the BLAKE2 algorithm.
+    Unlike the built-in `hash`, which is randomised for strings in each process, the
+    hash is deterministic, so it is the same in every process. `parts` can contain
+    strings, numbers, None, classes and (nested) tuples of these, whose `repr` is
+    deterministic.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def entries_digest(*arrays):
+    """
+    Return a string that identifies the values, shapes and types of numpy arrays
+    and scipy sparse matrices, from the BLAKE2 digest of their data.
+    """
+    blake = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        if issparse(array):
+            array = array.tocsr()
+            parts = [array.data, array.indices, array.indptr]
+        else:
+            parts = [np.ascontiguousarray(array)]
+        blake.update(repr((type(array).__name__, array.shape)).encode())
+        for part in parts:
+            blake.update(repr((part.dtype.str, part.shape)).encode())
+            blake.update(part.tobytes())
+    return blake.hexdigest()
+
+
+# Table of the nodes shared by structurally identical expression trees, see
+# :func:`intern_symbol`. Nodes are removed from the table when they are no longer
+# used by any expression tree
+_interned_symbols = weakref.WeakValueDictionary()
+
+
+def intern_symbol(symbol):
+    """
+    Return the node that is shared by all the expression trees that contain a node
+    structurally identical to `symbol` (same class and id), adding `symbol` to the
+    table of shared nodes if there is none. Since nodes are immutable and their ids
+    are stable, an expression tree can use the shared node instead of `symbol`, so
+    identical subtrees that are created separately (e.g. when processing parameters
+    or discretising a model) are only stored once.
+
+    Parameters
+    ----------
+    symbol : :class:`pybamm.Symbol`
+        The node to intern
+
+    Returns
+    -------
+    :class:`pybamm.Symbol`
+        The shared node, which is `symbol` itself if it has just been added
+    """
+    shared = _interned_symbols.get(symbol.id)
+    if shared is not None and shared._interns_as(symbol):
+        return shared
+    _interned_symbols[symbol.id] = symbol
+    return symbol
+
+
 def create_object_of_size(size, typ="vector"):
     """Return object, consisting of NaNs, of the right shape."""
     if typ == "vector":
@@ -64,6 +128,30 @@ def evaluate_for_shape_using_domain(domain, auxiliary_domains=None, typ="vector"
     return create_object_of_size(_domain_size * _auxiliary_domain_sizes, typ)
 
 
+def elementwise_shape(*shapes):
+    """
+    Return the shape of the result of an elementwise operation on objects (numbers,
+    arrays or sparse matrices) with shapes `shapes`, following numpy's broadcasting
+    rules.
+
+    Raises
+    ------
+    ValueError
+        If the shapes cannot be broadcast together
+    """
+    ndim = max(len(shape) for shape in shapes)
+    padded_shapes = [(1,) * (ndim - len(shape)) + tuple(shape) for shape in shapes]
+    out = []
+    for sizes in zip(*padded_shapes):
+        sizes = set(sizes) - {1}
+        if len(sizes) > 1:
+            raise ValueError(
+                "inconsistent shapes: {}".format(", ".join(str(s) for s in shapes))
+            )
+        out.append(sizes.pop() if sizes else 1)
+    return tuple(out)
+
+
 def is_constant(symbol):
     return isinstance(symbol, numbers.Number) or symbol.is_constant()
 
@@ -154,9 +242,14 @@ def simplify_if_constant(symbol):
     return symbol
 
 
-class Symbol(anytree.NodeMixin):
+class Symbol(object):
     """Base node class for the expression tree
 
+    Nodes are immutable once created: a node stores its children in a tuple, and has
+    no link to its parent(s), so the same node can be shared by any number of
+    expression trees without being copied. The attributes common to all nodes are
+    stored in `__slots__`.
+
     Parameters
     ----------
 
@@ -178,25 +271,25 @@ class Symbol(anytree.NodeMixin):
 
     """
 
+    # attributes specific to a subclass are stored in `__dict__`, which is only
+    # created if such an attribute is set
+    __slots__ = [
+        "_name",
+        "_children",
+        "_domains",
+        "_auxiliary_domains",
+        "_id",
+        "_saved_evaluates_on_edges",
+        "__dict__",
+        "__weakref__",
+    ]
+
     def __init__(self, name, children=None, domain=None, auxiliary_domains=None):
-        super(Symbol, self).__init__()
         self.name = name
 
         if children is None:
-            children = []
-
-        # Store "orphans", which are separate from children as they do not have a
-        # parent node, so they do not cause tree corruption errors when used again
-        # in a different part of the tree
-        self._orphans = children
-
-        for child in children:
-            # copy child before adding
-            # this also adds copy.copy(child) to self.children
-            copy.copy(child).parent = self
-
-        # cache children
-        self.cached_children = super(Symbol, self).children
+            children = ()
+        self._children = tuple(children)
 
         # Set auxiliary domains
         self._domains = {"primary": None}
@@ -219,13 +312,13 @@ class Symbol(anytree.NodeMixin):
     @property
     def children(self):
         """
-        returns the cached children of this node.
+        returns the children of this node, as a tuple.
 
-        Note: it is assumed that children of a node are not modified after initial
-        creation
+        Note: children are shared with the other expression trees that use them, so
+        they should not be modified after creation
 
         """
-        return self.cached_children
+        return self._children
 
     @property
     def name(self):
@@ -304,7 +397,6 @@ class Symbol(anytree.NodeMixin):
     def copy_domains(self, symbol):
         """Copy the domains from a given symbol, bypassing checks"""
         self._domains = symbol.domains.copy()
-        self._domain = self._domains["primary"]
         self._auxiliary_domains = {
             k: v for k, v in self._domains.items() if k != "primary"
         }
@@ -313,7 +405,6 @@ class Symbol(anytree.NodeMixin):
     def clear_domains(self):
         """Clear domains, bypassing checks"""
         self._domains = {"primary": []}
-        self._domain = []
         self._auxiliary_domains = {}
         self.set_id()
 
@@ -347,36 +438,53 @@ class Symbol(anytree.NodeMixin):
         Set the immutable "identity" of a variable (e.g. for identifying y_slices).
 
         This is identical to what we'd put in a __hash__ function
-        However, implementing __hash__ requires also implementing __eq__,
-        which would then mess with loop-checking in the anytree module.
+        However, implementing __hash__ requires also implementing __eq__.
 
         Hashing can be slow, so we set the id when we create the node, and hence only
-        need to hash once.
+        need to hash once. The id is computed with :func:`pybamm.stable_hash`, so it is
+        the same in every process and can be used as a key of persistent caches.
         """
-        self._id = hash(
+        self._id = stable_hash(
             (self.__class__, self.name)
             + tuple([child.id for child in self.children])
             + tuple(self.domain)
             + tuple([(k, tuple(v)) for k, v in self.auxiliary_domains.items()])
         )
 
+    def _interns_as(self, other):
+        """
+        Whether `other`, which has the same id as this node, can be replaced by this
+        node in an expression tree, see :func:`pybamm.intern_symbol`. Subclasses with
+        attributes that are not part of the id should check them too.
+        """
+        return type(other) is type(self)
+
     @property
     def orphans(self):
         """
-        Returning new copies of the children, with parents removed to avoid corrupting
-        the expression tree internal data
+        Returns the children of this node. Nodes no longer have parents, so this is
+        the same as :meth:`children`, and is kept for backwards compatibility.
         """
-        return self._orphans
+        return self._children
 
     def render(self):  # pragma: no cover
         """print out a visual representation of the tree (this node and its
         children)
         """
-        for pre, _, node in anytree.RenderTree(self):
+        # stack of (node, prefix of the node, prefix of its children)
+        stack = [(self, "", "")]
+        while stack:
+            node, pre, fill = stack.pop()
             if isinstance(node, pybamm.Scalar) and node.name != str(node.value):
                 print("{}{} = {}".format(pre, node.name, node.value))
             else:
                 print("{}{}".format(pre, node.name))
+            children = node.children
+            for i in reversed(range(len(children))):
+                if i == len(children) - 1:
+                    stack.append((children[i], fill + "└── ", fill + "    "))
+                else:
+                    stack.append((children[i], fill + "├── ", fill + "│   "))
 
     def visualise(self, filename):
         """
@@ -455,7 +563,11 @@ class Symbol(anytree.NodeMixin):
         b
 
         """
-        return anytree.PreOrderIter(self)
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._children))
 
     def __str__(self):
         """return a string representation of the node and its children"""
@@ -713,6 +825,23 @@ class Symbol(anytree.NodeMixin):
         "See :meth:`Symbol.evaluate_for_shape`"
         return self.evaluate()
 
+    def _shape_from_children(self, children_shapes):
+        """
+        Shape of the result of the operation on children with shapes
+        `children_shapes`, used by :meth:`Symbol.shape` and
+        :meth:`Symbol.shape_for_testing` to propagate shapes through the tree without
+        evaluating it.
+
+        Raises
+        ------
+        NotImplementedError
+            If the shape cannot be inferred from the shapes of the children, in which
+            case it is found by evaluating the symbol (default behaviour)
+        ValueError
+            If the children have inconsistent shapes
+        """
+        raise NotImplementedError
+
     def is_constant(self):
         """returns true if evaluating the expression is not dependent on `t` or `y`
         or `inputs`
@@ -843,7 +972,7 @@ class Symbol(anytree.NodeMixin):
     @property
     def size(self):
         """
-        Size of an object, found by evaluating it with appropriate t and y
+        Size of an object, found from its shape
         """
         try:
             return self._saved_size
@@ -854,35 +983,44 @@ class Symbol(anytree.NodeMixin):
     @property
     def shape(self):
         """
-        Shape of an object, found by evaluating it with appropriate t and y.
+        Shape of an object, found from the shapes of its children if possible (see
+        :meth:`Symbol._shape_from_children`), and otherwise by evaluating it with
+        appropriate t and y.
         """
         try:
             return self._saved_shape
         except AttributeError:
-            # Default behaviour is to try to evaluate the object directly
-            # Try with some large y, to avoid having to unpack (slow)
             try:
-                y = np.nan * np.ones((1000, 1))
-                evaluated_self = self.evaluate(0, y, y, inputs="shape test")
-            # If that fails, fall back to calculating how big y should really be
-            except ValueError:
-                unpacker = pybamm.SymbolUnpacker(pybamm.StateVector)
-                state_vectors_in_node = unpacker.unpack_symbol(self).values()
-                min_y_size = max(
-                    max(len(x._evaluation_array) for x in state_vectors_in_node), 1
-                )
-                # Pick a y that won't cause RuntimeWarnings
-                y = np.nan * np.ones((min_y_size, 1))
-                evaluated_self = self.evaluate(0, y, y, inputs="shape test")
-
-            # Return shape of evaluated object
-            if isinstance(evaluated_self, numbers.Number):
-                self._saved_shape = ()
-            else:
-                self._saved_shape = evaluated_self.shape
+                children_shapes = [child.shape for child in self.children]
+                self._saved_shape = self._shape_from_children(children_shapes)
+            except NotImplementedError:
+                self._saved_shape = self._evaluate_shape()
 
         return self._saved_shape
 
+    def _evaluate_shape(self):
+        """Find the shape of an object by evaluating it with appropriate t and y"""
+        # Try with some large y, to avoid having to unpack (slow)
+        try:
+            y = np.nan * np.ones((1000, 1))
+            evaluated_self = self.evaluate(0, y, y, inputs="shape test")
+        # If that fails, fall back to calculating how big y should really be
+        except ValueError:
+            unpacker = pybamm.SymbolUnpacker(pybamm.StateVector)
+            state_vectors_in_node = unpacker.unpack_symbol(self).values()
+            min_y_size = max(
+                max(len(x._evaluation_array) for x in state_vectors_in_node), 1
+            )
+            # Pick a y that won't cause RuntimeWarnings
+            y = np.nan * np.ones((min_y_size, 1))
+            evaluated_self = self.evaluate(0, y, y, inputs="shape test")
+
+        # Return shape of evaluated object
+        if isinstance(evaluated_self, numbers.Number):
+            return ()
+        else:
+            return evaluated_self.shape
+
     @property
     def size_for_testing(self):
         """
@@ -895,17 +1033,29 @@ class Symbol(anytree.NodeMixin):
         """
         Shape of an object for cases where it cannot be evaluated directly. If a symbol
         cannot be evaluated directly (e.g. it is a `Variable` or `Parameter`), it is
-        instead given an arbitrary domain-dependent shape.
+        instead given an arbitrary domain-dependent shape. As for :meth:`Symbol.shape`,
+        the shape is found from the shapes of the children if possible.
         """
-        evaluated_self = self.evaluate_for_shape()
-        if isinstance(evaluated_self, numbers.Number):
-            return ()
-        else:
-            return evaluated_self.shape
+        try:
+            return self._saved_shape_for_testing
+        except AttributeError:
+            try:
+                children_shapes = [child.shape_for_testing for child in self.children]
+                shape = self._shape_from_children(children_shapes)
+            except NotImplementedError:
+                evaluated_self = self.evaluate_for_shape()
+                if isinstance(evaluated_self, numbers.Number):
+                    shape = ()
+                else:
+                    shape = evaluated_self.shape
+            self._saved_shape_for_testing = shape
+            return shape
 
     def test_shape(self):
         """
-        Check that the discretised self has a pybamm `shape`, i.e. can be evaluated
+        Check that the discretised self has a pybamm `shape`, i.e. can be evaluated.
+        In debug mode, the shape found from the children is also checked against the
+        shape found by evaluating the symbol with dummy arrays.
 
         Raises
         ------
@@ -913,6 +1063,20 @@ class Symbol(anytree.NodeMixin):
             If the shape of the object cannot be found
         """
         try:
-            self.shape_for_testing
+            shape = self.shape_for_testing
+            if pybamm.settings.debug_mode is True:
+                evaluated_self = self.evaluate_for_shape()
         except ValueError as e:
             raise pybamm.ShapeError("Cannot find shape (original error: {})".format(e))
+        if pybamm.settings.debug_mode is True:
+            if isinstance(evaluated_self, numbers.Number):
+                evaluated_shape = ()
+            else:
+                evaluated_shape = evaluated_self.shape
+            if shape != evaluated_shape:
+                raise pybamm.ShapeError(
+                    "Shape {} of {!s} found from its children does not match the "
+                    "shape {} found by evaluating it".format(
+                        shape, self, evaluated_shape
+                    )
+                )
@@ -78,6 +78,13 @@ class UnaryOperator(pybamm.Symbol):
         """
         return self.children[0].evaluate_for_shape()
 
+    def _shape_from_children(self, children_shapes):
+        """
+        Default behaviour: unary operator has same shape as child
+        See :meth:`pybamm.Symbol._shape_from_children()`
+        """
+        return children_shapes[0]
+
     def _evaluates_on_edges(self, dimension):
         """ See :meth:`pybamm.Symbol._evaluates_on_edges()`. """
         return self.child.evaluates_on_edges(dimension)
@@ -277,7 +284,7 @@ class Index(UnaryOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (
                 self.__class__,
                 self.name,
@@ -302,6 +309,14 @@ class Index(UnaryOperator):
     def _evaluate_for_shape(self):
         return self._unary_evaluate(self.children[0].evaluate_for_shape())
 
+    def _shape_from_children(self, children_shapes):
+        """ See :meth:`pybamm.Symbol._shape_from_children()`. """
+        child_shape = children_shapes[0]
+        if len(child_shape) == 0:
+            raise NotImplementedError
+        n_rows = len(range(*self.slice.indices(child_shape[0])))
+        return (n_rows,) + child_shape[1:]
+
     def _evaluates_on_edges(self, dimension):
         """ See :meth:`pybamm.Symbol._evaluates_on_edges()`. """
         return False
@@ -336,6 +351,13 @@ class SpatialOperator(UnaryOperator):
         # We shouldn't need this
         raise NotImplementedError
 
+    def _shape_from_children(self, children_shapes):
+        """
+        Spatial operators cannot be evaluated, so their shape is found from
+        :meth:`pybamm.Symbol.evaluate_for_shape()`
+        """
+        raise NotImplementedError
+
 
 class Gradient(SpatialOperator):
     """A node in the expression tree representing a grad operator
@@ -539,7 +561,7 @@ class Integral(SpatialOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name)
             + tuple(
                 [
@@ -689,7 +711,7 @@ class DefiniteIntegralVector(SpatialOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name, self.vector_type)
             + (self.children[0].id,)
             + tuple(self.domain)
@@ -747,7 +769,7 @@ class BoundaryIntegral(SpatialOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name) + (self.children[0].id,) + tuple(self.domain)
         )
 
@@ -790,7 +812,7 @@ class DeltaFunction(SpatialOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name, self.side, self.children[0].id)
             + tuple(self.domain)
             + tuple([(k, tuple(v)) for k, v in self.auxiliary_domains.items()])
@@ -858,7 +880,7 @@ class BoundaryOperator(SpatialOperator):
 
     def set_id(self):
         """ See :meth:`pybamm.Symbol.set_id()` """
-        self._id = hash(
+        self._id = pybamm.stable_hash(
             (self.__class__, self.name, self.side, self.children[0].id)
             + tuple(self.domain)
             + tuple([(k, tuple(v)) for k, v in self.auxiliary_domains.items()])
@@ -1130,9 +1152,7 @@ def x_average(symbol):
         raise ValueError("Can't take the x-average of a symbol that evaluates on edges")
     # If symbol doesn't have a domain, its average value is itself
     if symbol.domain in [[], ["current collector"]]:
-        new_symbol = symbol.new_copy()
-        new_symbol.parent = None
-        return new_symbol
+        return symbol.new_copy()
     # If symbol is a Broadcast, its average value is its child
     elif isinstance(symbol, pybamm.Broadcast):
         return symbol.orphans[0]
@@ -1211,9 +1231,7 @@ def z_average(symbol):
         )
     # If symbol doesn't have a domain, its average value is itself
     if symbol.domain == []:
-        new_symbol = symbol.new_copy()
-        new_symbol.parent = None
-        return new_symbol
+        return symbol.new_copy()
     # If symbol is a Broadcast, its average value is its child
     elif isinstance(symbol, pybamm.Broadcast):
         return symbol.orphans[0]
@@ -1248,9 +1266,7 @@ def yz_average(symbol):
         )
     # If symbol doesn't have a domain, its average value is itself
     if symbol.domain == []:
-        new_symbol = symbol.new_copy()
-        new_symbol.parent = None
-        return new_symbol
+        return symbol.new_copy()
     # If symbol is a Broadcast, its average value is its child
     elif isinstance(symbol, pybamm.Broadcast):
         return symbol.orphans[0]
@@ -1287,9 +1303,7 @@ def r_average(symbol):
         ["negative particle"],
         ["working particle"],
     ]:
-        new_symbol = symbol.new_copy()
-        new_symbol.parent = None
-        return new_symbol
+        return symbol.new_copy()
     # If symbol is a secondary broadcast onto "negative electrode" or
     # "positive electrode", take the r-average of the child then broadcast back
     elif isinstance(symbol, pybamm.SecondaryBroadcast) and symbol.domains[
@@ -1330,9 +1344,7 @@ def boundary_value(symbol, side):
     """
     # If symbol doesn't have a domain, its boundary value is itself
     if symbol.domain == []:
-        new_symbol = symbol.new_copy()
-        new_symbol.parent = None
-        return new_symbol
+        return symbol.new_copy()
     # If symbol is a primary or full broadcast, its boundary value is its child
     if isinstance(symbol, (pybamm.PrimaryBroadcast, pybamm.FullBroadcast)):
         return symbol.orphans[0]
@@ -55,6 +55,10 @@ class VariableBase(pybamm.Symbol):
             self.name, self.domain, self.auxiliary_domains, self.bounds
         )
 
+    def _interns_as(self, other):
+        """ See :meth:`pybamm.Symbol._interns_as()`. """
+        return type(other) is type(self) and other.bounds == self.bounds
+
     def _evaluate_for_shape(self):
         """ See :meth:`pybamm.Symbol.evaluate_for_shape_using_domain()` """
         return pybamm.evaluate_for_shape_using_domain(
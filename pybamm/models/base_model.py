@@ -79,6 +79,8 @@ class BaseModel(object):
         calling `evaluate(t, y)` on the given expression treeself.
         - "casadi": convert into CasADi expression tree, which then uses CasADi's \
         algorithm to calculate the Jacobian.
+        - "numba": convert into python code compiled with numba, see \
+        :class:`pybamm.EvaluatorNumba` (requires numba).
 
         Default is "casadi".
 
@@ -102,6 +104,9 @@ class BaseModel(object):
         self._mass_matrix_inv = None
         self._jacobian = None
         self._jacobian_algebraic = None
+        # Symbolic Jacobians and their sparsity patterns, memoised by the solvers,
+        # see `BaseSolver._get_jac_and_sparsity`
+        self._set_up_jacobians = {}
         self.external_variables = []
         self._parameters = None
         self._input_parameters = None
@@ -167,7 +172,11 @@ class BaseModel(object):
 
     @variables.setter
     def variables(self, variables):
-        self._variables = pybamm.FuzzyDict(variables)
+        if isinstance(variables, pybamm.LazyFuzzyDict):
+            # Keep the values that have not been processed yet unprocessed
+            self._variables = variables.copy()
+        else:
+            self._variables = pybamm.FuzzyDict(variables)
 
     def variable_names(self):
         return list(self._variables.keys())
@@ -284,7 +293,7 @@ class BaseModel(object):
             list(self.rhs.values())
             + list(self.algebraic.values())
             + list(self.initial_conditions.values())
-            + list(self.variables.values())
+            + self._unpack_variables(unpacker)
             + [event.expression for event in self.events]
         )
         return list(all_parameters.values())
@@ -303,11 +312,25 @@ class BaseModel(object):
             list(self.rhs.values())
             + list(self.algebraic.values())
             + list(self.initial_conditions.values())
-            + list(self.variables.values())
+            + self._unpack_variables(unpacker)
             + [event.expression for event in self.events]
         )
         return list(all_input_parameters.values())
 
+    def _unpack_variables(self, unpacker):
+        """
+        Return the variables to search for (input) parameters. The variables that have
+        not been discretised yet are not discretised: the parameters found in them are
+        discretised on their own instead, which gives the same parameters.
+        """
+        if not isinstance(self.variables, pybamm.LazyFuzzyDict):
+            return list(self.variables.values())
+        # A new unpacker is used, since the ids of the discretised parameters are the
+        # same as the ids of the parameters
+        unpacker = pybamm.SymbolUnpacker(unpacker.classes_to_find)
+        symbols = unpacker.unpack_list_of_symbols(self.variables.raw_values())
+        return [self.variables.process(symbol) for symbol in symbols.values()]
+
     def __getitem__(self, key):
         return self.rhs[key]
 
@@ -586,11 +586,22 @@ class ParameterValues:
         try:
             return self._processed_symbols[symbol.id]
         except KeyError:
-            processed_symbol = self._process_symbol(symbol)
+            # share the processed symbol with other trees that contain it
+            processed_symbol = pybamm.intern_symbol(self._process_symbol(symbol))
             self._processed_symbols[symbol.id] = processed_symbol
 
             return processed_symbol
 
+    def _with_domain(self, symbol, domain):
+        """
+        Return `symbol` with primary domain `domain`. Processed symbols are shared by
+        the expression trees that use them, so the domain of a copy is changed.
+        """
+        if symbol.domain != domain:
+            symbol = symbol.new_copy()
+            symbol.domain = domain
+        return symbol
+
     def _process_symbol(self, symbol):
         """ See :meth:`ParameterValues.process_symbol()`. """
 
@@ -602,8 +613,7 @@ class ParameterValues:
                 return pybamm.Scalar(value, name=symbol.name, domain=symbol.domain)
             elif isinstance(value, pybamm.Symbol):
                 new_value = self.process_symbol(value)
-                new_value.domain = symbol.domain
-                return new_value
+                return self._with_domain(new_value, symbol.domain)
             else:
                 raise TypeError("Cannot process parameter '{}'".format(value))
 
@@ -729,16 +739,14 @@ class ParameterValues:
                     return self.process_symbol(pybamm.x_average(new_left.child))
             # make new symbol, ensure domain remains the same
             new_symbol = symbol._binary_new_copy(new_left, new_right)
-            new_symbol.domain = symbol.domain
-            return new_symbol
+            return self._with_domain(new_symbol, symbol.domain)
 
         # Unary operators
         elif isinstance(symbol, pybamm.UnaryOperator):
             new_child = self.process_symbol(symbol.child)
             new_symbol = symbol._unary_new_copy(new_child)
             # ensure domain remains the same
-            new_symbol.domain = symbol.domain
-            return new_symbol
+            return self._with_domain(new_symbol, symbol.domain)
 
         # Functions
         elif isinstance(symbol, pybamm.Function):
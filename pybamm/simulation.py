@@ -438,6 +438,7 @@ class Simulation:
             # inputs without having to build the simulation again
             self._solution = None
             previous_num_subsolutions = 0
+            previous_solver_stats = {}
             # Step through all experimental conditions
             inputs = kwargs.get("inputs", {})
             pybamm.logger.info("Start running experiment")
@@ -490,6 +491,12 @@ class Simulation:
                     )
                     step_solution.solve_time = 0
                     step_solution.integration_time = 0
+                    # Solver statistics of this step only
+                    step_solution.solver_stats = {
+                        key: value - previous_solver_stats.get(key, 0)
+                        for key, value in sol.solver_stats.items()
+                    }
+                    previous_solver_stats = sol.solver_stats
                     steps.append(step_solution)
 
                     # Construct cycle solutions (a list of solutions corresponding to
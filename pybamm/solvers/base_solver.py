@@ -10,6 +10,7 @@ import sys
 import itertools
 import multiprocessing as mp
 import warnings
+import weakref
 
 
 class BaseSolver(object):
@@ -58,6 +59,9 @@ class BaseSolver(object):
                 "solver-specific extra-options dictionaries instead"
             )
         self.models_set_up = {}
+        # Pool of worker processes used to solve for lists of inputs, kept alive
+        # between calls to `solve` (see `_get_worker_pool`)
+        self._worker_pool = None
 
         # Defaults, can be overwritten by specific solver
         self.name = "Base solver"
@@ -123,9 +127,19 @@ class BaseSolver(object):
         new_solver.models_set_up = {}
         return new_solver
 
+    def __getstate__(self):
+        # The pool of worker processes cannot be pickled or shared between copies
+        state = self.__dict__.copy()
+        state["_worker_pool"] = None
+        return state
+
     def set_up(self, model, inputs=None, t_eval=None):
         """Unpack model, perform checks, and calculate jacobian.
 
+        For models that are not converted to CasADi, the sparsity pattern of the
+        Jacobian used by the solver is stored in `model.jacobian_sparsity` (None if it
+        is not known).
+
         Parameters
         ----------
         model : :class:`pybamm.BaseModel`
@@ -199,8 +213,6 @@ class BaseSolver(object):
             model.convert_to_format = "casadi"
 
         if model.convert_to_format != "casadi":
-            # Create Jacobian from concatenated rhs and algebraic
-            y = pybamm.StateVector(slice(0, model.concatenated_initial_conditions.size))
             # set up Jacobian object, for re-use of dict
             jacobian = pybamm.Jacobian()
         else:
@@ -217,6 +229,16 @@ class BaseSolver(object):
                     p_casadi[name] = casadi.MX.sym(name, value.shape[0])
             p_casadi_stacked = casadi.vertcat(*[p for p in p_casadi.values()])
 
+        # Time spent converting each function and its Jacobian, reported in
+        # `Solution.solver_stats`
+        set_up_stats = {}
+        process_timer = pybamm.Timer()
+        # Sparsity patterns of the Jacobians calculated by `process`
+        jac_sparsities = {}
+        # Shared by the equations of the model, whose common subtrees are then only
+        # put in canonical form once
+        eliminator = pybamm.CommonSubexpressionEliminator()
+
         def process(func, name, use_jacobian=None):
             def report(string):
                 # don't log event conversion
@@ -227,27 +249,48 @@ class BaseSolver(object):
                 use_jacobian = model.use_jacobian
             if model.convert_to_format != "casadi":
                 # Process with pybamm functions
-
+                process_timer.reset()
+                # the initial conditions are only evaluated once, so aren't worth
+                # compiling with numba
+                convert_to_format = model.convert_to_format
+                if convert_to_format == "numba" and name == "initial_conditions":
+                    convert_to_format = "python"
+                # calculate algebraically identical subexpressions only once
+                canonical_func = eliminator.eliminate(func)
                 if model.convert_to_format == "jax":
                     report(f"Converting {name} to jax")
-                    jax_func = pybamm.EvaluatorJax(func)
+                    jax_func = pybamm.EvaluatorJax(canonical_func)
+                func_time = process_timer.time().value
 
                 if use_jacobian:
+                    process_timer.reset()
                     report(f"Calculating jacobian for {name}")
-                    jac = jacobian.jac(func, y)
+                    jac, jac_sparsities[name] = self._get_jac_and_sparsity(
+                        model, name, func, jacobian
+                    )
+                    if model.convert_to_format in ["python", "numba"]:
+                        jac = eliminator.eliminate(jac)
                     if model.convert_to_format == "python":
                         report(f"Converting jacobian for {name} to python")
-                        jac = pybamm.EvaluatorPython(jac)
+                        jac = pybamm.EvaluatorPython(jac, preallocate=True)
+                    elif model.convert_to_format == "numba":
+                        report(f"Converting jacobian for {name} to numba")
+                        jac = pybamm.EvaluatorNumba(jac)
                     elif model.convert_to_format == "jax":
                         report(f"Converting jacobian for {name} to jax")
                         jac = jax_func.get_jacobian()
                     jac = jac.evaluate
+                    jac_time = process_timer.time().value
                 else:
                     jac = None
 
-                if model.convert_to_format == "python":
+                process_timer.reset()
+                if convert_to_format == "python":
                     report(f"Converting {name} to python")
-                    func = pybamm.EvaluatorPython(func)
+                    func = pybamm.EvaluatorPython(canonical_func, preallocate=True)
+                elif convert_to_format == "numba":
+                    report(f"Converting {name} to numba")
+                    func = pybamm.EvaluatorNumba(canonical_func)
                 if model.convert_to_format == "jax":
                     report(f"Converting {name} to jax")
                     func = jax_func
@@ -256,19 +299,32 @@ class BaseSolver(object):
 
             else:
                 # Process with CasADi
+                process_timer.reset()
                 report(f"Converting {name} to CasADi")
+                func = eliminator.eliminate(func)
                 func = func.to_casadi(t_casadi, y_casadi, inputs=p_casadi)
+                func_time = process_timer.time().value
                 if use_jacobian:
+                    process_timer.reset()
                     report(f"Calculating jacobian for {name} using CasADi")
                     jac_casadi = casadi.jacobian(func, y_casadi)
                     jac = casadi.Function(
                         name, [t_casadi, y_casadi, p_casadi_stacked], [jac_casadi]
                     )
+                    jac_time = process_timer.time().value
                 else:
                     jac = None
+                process_timer.reset()
                 func = casadi.Function(
                     name, [t_casadi, y_casadi, p_casadi_stacked], [func]
                 )
+            func_time += process_timer.time().value
+            set_up_stats[f"{name.replace('_', ' ')} set-up time"] = func_time
+            if jac is not None:
+                set_up_stats["Jacobian set-up time"] = (
+                    set_up_stats.get("Jacobian set-up time", 0) + jac_time
+                )
+
             if name == "residuals":
                 func_call = Residuals(func, name, model)
             else:
@@ -355,17 +411,17 @@ class BaseSolver(object):
         algebraic, algebraic_eval, jac_algebraic = process(
             model.concatenated_algebraic, "algebraic"
         )
-        terminate_events_eval = [
-            process(event.expression, "event", use_jacobian=False)[1]
-            for event in model.events
-            if event.event_type == pybamm.EventType.TERMINATION
-        ]
 
-        interpolant_extrapolation_events_eval = [
-            process(event.expression, "event", use_jacobian=False)[1]
-            for event in model.events
-            if event.event_type == pybamm.EventType.INTERPOLANT_EXTRAPOLATION
-        ]
+        # Each type of event is compiled into a single function that returns the values
+        # of all the events of that type in one evaluation
+        process_timer.reset()
+        terminate_events_eval = self._create_events_eval(
+            model, pybamm.EventType.TERMINATION, inputs
+        )
+        interpolant_extrapolation_events_eval = self._create_events_eval(
+            model, pybamm.EventType.INTERPOLANT_EXTRAPOLATION, inputs
+        )
+        set_up_stats["events set-up time"] = process_timer.time().value
 
         # discontinuity events are evaluated before the solver is called, so don't need
         # to process them
@@ -409,10 +465,12 @@ class BaseSolver(object):
             # No rhs equations: residuals is algebraic only
             model.residuals_eval = Residuals(algebraic, "residuals", model)
             model.jacobian_eval = jac_algebraic
+            model.jacobian_sparsity = jac_sparsities.get("algebraic")
         elif len(model.algebraic) == 0:
             # No algebraic equations: residuals is rhs only
             model.residuals_eval = Residuals(rhs, "residuals", model)
             model.jacobian_eval = jac_rhs
+            model.jacobian_sparsity = jac_sparsities.get("RHS")
         # Calculate consistent initial conditions for the algebraic equations
         else:
             all_states = pybamm.NumpyConcatenation(
@@ -422,9 +480,39 @@ class BaseSolver(object):
             residuals_eval, jacobian_eval = process(all_states, "residuals")[1:]
             model.residuals_eval = residuals_eval
             model.jacobian_eval = jacobian_eval
+            model.jacobian_sparsity = jac_sparsities.get("residuals")
+
+        # Reported in the solver statistics of the next solution
+        self._set_up_stats = set_up_stats
+
+        # Any worker processes hold a copy of the model as it was previously set up,
+        # so they need to be restarted
+        if self._worker_pool is not None and self._worker_pool[1] is model:
+            self.terminate_workers()
 
         pybamm.logger.info("Finish solver set-up")
 
+    def _get_jac_and_sparsity(self, model, name, func, jacobian=None):
+        """
+        Return the symbolic Jacobian of the equations `func` of a model and its
+        sparsity pattern, see :meth:`pybamm.Jacobian.jac_and_sparsity`.
+
+        The results are memoised on the model, and re-used for as long as the
+        equations are the same objects, so that setting up the same model again
+        (e.g. with another solver, or with new initial conditions) does not
+        differentiate them again. They are freed with the model.
+        """
+        jacobian = jacobian or pybamm.Jacobian()
+        y = pybamm.StateVector(slice(0, model.concatenated_initial_conditions.size))
+        try:
+            set_up_func, jac, sparsity = model._set_up_jacobians[name]
+        except KeyError:
+            set_up_func = None
+        if set_up_func is None or not _is_same_equations(set_up_func, func):
+            jac, sparsity = jacobian.jac_and_sparsity(func, y)
+            model._set_up_jacobians[name] = (func, jac, sparsity)
+        return jac, sparsity
+
     def _set_initial_conditions(self, model, inputs, update_rhs):
         """
         Set initial conditions for the model. This is skipped if the solver is an
@@ -536,7 +624,9 @@ class BaseSolver(object):
             of size `len(model.rhs) + len(model.algebraic)`.
         nproc : int, optional
             Number of processes to use when solving for more than one set of input
-            parameters. Defaults to value returned by "os.cpu_count()".
+            parameters. Defaults to value returned by "os.cpu_count()". The worker
+            processes are kept alive between calls to `solve` with the same model,
+            see :meth:`terminate_workers`.
 
         Returns
         -------
@@ -607,6 +697,7 @@ class BaseSolver(object):
 
         # Set up (if not done already)
         timer = pybamm.Timer()
+        set_up_stats = {}
         if model not in self.models_set_up:
             # It is assumed that when len(inputs_list) > 1, model set
             # up (initial condition, time-scale and length-scale) does
@@ -617,6 +708,7 @@ class BaseSolver(object):
             self.models_set_up.update(
                 {model: {"initial conditions": model.concatenated_initial_conditions}}
             )
+            set_up_stats = self._set_up_stats
         else:
             ics_set_up = self.models_set_up[model]["initial conditions"]
             # Check that initial conditions have not been updated
@@ -628,6 +720,7 @@ class BaseSolver(object):
                 self.models_set_up[model][
                     "initial conditions"
                 ] = model.concatenated_initial_conditions
+                set_up_stats = self._set_up_stats
         set_up_time = timer.time()
         timer.reset()
 
@@ -729,24 +822,19 @@ class BaseSolver(object):
             )
             ninputs = len(ext_and_inputs_list)
             if ninputs == 1:
-                new_solution = self._integrate(
+                new_solution = self._integrate_with_stats(
                     model,
                     t_eval_dimensionless[start_index:end_index],
                     ext_and_inputs_list[0],
                 )
                 new_solutions = [new_solution]
             else:
-                with mp.Pool(processes=nproc) as p:
-                    new_solutions = p.starmap(
-                        self._integrate,
-                        zip(
-                            [model] * ninputs,
-                            [t_eval_dimensionless[start_index:end_index]] * ninputs,
-                            ext_and_inputs_list,
-                        ),
-                    )
-                    p.close()
-                    p.join()
+                new_solutions = self._integrate_batch(
+                    model,
+                    t_eval_dimensionless[start_index:end_index],
+                    ext_and_inputs_list,
+                    nproc,
+                )
             # Setting the solve time for each segment.
             # pybamm.Solution.__add__ assumes attribute solve_time.
             solve_time = timer.time()
@@ -790,6 +878,7 @@ class BaseSolver(object):
             )
             # Assign times
             solutions[i].set_up_time = set_up_time
+            solutions[i].update_solver_stats(set_up_stats)
             # all solutions get the same solve time, but their integration time
             # will be different (see https://github.com/pybamm-team/PyBaMM/pull/1261)
             solutions[i].solve_time = solve_time
@@ -839,6 +928,111 @@ class BaseSolver(object):
         else:
             return solutions
 
+    def _integrate_with_stats(self, model, t_eval, inputs):
+        """
+        Call :meth:`_integrate` and add the number of evaluations of the model's
+        functions made during the integration to the solver statistics of the
+        solution
+        """
+        counts_before = self._get_evaluation_counts(model)
+        solution = self._integrate(model, t_eval, inputs)
+        counts_after = self._get_evaluation_counts(model)
+        solution.update_solver_stats(
+            {key: counts_after[key] - counts_before[key] for key in counts_after}
+        )
+        return solution
+
+    def _get_evaluation_counts(self, model):
+        """
+        Number of evaluations of the model's functions made so far, with the same
+        keys as :attr:`pybamm.Solution.solver_stats`. Solvers that evaluate the model
+        outside of the :class:`SolverCallable` objects should add their own counts.
+        """
+        jacobians = [model.jacobian_eval, model.jac_algebraic_eval]
+        return {
+            "number of RHS evaluations": model.rhs_eval.n_evals
+            + model.algebraic_eval.n_evals
+            + model.residuals_eval.n_evals,
+            "number of Jacobian evaluations": sum(
+                jac.n_evals for jac in jacobians if jac is not None
+            ),
+            "number of event evaluations": model.terminate_events_eval.n_evals,
+        }
+
+    def _integrate_batch(self, model, t_eval, inputs_list, nproc):
+        """
+        Integrate the model for each set of inputs in `inputs_list`. By default, the
+        input sets are spread across a pool of worker processes. Solvers that can
+        integrate several input sets at once should overwrite this method.
+
+        The set-up model is only sent to each worker once, when the pool is started
+        (see :meth:`_get_worker_pool`). Each task then only sends `t_eval`, the
+        initial state and one set of inputs, and the solutions are sent back without
+        the model, which is re-attached here.
+        """
+        pool = self._get_worker_pool(model, nproc)
+        ninputs = len(inputs_list)
+        new_solutions = pool.starmap(
+            _integrate_in_worker,
+            zip([t_eval] * ninputs, [model.y0] * ninputs, inputs_list),
+        )
+        for solution in new_solutions:
+            for sol in [solution] + solution.sub_solutions:
+                sol._model = model
+        return new_solutions
+
+    def _get_worker_pool(self, model, nproc):
+        """
+        Return a pool of worker processes, each holding a copy of the set-up model.
+        The pool is re-used for as long as the model, its set-up, the number of
+        processes and the state of the solver (e.g. its tolerances) stay the same, and
+        is otherwise restarted.
+        """
+        solver_state = self.__getstate__()
+        if self._worker_pool is not None:
+            pool, pool_model, pool_nproc, pool_state, _ = self._worker_pool
+            if (
+                pool_model is model
+                and pool_nproc == nproc
+                and _same_solver_state(solver_state, pool_state)
+            ):
+                return pool
+            self.terminate_workers()
+
+        pybamm.logger.verbose("Starting {} worker processes".format(nproc or "all"))
+        # The pool keeps its initializer arguments, to start new workers, so it is
+        # given the state of the solver rather than the solver itself. Otherwise the
+        # finalizer below would keep the solver alive.
+        pool = mp.Pool(
+            processes=nproc,
+            initializer=_init_worker,
+            initargs=(type(self), solver_state, model),
+        )
+        # Make sure the worker processes are stopped when the solver is deleted. The
+        # finalizer is called (and so detached) by `terminate_workers`.
+        finalizer = weakref.finalize(self, pool.terminate)
+        # The containers in the state are copied, so that changing them in place
+        # is also detected
+        pool_state = {
+            key: copy.copy(value) if isinstance(value, (dict, list)) else value
+            for key, value in solver_state.items()
+        }
+        self._worker_pool = (pool, model, nproc, pool_state, finalizer)
+        return pool
+
+    def terminate_workers(self):
+        """
+        Stop the worker processes used to solve for lists of inputs, if any. These
+        are otherwise kept alive until the solver is deleted, so that subsequent
+        calls to `solve` with the same model do not need to start them again.
+        """
+        if self._worker_pool is not None:
+            pool, _, _, _, finalizer = self._worker_pool
+            # terminates the pool
+            finalizer()
+            pool.join()
+            self._worker_pool = None
+
     def step(
         self,
         old_solution,
@@ -960,7 +1154,7 @@ class BaseSolver(object):
             )
         )
         timer.reset()
-        solution = self._integrate(model, t_eval, ext_and_inputs)
+        solution = self._integrate_with_stats(model, t_eval, ext_and_inputs)
         solution.solve_time = timer.time()
 
         # Check if extrapolation occurred
@@ -979,6 +1173,8 @@ class BaseSolver(object):
 
         # Assign setup time
         solution.set_up_time = set_up_time
+        if old_solution is None:
+            solution.update_solver_stats(self._set_up_stats)
 
         # Report times
         pybamm.logger.verbose("Finish stepping {} ({})".format(model.name, termination))
@@ -1022,19 +1218,18 @@ class BaseSolver(object):
                 "the solver successfully reached the end of the integration interval",
             )
         elif solution.termination == "event":
-            # Get final event value
-            final_event_values = {}
-
-            for event in events:
-                if event.event_type == pybamm.EventType.TERMINATION:
-                    final_event_values[event.name] = abs(
-                        event.expression.evaluate(
-                            solution.t_event,
-                            solution.y_event,
-                            inputs=solution.all_inputs[-1],
-                        )
-                    )
-            termination_event = min(final_event_values, key=final_event_values.get)
+            # Get final event values, evaluating all the events at once
+            termination_event_names = [
+                event.name
+                for event in events
+                if event.event_type == pybamm.EventType.TERMINATION
+            ]
+            final_event_values = np.abs(
+                solution.model.terminate_events_eval(
+                    solution.t_event, solution.y_event, solution.all_inputs[-1]
+                )
+            )
+            termination_event = termination_event_names[np.argmin(final_event_values)]
             # Add the event to the solution object
             solution.termination = "event: {}".format(termination_event)
             # Update t, y and inputs to include event time and state
@@ -1072,32 +1267,72 @@ class BaseSolver(object):
         events : dict
             Dictionary of events
         """
-        extrap_events = {}
-
-        for event in events:
-            if event.event_type == pybamm.EventType.INTERPOLANT_EXTRAPOLATION:
-                # First set to False, then loop through and change to True if any
-                # events extrapolate
-                extrap_events[event.name] = False
-                # This might be a little bit slow but is ok for now
-                for ts, ys, inputs in zip(
-                    solution.all_ts, solution.all_ys, solution.all_inputs
-                ):
-                    for inner_idx, t in enumerate(ts):
-                        y = ys[:, inner_idx]
-                        if isinstance(y, casadi.DM):
-                            y = y.full()
-                        if (
-                            event.expression.evaluate(t, y, inputs=inputs)
-                            < self.extrap_tol
-                        ):
-                            extrap_events[event.name] = True
-
-        # Add the event dictionaryto the solution object
+        extrap_event_names = [
+            event.name
+            for event in events
+            if event.event_type == pybamm.EventType.INTERPOLANT_EXTRAPOLATION
+        ]
+        # First set to False, then change to True if any events extrapolate
+        extrap_events = {name: False for name in extrap_event_names}
+
+        # Extrapolation can't be checked for symbolic inputs
+        if extrap_event_names and not solution.has_symbolic_inputs:
+            events_eval = solution.model.interpolant_extrapolation_events_eval
+            # Minimum value of each event over all the times in the solution
+            min_event_values = np.full(len(extrap_event_names), np.inf)
+            for ts, ys, inputs in zip(
+                solution.all_ts, solution.all_ys, solution.all_inputs_casadi
+            ):
+                # Evaluate all the events at all the times in one call
+                event_values = events_eval.evaluate_at_times(ts, ys, inputs)
+                min_event_values = np.fmin(
+                    min_event_values, np.fmin.reduce(event_values, axis=1)
+                )
+            for name, value in zip(extrap_event_names, min_event_values):
+                if value < self.extrap_tol:
+                    extrap_events[name] = True
+
+        # Add the event dictionary to the solution object
         solution.extrap_events = extrap_events
 
         return [k for k, v in extrap_events.items() if v]
 
+    def _create_events_eval(self, model, event_type, inputs):
+        """
+        Create a :class:`Events` object that evaluates all the events of type
+        `event_type` in the model at once. Each event is reduced to the minimum value
+        of its expression, so that there is one value per event.
+        """
+        events = [event for event in model.events if event.event_type == event_type]
+
+        if model.convert_to_format == "numba" and events:
+            function = pybamm.EvaluatorNumba(
+                pybamm.NumpyConcatenation(
+                    *[pybamm.min(event.expression) for event in events]
+                )
+            )
+            return Events(function, events, model)
+
+        t_casadi = casadi.MX.sym("t")
+        y_casadi = casadi.MX.sym("y", model.concatenated_initial_conditions.size)
+        p_casadi = {}
+        for name, value in inputs.items():
+            if isinstance(value, numbers.Number):
+                p_casadi[name] = casadi.MX.sym(name)
+            else:
+                p_casadi[name] = casadi.MX.sym(name, value.shape[0])
+        p_casadi_stacked = casadi.vertcat(*[p for p in p_casadi.values()])
+        event_values = [
+            casadi.mmin(event.expression.to_casadi(t_casadi, y_casadi, inputs=p_casadi))
+            for event in events
+        ]
+        function = casadi.Function(
+            "events",
+            [t_casadi, y_casadi, p_casadi_stacked],
+            [casadi.vertcat(*event_values)],
+        )
+        return Events(function, events, model)
+
     def _set_up_ext_and_inputs(self, model, external_variables, inputs):
         """Set up external variables and input parameters"""
         inputs = inputs or {}
@@ -1123,6 +1358,68 @@ class BaseSolver(object):
         return ext_and_inputs
 
 
+def _is_same_equations(symbol, other):
+    """
+    Whether `symbol` and `other` are the same equations of a model. The concatenated
+    equations of a model are the same objects between set-ups, except for the
+    concatenation of the rhs and algebraic equations, which is created again.
+    """
+    if symbol is other:
+        return True
+    return (
+        type(symbol) is pybamm.NumpyConcatenation
+        and type(other) is pybamm.NumpyConcatenation
+        and len(symbol.children) == len(other.children)
+        and all(a is b for a, b in zip(symbol.children, other.children))
+    )
+
+
+def _same_solver_state(state, other):
+    """
+    Whether two states of a solver, see `BaseSolver.__getstate__`, are the same. The
+    models that have been set up are not compared, since setting up a model
+    restarts the worker processes anyway.
+    """
+    if state.keys() != other.keys():
+        return False
+    for key, value in state.items():
+        other_value = other[key]
+        if key in ["models_set_up", "_set_up_stats"] or value is other_value:
+            continue
+        try:
+            if isinstance(value, np.ndarray) or isinstance(other_value, np.ndarray):
+                same = np.array_equal(value, other_value)
+            else:
+                same = bool(value == other_value)
+        except (ValueError, TypeError):
+            # e.g. containers of arrays, assume they are different
+            same = False
+        if not same:
+            return False
+    return True
+
+
+# Solver and model held by each worker process, see `BaseSolver._get_worker_pool`
+_worker_solver = None
+_worker_model = None
+
+
+def _init_worker(solver_class, solver_state, model):
+    global _worker_solver, _worker_model
+    _worker_solver = solver_class.__new__(solver_class)
+    _worker_solver.__dict__.update(solver_state)
+    _worker_model = model
+
+
+def _integrate_in_worker(t_eval, y0, inputs):
+    _worker_model.y0 = y0
+    solution = _worker_solver._integrate_with_stats(_worker_model, t_eval, inputs)
+    # Don't send the model back with the solution, the parent process already has it
+    for sol in [solution] + solution.sub_solutions:
+        sol._model = None
+    return solution
+
+
 class SolverCallable:
     """A class that will be called by the solver when integrating"""
 
@@ -1135,8 +1432,11 @@ class SolverCallable:
         self.name = name
         self.model = model
         self.timescale = self.model.timescale_eval
+        # Number of times the function has been called, see `Solution.solver_stats`
+        self.n_evals = 0
 
     def __call__(self, t, y, inputs):
+        self.n_evals += 1
         if self.name in ["RHS", "algebraic", "residuals"]:
             pybamm.logger.debug(
                 "Evaluating {} for {} at t={}".format(
@@ -1172,6 +1472,56 @@ class Residuals(SolverCallable):
         return states_eval - self.mass_matrix @ ydot
 
 
+class Events(SolverCallable):
+    """
+    Returns the values of all the events of a given type at time t and state y, in a
+    single evaluation of a CasADi function (or of a :class:`pybamm.EvaluatorNumba`, for
+    models in "numba" format)
+
+    Parameters
+    ----------
+    function : :class:`casadi.Function` or :class:`pybamm.EvaluatorNumba`
+        Function returning the value of each event, stacked into a vector
+    events : list of :class:`pybamm.Event`
+        The events, in the same order as the values returned by `function`
+    model : :class:`pybamm.BaseModel`
+        The model the events belong to
+    """
+
+    def __init__(self, function, events, model):
+        super().__init__(function, "events", model)
+        self.events = events
+
+    def __len__(self):
+        return len(self.events)
+
+    def __call__(self, t, y, inputs):
+        self.n_evals += 1
+        if self.form == "python":
+            return np.reshape(self._function.evaluate(t, y, inputs=inputs), -1)
+        if isinstance(inputs, dict):
+            inputs = casadi.vertcat(*[x for x in inputs.values()])
+        return self._function(t, y, inputs).full().flatten()
+
+    def evaluate_at_times(self, ts, ys, inputs):
+        """
+        Evaluate all the events at all the times `ts` at once, by mapping the function
+        over the columns of `ys`. Returns an array with one row per event and one
+        column per time.
+        """
+        if self.form == "python":
+            return np.column_stack(
+                [
+                    np.reshape(self._function.evaluate(t, y, inputs=inputs), -1)
+                    for t, y in zip(np.reshape(ts, -1), ys.T)
+                ]
+            )
+        if isinstance(inputs, dict):
+            inputs = casadi.vertcat(*[x for x in inputs.values()])
+        ts = np.asarray(ts).reshape(1, -1)
+        return self._function.map(ts.shape[1])(ts, ys, inputs).full()
+
+
 class InitialConditions(SolverCallable):
     """Returns initial conditions given inputs"""
 
@@ -104,30 +104,24 @@ class CasadiAlgebraicSolver(pybamm.BaseSolver):
 
         # Check interpolant extrapolation
         if model.interpolant_extrapolation_events_eval:
-            extrap_event = [
-                event(0, y0, inputs)
-                for event in model.interpolant_extrapolation_events_eval
-            ]
-            if extrap_event:
-                if (np.concatenate(extrap_event) < self.extrap_tol).any():
-                    extrap_event_names = []
-                    for event in model.events:
-                        if (
-                            event.event_type
-                            == pybamm.EventType.INTERPOLANT_EXTRAPOLATION
-                            and (
-                                event.expression.evaluate(0, y0.full(), inputs=inputs)
-                                < self.extrap_tol
-                            )
-                        ):
-                            extrap_event_names.append(event.name[12:])
-
-                    raise pybamm.SolverError(
-                        "CasADI solver failed because the following interpolation "
-                        "bounds were exceeded at the initial conditions: {}. "
-                        "You may need to provide additional interpolation points "
-                        "outside these bounds.".format(extrap_event_names)
+            extrap_event_values = model.interpolant_extrapolation_events_eval(
+                0, y0, inputs
+            )
+            if (extrap_event_values < self.extrap_tol).any():
+                extrap_event_names = [
+                    event.name[12:]
+                    for event, value in zip(
+                        model.interpolant_extrapolation_events_eval.events,
+                        extrap_event_values,
                     )
+                    if value < self.extrap_tol
+                ]
+                raise pybamm.SolverError(
+                    "CasADI solver failed because the following interpolation "
+                    "bounds were exceeded at the initial conditions: {}. "
+                    "You may need to provide additional interpolation points "
+                    "outside these bounds.".format(extrap_event_names)
+                )
 
         # Set constraints vector in the casadi format
         # Constrain the unknowns. 0 (default): no constraint on ui, 1: ui >= 0.0,
@@ -2,10 +2,10 @@
 # CasADi Solver class
 #
 import casadi
+import os
 import pybamm
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.optimize import brentq
+from collections import OrderedDict
 
 
 class CasadiSolver(pybamm.BaseSolver):
@@ -43,10 +43,14 @@ class CasadiSolver(pybamm.BaseSolver):
     max_step_decrease_counts : float, optional
         The maximum number of times step size can be decreased before an error is
         raised. Default is 5.
-    dt_max : float, optional
+    dt_max : float or str, optional
         The maximum global step size (in seconds) used in "safe" mode. If None
         the default value corresponds to a non-dimensional time of 0.01
-        (i.e. ``0.01 * model.timescale_eval``).
+        (i.e. ``0.01 * model.timescale_eval``). If "adaptive", the global steps start
+        at this default size and are then grown, or shrunk, after each step to cover
+        half of the predicted time to the nearest terminating event, found by
+        extrapolating the event values from the previous step. The number of global
+        steps is reported in :attr:`pybamm.Solution.solver_stats`.
     extrap_tol : float, optional
         The tolerance to assert whether extrapolation occurs or not. Default is 0.
     extra_options_setup : dict, optional
@@ -64,6 +68,23 @@ class CasadiSolver(pybamm.BaseSolver):
 
     """
 
+    # Maximum number of integrators (with different grids) kept for each model
+    _max_cached_integrators = 10
+    # Maximum number of iterations to locate an event
+    _max_event_iterations = 50
+    # With adaptive global steps, the maximum growth of a step over the previous one,
+    # and the fraction of the predicted time to the next event covered by a step
+    _dt_growth_factor = 2
+    _dt_event_factor = 0.5
+    # Statistics reported by the CasADi integrators, see `_get_integrator_stats`
+    _integrator_stats_keys = [
+        "number of RHS evaluations",
+        "number of Jacobian evaluations",
+        "number of steps",
+        "number of nonlinear solver failures",
+        "number of error test failures",
+    ]
+
     def __init__(
         self,
         mode="safe",
@@ -100,6 +121,8 @@ class CasadiSolver(pybamm.BaseSolver):
         # Initialize
         self.integrators = {}
         self.integrator_specs = {}
+        self._cached_integrators = {}
+        self._n_integrators_created = 0
 
         pybamm.citations.register("Andersson2019")
 
@@ -148,14 +171,8 @@ class CasadiSolver(pybamm.BaseSolver):
             # Step-and-check
             t = t_eval[0]
             t_f = t_eval[-1]
-            if model.terminate_events_eval:
-                init_event_signs = np.sign(
-                    np.concatenate(
-                        [event(t, y0, inputs) for event in model.terminate_events_eval]
-                    )
-                )
-            else:
-                init_event_signs = np.sign([])
+            event_values = model.terminate_events_eval(t, y0, inputs)
+            init_event_signs = np.sign(event_values)
 
             pybamm.logger.debug(
                 "Start solving {} with {}".format(model.name, self.name)
@@ -176,13 +193,9 @@ class CasadiSolver(pybamm.BaseSolver):
             # Try to integrate in global steps of size dt_max. Note: dt_max must
             # be at least as big as the the biggest step in t_eval (multiplied
             # by some tolerance, here 1.01) to avoid an empty integration window below
-            if self.dt_max:
-                # Non-dimensionalise provided dt_max
-                dt_max = self.dt_max / model.timescale_eval
-            else:
-                dt_max = 0.01
-            dt_eval_max = np.max(np.diff(t_eval)) * 1.01
-            dt_max = np.max([dt_max, dt_eval_max])
+            dt_max = self._get_dt_max(model, t_eval)
+            dt_min = self._get_dt_max(model, t_eval, minimum=True)
+            n_global_steps = 0
             while t < t_f:
                 # Step
                 solved = False
@@ -210,6 +223,7 @@ class CasadiSolver(pybamm.BaseSolver):
                             model, y0, inputs_dict, inputs, t_window
                         )
                         solved = True
+                        n_global_steps += 1
                     except pybamm.SolverError:
                         dt /= 2
                         # also reduce maximum step size for future global steps
@@ -225,114 +239,40 @@ class CasadiSolver(pybamm.BaseSolver):
                             )
                         )
                 # Check most recent y to see if any events have been crossed
-                if model.terminate_events_eval:
-                    new_event_signs = np.sign(
-                        np.concatenate(
-                            [
-                                event(t, current_step_sol.all_ys[-1][:, -1], inputs)
-                                for event in model.terminate_events_eval
-                            ]
-                        )
-                    )
-                else:
-                    new_event_signs = np.sign([])
-
-                if model.interpolant_extrapolation_events_eval:
-                    extrap_event = [
-                        event(t, current_step_sol.y[:, -1], inputs=inputs)
-                        for event in model.interpolant_extrapolation_events_eval
-                    ]
-
-                    if extrap_event:
-                        if (np.concatenate(extrap_event) < self.extrap_tol).any():
-                            extrap_event_names = []
-                            for event in model.events:
-                                if (
-                                    event.event_type
-                                    == pybamm.EventType.INTERPOLANT_EXTRAPOLATION
-                                    and (
-                                        event.expression.evaluate(
-                                            t,
-                                            current_step_sol.y[:, -1].full(),
-                                            inputs=inputs,
-                                        )
-                                        < self.extrap_tol
-                                    ).any()
-                                ):
-                                    extrap_event_names.append(event.name[12:])
-
-                            raise pybamm.SolverError(
-                                "CasADI solver failed because the following "
-                                "interpolation bounds were exceeded: {}. You may need "
-                                "to provide additional interpolation points outside "
-                                "these bounds.".format(extrap_event_names)
-                            )
+                new_event_values = model.terminate_events_eval(
+                    t_window[-1], current_step_sol.all_ys[-1][:, -1], inputs
+                )
+                new_event_signs = np.sign(new_event_values)
+
+                self._check_extrapolation_at_step(
+                    model, t_window[-1], current_step_sol.all_ys[-1][:, -1], inputs
+                )
 
                 # Exit loop if the sign of an event changes
-                # Locate the event time using a root finding algorithm and
-                # event state using interpolation. The solution is then truncated
-                # so that only the times up to the event are returned
+                # Locate the event time and state using a root finding algorithm.
+                # The solution is then truncated so that only the times up to the
+                # event are returned
                 if (new_event_signs != init_event_signs).any():
-                    # get the index of the events that have been crossed
-                    event_ind = np.where(new_event_signs != init_event_signs)[0]
-                    active_events = [model.terminate_events_eval[i] for i in event_ind]
-
-                    # solve again with a more dense t_window
-                    if len(t_window) < 10:
-                        t_window_dense = np.linspace(t_window[0], t_window[-1], 10)
-                        if self.mode == "safe":
-                            self.create_integrator(model, inputs, t_window_dense)
-                        current_step_sol = self._run_integrator(
-                            model, y0, inputs_dict, inputs, t_window_dense
-                        )
-                    integration_time = current_step_sol.integration_time
-
-                    # create interpolant to evaluate y in the current integration
-                    # window
-                    y_sol = interp1d(
-                        current_step_sol.t, current_step_sol.y, kind="cubic"
+                    t_event, y_event = self._locate_event(
+                        model, current_step_sol, inputs_dict, inputs, init_event_signs
                     )
 
-                    # loop over events to compute the time at which they were triggered
-                    t_events = [None] * len(active_events)
-                    for i, event in enumerate(active_events):
-
-                        def event_fun(t):
-                            return event(t, y_sol(t), inputs)
-
-                        if np.isnan(event_fun(current_step_sol.t[-1])[0]):
-                            # bracketed search fails if f(a) or f(b) is NaN, so we
-                            # need to find the times for which we can evaluate the event
-                            times = [
-                                t
-                                for t in current_step_sol.t
-                                if event_fun(t)[0] == event_fun(t)[0]
-                            ]
-                        else:
-                            times = current_step_sol.t
-                        # skip if sign hasn't changed
-                        if np.sign(event_fun(times[0])) != np.sign(
-                            event_fun(times[-1])
-                        ):
-                            t_events[i] = brentq(
-                                lambda t: event_fun(t), times[0], times[-1]
-                            )
-                        else:
-                            t_events[i] = np.nan
-
-                    # t_event is the earliest event triggered
-                    t_event = np.nanmin(t_events)
-                    y_event = y_sol(t_event)
-
-                    # call interpolant at times in t_eval and create solution
-                    t_window = np.concatenate(
-                        ([t], t_eval[(t_eval > t) & (t_eval < t_event)])
+                    # Only keep the times before the event. The event time and
+                    # state are added to the solution by `get_termination_reason`
+                    before_event = current_step_sol.t < t_event
+                    # keep the start of the window, as for any other step
+                    before_event[0] = True
+                    truncated_step_sol = pybamm.Solution(
+                        current_step_sol.t[before_event],
+                        current_step_sol.y[:, np.where(before_event)[0].tolist()],
+                        model,
+                        inputs_dict,
                     )
-                    y_sol_casadi = casadi.DM(y_sol(t_window))
-                    current_step_sol = pybamm.Solution(
-                        t_window, y_sol_casadi, model, inputs_dict
+                    truncated_step_sol.integration_time = (
+                        current_step_sol.integration_time
                     )
-                    current_step_sol.integration_time = integration_time
+                    truncated_step_sol.solver_stats = current_step_sol.solver_stats
+                    current_step_sol = truncated_step_sol
                     # assign temporary solve time
                     current_step_sol.solve_time = np.nan
 
@@ -354,38 +294,421 @@ class CasadiSolver(pybamm.BaseSolver):
                     else:
                         # append solution from the current step to solution
                         solution = solution + current_step_sol
+                    if self.dt_max == "adaptive":
+                        dt_max = self._predict_dt_max(
+                            dt,
+                            dt_min,
+                            t,
+                            event_values,
+                            t_window[-1],
+                            new_event_values,
+                        )
+                    event_values = new_event_values
                     # update time
                     t = t_window[-1]
                     # update y0
                     y0 = solution.all_ys[-1][:, -1]
+            solution.update_solver_stats({"number of global steps": n_global_steps})
             return solution
 
+    def _locate_event(self, model, step_sol, inputs_dict, inputs, init_event_signs):
+        """
+        Locate the earliest event triggered during an integration window, to solver
+        tolerance.
+
+        The events are first evaluated at all the times of the window, to find the
+        first interval over which an event changes sign. The event time is then
+        found within that interval with the Illinois (modified regula falsi) method.
+        Each evaluation integrates the model from the left end of the current
+        bracket, using the integrator without grid, instead of integrating again
+        over a dense grid and interpolating. The integration time and solver
+        statistics of these integrations are added to `step_sol`.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model being solved
+        step_sol : :class:`pybamm.Solution`
+            The solution over the integration window in which an event was triggered
+        inputs_dict : dict
+            Any input parameters to pass to the model when solving
+        inputs : :class:`casadi.DM`
+            The input parameters, stacked
+        init_event_signs : :class:`numpy.array`
+            The signs of the events at the start of the integration
+
+        Returns
+        -------
+        t_event : float
+            The time of the earliest event
+        y_event : :class:`numpy.array`
+            The state at the time of the event
+        """
+        ts = step_sol.t
+        ys = step_sol.y
+        event_values = model.terminate_events_eval.evaluate_at_times(ts, ys, inputs)
+        # An event is crossed when its sign is opposite to its initial sign. If no
+        # event has changed sign, an event became NaN, and we locate that instead
+        crossed = np.sign(event_values) == -init_event_signs[:, np.newaxis]
+        if not crossed.any():
+            crossed = np.sign(event_values) != init_event_signs[:, np.newaxis]
+        # First interval in which an event is crossed, and the events crossed there
+        k = np.min(np.where(crossed.any(axis=0))[0])
+        if k == 0:
+            # an event is already crossed at the start of the window (e.g. it was
+            # exactly zero there), so there is no interval to search
+            return ts[0], ys[:, 0].full().flatten()
+        event_inds = np.where(crossed[:, k])[0]
+
+        y_start = ys[:, k - 1].full().flatten()
+        t_events = []
+        y_events = []
+        for ind in event_inds:
+            t_event, y_event = self._illinois(
+                model,
+                ind,
+                ts[k - 1],
+                y_start,
+                event_values[ind, k - 1],
+                ts[k],
+                event_values[ind, k],
+                step_sol,
+                inputs_dict,
+                inputs,
+            )
+            t_events.append(t_event)
+            y_events.append(y_event)
+        # the earliest event is the one that is triggered
+        i = np.argmin(t_events)
+        return t_events[i], y_events[i]
+
+    def _illinois(
+        self, model, ind, t_a, y_a, f_a, t_b, f_b, step_sol, inputs_dict, inputs
+    ):
+        """
+        Find the time in [t_a, t_b] at which event `ind` changes sign with the
+        Illinois method, integrating the model from the left end of the bracket at
+        each iteration. See :meth:`_locate_event`.
+
+        The iterations stop once the bracket is shorter than the relative tolerance
+        of the solver, which is the accuracy of the integrated states, and the end
+        of the bracket before the event is returned. The event values are not
+        compared with a tolerance, since their units differ from those of the
+        states.
+        """
+        t_tol = max(self.rtol, 4 * np.finfo(float).eps) * max(1, abs(t_b))
+        side = 0
+        for _ in range(self._max_event_iterations):
+            if t_b - t_a <= t_tol:
+                break
+            if np.isnan(f_b):
+                # can't interpolate with a NaN value, so bisect instead
+                t_c = (t_a + t_b) / 2
+            else:
+                t_c = (t_a * f_b - t_b * f_a) / (f_b - f_a)
+                if not t_a < t_c < t_b:
+                    t_c = (t_a + t_b) / 2
+
+            self.create_integrator(model, inputs)
+            sol = self._run_integrator(
+                model, y_a, inputs_dict, inputs, np.array([t_a, t_c])
+            )
+            step_sol.integration_time += sol.integration_time
+            step_sol.update_solver_stats(sol.solver_stats)
+            y_c = sol.y[:, -1].full().flatten()
+            f_c = model.terminate_events_eval(t_c, y_c, inputs)[ind]
+
+            if f_c == 0:
+                return t_c, y_c
+            if np.sign(f_c) == np.sign(f_a):
+                # root is in [t_c, t_b]
+                t_a, y_a, f_a = t_c, y_c, f_c
+                if side == 1:
+                    # Illinois modification: halve the value at the retained end
+                    # to avoid slow, one-sided convergence
+                    f_b /= 2
+                side = 1
+            else:
+                # root is in [t_a, t_c] (or the event is NaN at t_c)
+                t_b, f_b = t_c, f_c
+                if side == -1:
+                    f_a /= 2
+                side = -1
+
+        return t_a, y_a
+
+    def _get_dt_max(self, model, t_eval, minimum=False):
+        """
+        Get the (non-dimensional) size of the global steps used in "safe" mode. This
+        must be at least as big as the biggest step in t_eval (multiplied by some
+        tolerance, here 1.01) to avoid an empty integration window. If `minimum` is
+        True, return this smallest allowed size instead (used as the lower bound for
+        adaptive global steps).
+        """
+        dt_eval_max = np.max(np.diff(t_eval)) * 1.01
+        if minimum:
+            return dt_eval_max
+        if self.dt_max and self.dt_max != "adaptive":
+            # Non-dimensionalise provided dt_max
+            dt_max = self.dt_max / model.timescale_eval
+        else:
+            dt_max = 0.01
+        return np.max([dt_max, dt_eval_max])
+
+    def _predict_dt_max(self, dt, dt_min, t_prev, event_values_prev, t, event_values):
+        """
+        Predict the size of the next global step when `dt_max` is "adaptive". The
+        time to the nearest terminating event is estimated by extrapolating the
+        event values linearly, using their rate of change over the last global step.
+        The next step is sized to cover a fraction `_dt_event_factor` of the time to
+        that predicted event, as models often can't be integrated far past their
+        events (e.g. past a voltage cut-off), so steps shrink as an event gets
+        closer. Steps can grow by at most a factor `_dt_growth_factor`, and can't be
+        smaller than `dt_min`.
+
+        The step size is rounded down to a power of two times `dt_min`, so that the
+        windows only take a few different shapes and their integrators are reused
+        (see :meth:`create_integrator`).
+        """
+        rates = (event_values - event_values_prev) / (t - t_prev)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            times_to_event = -event_values / rates
+        # Only events that are getting closer to zero
+        times_to_event = times_to_event[times_to_event > 0]
+        dt_max = self._dt_growth_factor * dt
+        if times_to_event.size > 0:
+            dt_max = min(dt_max, self._dt_event_factor * np.min(times_to_event))
+        # small tolerance so that exact powers of two aren't rounded down again
+        exponent = np.floor(np.log2(max(dt_max / dt_min, 1)) + 1e-8)
+        return dt_min * 2 ** exponent
+
+    def _check_extrapolation_at_step(self, model, t, y, inputs):
+        """
+        Raise an error if any interpolant is extrapolated at time t and state y, at the
+        end of a global step in "safe" mode
+        """
+        if model.interpolant_extrapolation_events_eval:
+            extrap_event_values = model.interpolant_extrapolation_events_eval(
+                t, y, inputs
+            )
+            if (extrap_event_values < self.extrap_tol).any():
+                extrap_event_names = [
+                    event.name[12:]
+                    for event, value in zip(
+                        model.interpolant_extrapolation_events_eval.events,
+                        extrap_event_values,
+                    )
+                    if value < self.extrap_tol
+                ]
+                raise pybamm.SolverError(
+                    "CasADI solver failed because the following "
+                    "interpolation bounds were exceeded: {}. You may need "
+                    "to provide additional interpolation points outside "
+                    "these bounds.".format(extrap_event_names)
+                )
+
+    def _integrate_batch(self, model, t_eval, inputs_list, nproc=None):
+        """
+        Solve the model for each set of inputs in `inputs_list`, by mapping the CasADi
+        integrator over the input sets (see `casadi.Function.map`) and evaluating it
+        with `nproc` threads, instead of spreading the input sets across processes.
+
+        In "safe" mode, all the input sets are integrated together in global steps of
+        size dt_max. If `dt_max` is "adaptive", each global step is the smallest of
+        the steps predicted by :meth:`_predict_dt_max` for the input sets that are
+        still integrated together, so that none of them steps too far past an event.
+        Any input set for which an event has been triggered, or for
+        which the integration fails, is then finished on its own using
+        :meth:`_integrate`, which locates the event or reduces the step size.
+
+        Mapped integrators don't report the statistics of the integrations of each
+        input set, so the integrator statistics (e.g. "number of steps") are left out
+        of :attr:`pybamm.Solution.solver_stats` for the input sets that were
+        integrated by them, rather than only counting the steps integrated on their
+        own.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : numeric type
+            The times at which to compute the solution
+        inputs_list : list of dict
+            The external variables and input parameters for each solution
+        nproc : int, optional
+            Number of threads to use. Defaults to value returned by "os.cpu_count()".
+        """
+        # Fall back to multiprocessing for symbolic inputs and for the "safe without
+        # grid" mode, which don't use the grid
+        has_symbolic_inputs = any(
+            isinstance(v, casadi.MX)
+            for inputs_dict in inputs_list
+            for v in inputs_dict.values()
+        )
+        if has_symbolic_inputs or self.mode == "safe without grid":
+            return super()._integrate_batch(model, t_eval, inputs_list, nproc)
+
+        nthreads = nproc or os.cpu_count()
+        # convert inputs to casadi format
+        inputs = [
+            casadi.vertcat(*[x for x in inputs_dict.values()])
+            for inputs_dict in inputs_list
+        ]
+        ninputs = len(inputs_list)
+
+        if self.mode == "fast" or not model.events:
+            if not model.events:
+                pybamm.logger.info("No events found, running fast mode")
+            return self._run_integrator_batch(
+                model, [model.y0] * ninputs, inputs_list, inputs, t_eval, nthreads
+            )
+
+        # Step-and-check, for all the input sets at once
+        y0 = model.y0
+        t = t_eval[0]
+        t_f = t_eval[-1]
+        dt_max = self._get_dt_max(model, t_eval)
+        dt_min = self._get_dt_max(model, t_eval, minimum=True)
+        event_values = [
+            model.terminate_events_eval(t, y0, inputs[i]) for i in range(ninputs)
+        ]
+        init_event_signs = [np.sign(values) for values in event_values]
+        solutions = [None] * ninputs
+        y0s = [y0] * ninputs
+        n_global_steps = [0] * ninputs
+        active = list(range(ninputs))
+        while active and t < t_f:
+            t_window = np.concatenate(
+                ([t], t_eval[(t_eval > t) & (t_eval < t + dt_max)])
+            )
+            if len(t_window) == 1:
+                t_window = np.array([t, t + dt_max])
+            try:
+                step_sols = self._run_integrator_batch(
+                    model,
+                    [y0s[i] for i in active],
+                    [inputs_list[i] for i in active],
+                    [inputs[i] for i in active],
+                    t_window,
+                    nthreads,
+                )
+            except pybamm.SolverError:
+                step_sols = [None] * len(active)
+
+            still_active = []
+            predicted_dt_max = []
+            for i, step_sol in zip(active, step_sols):
+                # count the evaluations of the model made for this input set only
+                counts_before = self._get_evaluation_counts(model)
+                if step_sol is not None:
+                    new_event_values = model.terminate_events_eval(
+                        t_window[-1], step_sol.all_ys[-1][:, -1], inputs[i]
+                    )
+                if step_sol is None or self._batch_member_stopped(
+                    model,
+                    t_window[-1],
+                    step_sol,
+                    inputs[i],
+                    init_event_signs[i],
+                    new_event_values,
+                ):
+                    # Finish this input set on its own, starting again from t
+                    model.y0 = y0s[i]
+                    step_sol = self._integrate(
+                        model,
+                        np.concatenate(([t], t_eval[t_eval > t])),
+                        inputs_list[i],
+                    )
+                else:
+                    still_active.append(i)
+                    y0s[i] = step_sol.all_ys[-1][:, -1]
+                    n_global_steps[i] += 1
+                    if self.dt_max == "adaptive":
+                        predicted_dt_max.append(
+                            self._predict_dt_max(
+                                dt_max,
+                                dt_min,
+                                t,
+                                event_values[i],
+                                t_window[-1],
+                                new_event_values,
+                            )
+                        )
+                    event_values[i] = new_event_values
+                counts_after = self._get_evaluation_counts(model)
+                step_sol.update_solver_stats(
+                    {
+                        key: counts_after[key] - counts_before[key]
+                        for key in counts_after
+                    }
+                )
+                # assign temporary solve time
+                step_sol.solve_time = np.nan
+                if solutions[i] is None:
+                    solutions[i] = step_sol
+                else:
+                    solutions[i] = solutions[i] + step_sol
+                    # the termination is not kept when step_sol only contains t
+                    solutions[i].termination = step_sol.termination
+                    solutions[i].t_event = step_sol.t_event
+                    solutions[i].y_event = step_sol.y_event
+            active = still_active
+            if predicted_dt_max:
+                dt_max = min(predicted_dt_max)
+            t = t_window[-1]
+
+        for i, solution in enumerate(solutions):
+            solution.update_solver_stats({"number of global steps": n_global_steps[i]})
+            if n_global_steps[i] > 0:
+                # the integrator statistics of the mapped global steps are not known
+                for key in self._integrator_stats_keys:
+                    solution.solver_stats.pop(key, None)
+        model.y0 = y0
+        return solutions
+
+    def _batch_member_stopped(
+        self, model, t, step_sol, inputs, init_event_signs, event_values
+    ):
+        """
+        Check whether an event has been triggered, or an interpolant extrapolated,
+        by the end of the current step (at time t) for one of the input sets solved
+        in :meth:`_integrate_batch`, given the values of the events at time t
+        """
+        y = step_sol.all_ys[-1][:, -1]
+        if (np.sign(event_values) != init_event_signs).any():
+            return True
+        if model.interpolant_extrapolation_events_eval:
+            extrap_event_values = model.interpolant_extrapolation_events_eval(
+                t, y, inputs
+            )
+            return (extrap_event_values < self.extrap_tol).any()
+        return False
+
     def create_integrator(self, model, inputs, t_eval=None):
         """
         Method to create a casadi integrator object.
         If t_eval is provided, the integrator uses t_eval to make the grid.
         Otherwise, the integrator has grid [0,1].
+
+        Time is always rescaled to [0, 1], with the start and end times passed to the
+        integrator as parameters, so the grid only depends on the relative spacing of
+        t_eval. The integrators for each model are cached on this rescaled grid, so
+        that integration windows of the same shape (e.g. the global steps and the
+        event location windows of "safe" mode) all reuse the same integrator.
         """
         # Use grid if t_eval is given
         use_grid = not (t_eval is None)
-        # Only set up problem once
-        if model in self.integrators:
-            # If we're not using the grid, we don't need to change the integrator
-            if use_grid is False:
-                return self.integrators[model][0]
-            # Otherwise, create new integrator with an updated grid
-            # We don't need to update the grid if reusing the same t_eval
-            else:
-                method, problem, options = self.integrator_specs[model]
-                t_eval_old = options["grid"]
-                if np.array_equal(t_eval_old, t_eval):
-                    return self.integrators[model][0]
-                else:
-                    options["grid"] = t_eval
-                    integrator = casadi.integrator("F", method, problem, options)
-                    self.integrators[model] = (integrator, use_grid)
-                    return integrator
+        if use_grid:
+            t_eval = np.asarray(t_eval)
+            # Round so that windows with the same shape, but at different times, get
+            # exactly the same grid
+            grid = np.round((t_eval - t_eval[0]) / (t_eval[-1] - t_eval[0]), 12)
+            key = tuple(grid)
         else:
+            key = None
+
+        # Only set up problem once
+        if model not in self.integrator_specs:
             y0 = model.y0
             rhs = model.casadi_rhs
             algebraic = model.casadi_algebraic
@@ -411,20 +734,12 @@ class CasadiSolver(pybamm.BaseSolver):
             p = casadi.MX.sym("p", inputs.shape[0])
             y_diff = casadi.MX.sym("y_diff", rhs(0, y0, p).shape[0])
 
-            if use_grid is False:
-                # rescale time
-                t_min = casadi.MX.sym("t_min")
-                t_max = casadi.MX.sym("t_max")
-                t_scaled = t_min + (t_max - t_min) * t
-                # add time limits as inputs
-                p_with_tlims = casadi.vertcat(p, t_min, t_max)
-            else:
-                options.update({"grid": t_eval, "output_t0": True})
-                # Set dummy parameters for consistency with rescaled time
-                t_max = 1
-                t_min = 0
-                t_scaled = t
-                p_with_tlims = p
+            # rescale time
+            t_min = casadi.MX.sym("t_min")
+            t_max = casadi.MX.sym("t_max")
+            t_scaled = t_min + (t_max - t_min) * t
+            # add time limits as inputs
+            p_with_tlims = casadi.vertcat(p, t_min, t_max)
 
             problem = {"t": t, "x": y_diff, "p": p_with_tlims}
             if algebraic(0, y0, p).is_empty():
@@ -443,10 +758,26 @@ class CasadiSolver(pybamm.BaseSolver):
                         "alg": algebraic(t_scaled, y_full, p),
                     }
                 )
-            integrator = casadi.integrator("F", method, problem, options)
             self.integrator_specs[model] = method, problem, options
-            self.integrators[model] = (integrator, use_grid)
-            return integrator
+            self._cached_integrators[model] = OrderedDict()
+
+        # Reuse an integrator with the same grid if there is one, otherwise create a
+        # new one and drop the least recently used one if the cache is full
+        cached_integrators = self._cached_integrators[model]
+        if key in cached_integrators:
+            cached_integrators.move_to_end(key)
+            integrator = cached_integrators[key]
+        else:
+            method, problem, options = self.integrator_specs[model]
+            if use_grid:
+                options = {**options, "grid": grid, "output_t0": True}
+            integrator = casadi.integrator("F", method, problem, options)
+            self._n_integrators_created += 1
+            cached_integrators[key] = integrator
+            if len(cached_integrators) > self._max_cached_integrators:
+                cached_integrators.popitem(last=False)
+        self.integrators[model] = (integrator, use_grid)
+        return integrator
 
     def _run_integrator(self, model, y0, inputs_dict, inputs, t_eval):
         integrator, use_grid = self.integrators[model]
@@ -457,14 +788,19 @@ class CasadiSolver(pybamm.BaseSolver):
             # Try solving
             if use_grid is True:
                 # Call the integrator once, with the grid
+                inputs_with_tlims = casadi.vertcat(inputs, t_eval[0], t_eval[-1])
                 timer = pybamm.Timer()
                 casadi_sol = integrator(
-                    x0=y0_diff, z0=y0_alg, p=inputs, **self.extra_options_call
+                    x0=y0_diff,
+                    z0=y0_alg,
+                    p=inputs_with_tlims,
+                    **self.extra_options_call
                 )
                 integration_time = timer.time()
                 y_sol = casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"])
                 sol = pybamm.Solution(t_eval, y_sol, model, inputs_dict)
                 sol.integration_time = integration_time
+                sol.update_solver_stats(self._get_integrator_stats(integrator))
                 return sol
             else:
                 # Repeated calls to the integrator
@@ -472,6 +808,7 @@ class CasadiSolver(pybamm.BaseSolver):
                 z = y0_alg
                 y_diff = x
                 y_alg = z
+                stats = {}
                 for i in range(len(t_eval) - 1):
                     t_min = t_eval[i]
                     t_max = t_eval[i + 1]
@@ -481,6 +818,8 @@ class CasadiSolver(pybamm.BaseSolver):
                         x0=x, z0=z, p=inputs_with_tlims, **self.extra_options_call
                     )
                     integration_time = timer.time()
+                    for key, value in self._get_integrator_stats(integrator).items():
+                        stats[key] = stats.get(key, 0) + value
                     x = casadi_sol["xf"]
                     z = casadi_sol["zf"]
                     y_diff = casadi.horzcat(y_diff, x)
@@ -493,7 +832,71 @@ class CasadiSolver(pybamm.BaseSolver):
                     sol = pybamm.Solution(t_eval, y_sol, model, inputs_dict)
 
                 sol.integration_time = integration_time
+                sol.update_solver_stats(stats)
                 return sol
         except RuntimeError as e:
             # If it doesn't work raise error
             raise pybamm.SolverError(e.args[0])
+
+    def _get_integrator_stats(self, integrator):
+        """
+        Statistics of the last call to a CasADi integrator, with the same keys as
+        :attr:`pybamm.Solution.solver_stats`. Mapped integrators don't report any
+        statistics, and neither do symbolic calls, in which case this is empty.
+        """
+        try:
+            stats = integrator.stats()
+        except RuntimeError:
+            return {}
+        if "nsteps" not in stats:
+            return {}
+        return {
+            "number of RHS evaluations": stats["nfevals"],
+            "number of Jacobian evaluations": stats["n_call_jacF"],
+            "number of steps": stats["nsteps"],
+            "number of nonlinear solver failures": stats["nncfails"],
+            "number of error test failures": stats["netfails"],
+        }
+
+    def _get_evaluation_counts(self, model):
+        # The RHS and Jacobian are evaluated inside the CasADi integrator, and are
+        # counted from the integrator statistics instead
+        counts = super()._get_evaluation_counts(model)
+        counts["number of integrator creations"] = self._n_integrators_created
+        return counts
+
+    def _run_integrator_batch(self, model, y0s, inputs_dicts, inputs, t_eval, nthreads):
+        """
+        Integrate the model for several initial states and input sets at once, by
+        mapping the integrator (with grid t_eval) over them
+        """
+        integrator = self.create_integrator(model, inputs[0], t_eval)
+        ninputs = len(y0s)
+        mapped_integrator = integrator.map(ninputs, "thread", min(nthreads, ninputs))
+        len_rhs = model.concatenated_rhs.size
+        y0 = casadi.horzcat(*[casadi.DM(y0) for y0 in y0s])
+        try:
+            timer = pybamm.Timer()
+            casadi_sol = mapped_integrator(
+                x0=y0[:len_rhs, :],
+                z0=y0[len_rhs:, :],
+                p=casadi.horzcat(
+                    *[casadi.vertcat(inp, t_eval[0], t_eval[-1]) for inp in inputs]
+                ),
+                **self.extra_options_call
+            )
+            integration_time = timer.time()
+        except RuntimeError as e:
+            # If it doesn't work raise error
+            raise pybamm.SolverError(e.args[0])
+        # The outputs for each input set are stacked horizontally
+        y_sol = casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"])
+        n_t = len(t_eval)
+        solutions = []
+        for i, inputs_dict in enumerate(inputs_dicts):
+            sol = pybamm.Solution(
+                t_eval, y_sol[:, i * n_t : (i + 1) * n_t], model, inputs_dict
+            )
+            sol.integration_time = integration_time
+            solutions.append(sol)
+        return solutions
@@ -186,19 +186,44 @@ class IDAKLUSolver(pybamm.BaseSolver):
                     jac_eval = model.jacobian_eval(t, y, inputs) - cj * mass_matrix
                     return sparse.csr_matrix(jac_eval)
 
+        # The symbolic factorisation of KLU needs the same sparsity pattern at each
+        # evaluation. This is the union of the patterns of the Jacobian, computed in
+        # `set_up`, and of the mass matrix.
+        if model.jacobian_sparsity is not None:
+            pattern = sparse.csr_matrix(model.jacobian_sparsity, dtype=float) + abs(
+                sparse.csr_matrix(mass_matrix)
+            )
+            pattern.sort_indices()
+            pattern_keys = _csr_keys(pattern)
+        else:
+            pattern = None
+
         class SundialsJacobian:
             def __init__(self):
                 self.J = None
 
-                random = np.random.random(size=y0.size)
-                J = jacfn(10, random, 20)
-                self.nnz = J.nnz  # hoping nnz remains constant...
+                if pattern is not None:
+                    self.nnz = pattern.nnz
+                else:
+                    random = np.random.random(size=y0.size)
+                    J = jacfn(10, random, 20)
+                    self.nnz = J.nnz  # hoping nnz remains constant...
 
             def jac_res(self, t, y, cj):
                 # must be of form j_res = (dr/dy) - (cj) (dr/dy')
                 # cj is just the input parameter
                 # see p68 of the ida_guide.pdf for more details
-                self.J = jacfn(t, y, cj)
+                J = jacfn(t, y, cj)
+                if pattern is not None:
+                    # scatter the nonzero values onto the fixed pattern
+                    J = sparse.csr_matrix(J)
+                    J.sum_duplicates()
+                    data = np.zeros(pattern.nnz)
+                    data[np.searchsorted(pattern_keys, _csr_keys(J))] = J.data
+                    J = sparse.csr_matrix(
+                        (data, pattern.indices, pattern.indptr), shape=pattern.shape
+                    )
+                self.J = J
 
             def get_jac_data(self):
                 return self.J.data
@@ -218,12 +243,7 @@ class IDAKLUSolver(pybamm.BaseSolver):
         use_jac = 1
 
         def rootfn(t, y):
-            return_root = np.ones((num_of_events,))
-            return_root[:] = [
-                event(t, y, inputs) for event in model.terminate_events_eval
-            ]
-
-            return return_root
+            return model.terminate_events_eval(t, y, inputs)
 
         # get ids of rhs and algebraic variables
         rhs_ids = np.ones(model.rhs_eval(0, y0, inputs).shape)
@@ -278,3 +298,12 @@ class IDAKLUSolver(pybamm.BaseSolver):
             return sol
         else:
             raise pybamm.SolverError(sol.message)
+
+
+def _csr_keys(matrix):
+    """
+    Position of each nonzero value of a csr matrix with sorted indices in the
+    flattened matrix, which increases with the position of the value in `data`
+    """
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    return rows * matrix.shape[1] + matrix.indices
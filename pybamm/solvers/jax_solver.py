@@ -70,6 +70,7 @@ class JaxSolver(pybamm.BaseSolver):
         self.extra_options = extra_options or {}
         self.name = "JAX solver ({})".format(method)
         self._cached_solves = dict()
+        self._n_solves_created = 0
         pybamm.citations.register("jax2018")
 
     def get_solve(self, model, t_eval):
@@ -174,11 +175,17 @@ class JaxSolver(pybamm.BaseSolver):
             )
             return jnp.transpose(y)
 
+        self._n_solves_created += 1
         if self.method == "RK45":
             return jax.jit(solve_model_rk45)
         else:
             return jax.jit(solve_model_bdf)
 
+    def _get_evaluation_counts(self, model):
+        # The model functions are only called while JAX traces the solve, so count
+        # the number of solves that have been created instead
+        return {"number of integrator creations": self._n_solves_created}
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a model defined by dydt with initial conditions y0.
@@ -105,7 +105,7 @@ class ScikitsDaeSolver(pybamm.BaseSolver):
             return_residuals[:] = residuals(t, y, ydot, inputs)
 
         def rootfn(t, y, ydot, return_root):
-            return_root[:] = [event(t, y, inputs) for event in events]
+            return_root[:] = events(t, y, inputs)
 
         extra_options = {
             **self.extra_options,
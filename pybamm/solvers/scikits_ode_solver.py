@@ -69,6 +69,14 @@ class ScikitsOdeSolver(pybamm.BaseSolver):
         pybamm.citations.register("Hindmarsh2000")
         pybamm.citations.register("Hindmarsh2005")
 
+    # Statistics reported by the CVODE integrators of scikits.odes, with the keys of
+    # `pybamm.Solution.solver_stats`
+    _integrator_stats_keys = {
+        "number of steps": "NumSteps",
+        "number of linear solver setups": "NumLinSolvSetups",
+        "number of error test failures": "NumErrTestFails",
+    }
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a model defined by dydt with initial conditions y0.
@@ -100,7 +108,7 @@ class ScikitsOdeSolver(pybamm.BaseSolver):
             return_ydot[:] = derivs(t, y, inputs)
 
         def rootfn(t, y, return_root):
-            return_root[:] = [event(t, y, inputs) for event in events]
+            return_root[:] = events(t, y, inputs)
 
         if jacobian:
             jac_y0_t0 = jacobian(t_eval[0], y0, inputs)
@@ -155,6 +163,14 @@ class ScikitsOdeSolver(pybamm.BaseSolver):
         timer = pybamm.Timer()
         sol = ode_solver.solve(t_eval, y0)
         integration_time = timer.time()
+        # `get_info` is only available in recent versions of scikits.odes. The rhs
+        # evaluations are counted by `model.rhs_eval` instead
+        info = ode_solver.get_info() if hasattr(ode_solver, "get_info") else {}
+        stats = {
+            key: info[name]
+            for key, name in self._integrator_stats_keys.items()
+            if name in info
+        }
 
         # return solution, we need to tranpose y to match scipy's ivp interface
         if sol.flag in [0, 2]:
@@ -178,6 +194,7 @@ class ScikitsOdeSolver(pybamm.BaseSolver):
                 termination,
             )
             sol.integration_time = integration_time
+            sol.update_solver_stats(stats)
             return sol
         else:
             raise pybamm.SolverError(sol.message)
@@ -11,6 +11,10 @@ import numpy as np
 class ScipySolver(pybamm.BaseSolver):
     """Solve a discretised model, using scipy.integrate.solve_ivp.
 
+    The right-hand side, Jacobian and events are called many times per step, so for
+    models with small states it is often faster to compile them with numba, by setting
+    `model.convert_to_format = "numba"` before solving.
+
     Parameters
     ----------
     method : str, optional
@@ -36,6 +40,31 @@ class ScipySolver(pybamm.BaseSolver):
         self.name = "Scipy solver ({})".format(method)
         pybamm.citations.register("Virtanen2020")
 
+    def set_up(self, model, inputs=None, t_eval=None):
+        """See :meth:`pybamm.BaseSolver.set_up`.
+
+        If the model does not use its Jacobian, the BDF and Radau methods
+        approximate it by finite differences, so the sparsity pattern of the
+        Jacobian of the rhs is calculated for them here.
+        """
+        super().set_up(model, inputs=inputs, t_eval=t_eval)
+        if (
+            self.method in ["BDF", "Radau"]
+            and model.convert_to_format != "casadi"
+            and model.jacobian_eval is None
+            and model.jacobian_sparsity is None
+            and len(model.algebraic) == 0
+            and "jac_sparsity" not in self.extra_options
+        ):
+            try:
+                model.jacobian_sparsity = self._get_jac_and_sparsity(
+                    model, "RHS", model.concatenated_rhs
+                )[1]
+            except NotImplementedError:
+                # the sparsity is only an optimisation, so the Jacobian is
+                # approximated column by column instead
+                pass
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a model defined by dydt with initial conditions y0.
@@ -75,18 +104,43 @@ class ScipySolver(pybamm.BaseSolver):
                 extra_options.update(
                     {"jac": lambda t, y: model.jacobian_eval(t, y, inputs)}
                 )
+            elif (
+                self.method in ["BDF", "Radau"]
+                and model.jacobian_sparsity is not None
+                and "jac_sparsity" not in extra_options
+            ):
+                # the Jacobian is approximated by finite differences, with one
+                # evaluation of the rhs for each group of structurally independent
+                # columns rather than for each column
+                extra_options.update({"jac_sparsity": model.jacobian_sparsity})
 
         # make events terminal so that the solver stops when they are reached
         if model.terminate_events_eval:
-
-            def event_wrapper(event):
+            # scipy calls each event function separately, at the same t and y, so
+            # evaluate all the events once and re-use the values for the other events
+            last_event_eval = {"t": None, "y": None, "values": None}
+
+            def event_values(t, y):
+                if t != last_event_eval["t"] or not np.array_equal(
+                    y, last_event_eval["y"]
+                ):
+                    last_event_eval["t"] = t
+                    last_event_eval["y"] = y.copy()
+                    last_event_eval["values"] = model.terminate_events_eval(
+                        t, y, inputs
+                    )
+                return last_event_eval["values"]
+
+            def event_wrapper(i):
                 def event_fn(t, y):
-                    return event(t, y, inputs)
+                    return event_values(t, y)[i]
 
                 event_fn.terminal = True
                 return event_fn
 
-            events = [event_wrapper(event) for event in model.terminate_events_eval]
+            events = [
+                event_wrapper(i) for i in range(len(model.terminate_events_eval))
+            ]
             extra_options.update({"events": events})
 
         timer = pybamm.Timer()
@@ -102,6 +156,14 @@ class ScipySolver(pybamm.BaseSolver):
         integration_time = timer.time()
 
         if sol.success:
+            # The rhs evaluations are counted by `model.rhs_eval`, including those
+            # made to approximate the Jacobian, which scipy leaves out of `nfev`
+            stats = {"number of steps": len(sol.sol.ts) - 1}
+            if self.method in implicit_methods:
+                stats["number of LU decompositions"] = sol.nlu
+                if not model.jacobian_eval:
+                    # Jacobians approximated by finite differences
+                    stats["number of Jacobian evaluations"] = sol.njev
             # Set the reason for termination
             if sol.message == "A termination event occurred.":
                 termination = "event"
@@ -119,6 +181,7 @@ class ScipySolver(pybamm.BaseSolver):
                 sol.t, sol.y, model, inputs_dict, t_event, y_event, termination
             )
             sol.integration_time = integration_time
+            sol.update_solver_stats(stats)
             return sol
         else:
             raise pybamm.SolverError(sol.message)
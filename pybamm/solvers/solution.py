@@ -15,6 +15,26 @@ class Solution(object):
     Class containing the solution of, and various attributes associated with, a PyBaMM
     model.
 
+    The counters and timings reported by the solver are stored in the dict
+    `solver_stats`. All the solvers report the set-up time of each function of the
+    model, and the number of evaluations of these functions made by the solver
+    ("number of RHS evaluations", "number of Jacobian evaluations" and "number of
+    event evaluations"), except for :class:`pybamm.JaxSolver`, which only reports
+    the "number of integrator creations". In addition:
+
+    - :class:`pybamm.CasadiSolver` reports the "number of integrator creations",
+      the statistics of its integrators ("number of steps", "number of nonlinear
+      solver failures", "number of error test failures" and the RHS and Jacobian
+      evaluations they make), and the "number of global steps" in "safe" mode
+    - :class:`pybamm.ScipySolver` reports the "number of steps", and for the
+      implicit methods the "number of LU decompositions" (and the "number of
+      Jacobian evaluations" if the Jacobian is approximated by finite differences)
+    - :class:`pybamm.ScikitsOdeSolver` reports the "number of steps", "number of
+      linear solver setups" and "number of error test failures", with versions of
+      scikits.odes that provide them
+    - :class:`pybamm.ScikitsDaeSolver` and :class:`pybamm.IDAKLUSolver` only report
+      the evaluation counts, since their integrators don't provide statistics
+
     Parameters
     ----------
     all_ts : :class:`numpy.array`, size (n,) (or list of these)
@@ -94,6 +114,8 @@ class Solution(object):
         self.set_up_time = None
         self.solve_time = None
         self.integration_time = None
+        # Counters and timings reported by the solver, e.g. number of RHS evaluations
+        self.solver_stats = {}
 
         # initiaize empty variables and data
         self._variables = pybamm.FuzzyDict()
@@ -398,7 +420,9 @@ class Solution(object):
             and len(other.all_ts[0]) == 1
             and other.all_ts[0][0] == self.all_ts[-1][-1]
         ):
-            return self.copy()
+            new_sol = self.copy()
+            new_sol.update_solver_stats(other.solver_stats)
+            return new_sol
 
         # Update list of sub-solutions
         if other.all_ts[0][0] == self.all_ts[-1][-1]:
@@ -424,6 +448,8 @@ class Solution(object):
         # Set solution time
         new_sol.solve_time = self.solve_time + other.solve_time
         new_sol.integration_time = self.integration_time + other.integration_time
+        new_sol.solver_stats = self.solver_stats.copy()
+        new_sol.update_solver_stats(other.solver_stats)
 
         # Update termination using the latter solution
         new_sol._termination = other.termination
@@ -451,5 +477,20 @@ class Solution(object):
         new_sol.solve_time = self.solve_time
         new_sol.integration_time = self.integration_time
         new_sol.set_up_time = self.set_up_time
+        new_sol.solver_stats = self.solver_stats.copy()
 
         return new_sol
+
+    def update_solver_stats(self, stats):
+        """
+        Add solver statistics (counters and timings) to the statistics of this
+        solution. Statistics that are already present are summed.
+
+        Parameters
+        ----------
+        stats : dict
+            Dictionary of solver statistics, e.g. as reported by the solver for a
+            single call to `_integrate`
+        """
+        for key, value in stats.items():
+            self.solver_stats[key] = self.solver_stats.get(key, 0) + value
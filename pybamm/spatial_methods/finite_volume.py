@@ -582,11 +582,10 @@ class FiniteVolume(pybamm.SpatialMethod):
             csr_matrix(kron(eye(second_dim_repeats), right_sub_matrix))
         )
 
-        # Remove domains to avoid clash
-        left_domain = left_symbol_disc.domain
-        right_domain = right_symbol_disc.domain
-        left_auxiliary_domains = left_symbol_disc.auxiliary_domains
-        right_auxiliary_domains = right_symbol_disc.auxiliary_domains
+        # Remove domains to avoid clash, on copies since the discretised symbols can
+        # be shared with other expression trees
+        left_symbol_disc = left_symbol_disc.new_copy()
+        right_symbol_disc = right_symbol_disc.new_copy()
         left_symbol_disc.clear_domains()
         right_symbol_disc.clear_domains()
 
@@ -594,12 +593,6 @@ class FiniteVolume(pybamm.SpatialMethod):
         dy = right_matrix @ right_symbol_disc - left_matrix @ left_symbol_disc
         dx = right_mesh.nodes[0] - left_mesh.nodes[-1]
 
-        # Change domains back
-        left_symbol_disc.domain = left_domain
-        right_symbol_disc.domain = right_domain
-        left_symbol_disc.auxiliary_domains = left_auxiliary_domains
-        right_symbol_disc.auxiliary_domains = right_auxiliary_domains
-
         return dy / dx
 
     def add_ghost_nodes(self, symbol, discretised_symbol, bcs):
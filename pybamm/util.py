@@ -14,6 +14,7 @@ import pickle
 import pybamm
 import numbers
 from collections import defaultdict
+from collections.abc import ItemsView, ValuesView
 
 
 def root_dir():
@@ -124,6 +125,103 @@ class FuzzyDict(dict):
             print("\n".join("{}".format(k) for k in results.keys()))
 
 
+class LazyFuzzyDict(FuzzyDict):
+    """
+    A :class:`FuzzyDict` whose values are processed the first time they are accessed,
+    so that only the values that are actually used are processed (e.g. the variables
+    of a discretised model).
+
+    Parameters
+    ----------
+    unprocessed : dict
+        The values to process
+    process : callable
+        The function used to process each value
+    """
+
+    def __init__(self, unprocessed, process):
+        super().__init__(unprocessed)
+        self.process = process
+        self._unprocessed_keys = set(self.keys())
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key in self._unprocessed_keys:
+            value = self.process(value)
+            dict.__setitem__(self, key, value)
+            self._unprocessed_keys.discard(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._unprocessed_keys.discard(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._unprocessed_keys.discard(key)
+
+    def __iter__(self):
+        # Overriding __iter__ stops dict(...) and {**...} from copying the
+        # unprocessed values directly
+        return super().__iter__()
+
+    def __reduce__(self):
+        # Pickle and deepcopy as a FuzzyDict of processed values, so that the
+        # function used to process the values is not needed
+        return (FuzzyDict, (dict(self.items()),))
+
+    def is_processed(self, key):
+        """Whether the value of `key` has been processed"""
+        return key in self and key not in self._unprocessed_keys
+
+    def raw_values(self):
+        """The values, without processing the values that have not been processed"""
+        return dict.values(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        if key in self or not default:
+            value = self[key]
+            del self[key]
+            return value
+        return default[0]
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def popitem(self):
+        key = next(reversed(self.keys()))
+        return key, self.pop(key)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def copy(self):
+        new_dict = LazyFuzzyDict({}, self.process)
+        dict.update(new_dict, dict.items(self))
+        new_dict._unprocessed_keys = set(self._unprocessed_keys)
+        return new_dict
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+
 class Timer(object):
     """
     Provides accurate timing.
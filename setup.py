@@ -209,6 +209,7 @@ setup(
     ],
     extras_require={
         "docs": ["sphinx>=1.5", "guzzle-sphinx-theme"],  # For doc generation
+        "numba": ["numba"],  # For models in "numba" format
         "dev": [
             "flake8>=3",  # For code style checking
             "black",  # For code style auto-formatting
@@ -737,8 +737,10 @@ class TestDiscretise(unittest.TestCase):
         # turn debug mode off to not check well posedness
         debug_mode = pybamm.settings.debug_mode
         pybamm.settings.debug_mode = False
+        disc.process_model(model)
+        # the variables are discretised when they are first accessed
         with self.assertRaisesRegex(pybamm.ModelError, "No key set for variable"):
-            disc.process_model(model)
+            model.variables["d"]
         pybamm.settings.debug_mode = debug_mode
 
     def test_process_model_dae(self):
@@ -912,6 +914,59 @@ class TestDiscretise(unittest.TestCase):
         )
         discretised_model.check_well_posedness()
 
+    def test_process_variables_lazily(self):
+        c = pybamm.Variable("c", domain=["negative electrode"])
+        N = pybamm.grad(c)
+        a = pybamm.InputParameter("a", domain=["negative electrode"])
+        model = pybamm.BaseModel()
+        model.rhs = {c: pybamm.div(N)}
+        model.initial_conditions = {c: pybamm.Scalar(3)}
+        model.boundary_conditions = {
+            c: {"left": (0, "Neumann"), "right": (0, "Neumann")}
+        }
+        model.variables = {"c": c, "N": N, "a times c": a * c}
+
+        disc = get_discretisation_for_testing()
+        discretised_model = disc.process_model(model, inplace=False)
+        variables = discretised_model.variables
+        self.assertIsInstance(variables, pybamm.LazyFuzzyDict)
+        # only the variables of the rhs are discretised, by the model checks
+        self.assertTrue(variables.is_processed("c"))
+        self.assertFalse(variables.is_processed("N"))
+        self.assertFalse(variables.is_processed("a times c"))
+
+        # the input parameters are found without discretising the variables
+        (input_parameter,) = discretised_model.input_parameters
+        self.assertEqual(input_parameter._expected_size, variables["c"].size)
+        self.assertFalse(variables.is_processed("a times c"))
+
+        # reusing the discretisation doesn't affect the variables
+        d = pybamm.Variable("d", domain=["negative electrode"])
+        new_model = pybamm.BaseModel()
+        new_model.rhs = {d: pybamm.div(pybamm.grad(d)), c: pybamm.div(N)}
+        new_model.initial_conditions = {d: 1, c: 3}
+        new_model.boundary_conditions = {
+            d: {"left": (0, "Neumann"), "right": (0, "Neumann")},
+            c: {"left": (0, "Neumann"), "right": (0, "Neumann")},
+        }
+        disc.process_model(new_model)
+
+        # the variables are discretised when they are accessed
+        y0 = discretised_model.concatenated_initial_conditions.evaluate()
+        np.testing.assert_array_equal(
+            variables["N"].evaluate(None, y0),
+            discretised_model.concatenated_rhs.evaluate(None, y0),
+        )
+        self.assertTrue(variables.is_processed("N"))
+        self.assertEqual(
+            dict(variables.items()),
+            {
+                "c": variables["c"],
+                "N": variables["N"],
+                "a times c": variables["a times c"],
+            },
+        )
+
     def test_initial_condition_bounds(self):
         # concatenation of variables as the key
         c = pybamm.Variable("c", bounds=(0, 1))
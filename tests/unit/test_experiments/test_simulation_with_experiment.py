@@ -80,9 +80,16 @@ class TestSimulationExperiment(unittest.TestCase):
         )
         model = pybamm.lithium_ion.SPM()
         sim = pybamm.Simulation(model, experiment=experiment)
-        sim.solve(solver=pybamm.CasadiSolver())
+        sol = sim.solve(solver=pybamm.CasadiSolver())
         self.assertEqual(sim._solution.termination, "final time")
 
+        # Solver statistics are reported for each step
+        steps = [step for cycle in sol.cycles for step in cycle.steps]
+        self.assertEqual(
+            sum(step.solver_stats["number of steps"] for step in steps),
+            sol.solver_stats["number of steps"],
+        )
+
     def test_run_experiment_breaks_early(self):
         experiment = pybamm.Experiment(["Discharge at 2 C for 1 hour"])
         model = pybamm.lithium_ion.SPM()
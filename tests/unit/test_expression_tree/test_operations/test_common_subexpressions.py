@@ -0,0 +1,148 @@
+#
+# Tests for the common subexpression elimination
+#
+import pybamm
+
+import casadi
+import numpy as np
+import unittest
+from scipy.sparse import csr_matrix
+
+
+class TestCommonSubexpressionEliminator(unittest.TestCase):
+    def test_commutative_operators(self):
+        a = pybamm.StateVector(slice(0, 1))
+        b = pybamm.StateVector(slice(1, 2))
+        for operator in [
+            pybamm.Addition,
+            pybamm.Multiplication,
+            pybamm.Minimum,
+            pybamm.Maximum,
+        ]:
+            eliminator = pybamm.CommonSubexpressionEliminator()
+            ab = eliminator.process_symbol(operator(a, b))
+            ba = eliminator.process_symbol(operator(b, a))
+            self.assertEqual(ab.id, ba.id)
+
+        # non-commutative operators are not reordered
+        eliminator = pybamm.CommonSubexpressionEliminator()
+        self.assertNotEqual(
+            eliminator.process_symbol(a - b).id, eliminator.process_symbol(b - a).id
+        )
+
+    def test_eliminate(self):
+        a = pybamm.StateVector(slice(0, 1))
+        b = pybamm.StateVector(slice(1, 2))
+        expr = pybamm.exp(pybamm.Multiplication(a, b)) + pybamm.sin(
+            pybamm.Multiplication(b, a)
+        ) * pybamm.Addition(pybamm.Multiplication(a, b), a)
+        eliminator = pybamm.CommonSubexpressionEliminator()
+        new_expr = eliminator.eliminate(expr)
+        # the nodes are only counted if debug logging is enabled
+        self.assertEqual(eliminator.nodes_before, 0)
+        self.assertEqual(eliminator.nodes_after, 0)
+
+        pybamm.set_logging_level("DEBUG")
+        try:
+            self.assertIs(eliminator.eliminate(expr), new_expr)
+        finally:
+            pybamm.set_logging_level("WARNING")
+
+        # a, b, a*b, b*a, exp, sin, (a*b)+a, sin*(...), exp+(...)
+        self.assertEqual(pybamm.count_distinct_nodes(expr), 9)
+        self.assertEqual(pybamm.count_distinct_nodes(new_expr), 8)
+        self.assertEqual(eliminator.nodes_before, 9)
+        self.assertEqual(eliminator.nodes_after, 8)
+        self.assertEqual(eliminator.nodes_removed, 1)
+
+        y = np.array([[0.3], [1.7]])
+        np.testing.assert_array_equal(expr.evaluate(y=y), new_expr.evaluate(y=y))
+
+        # nodes that are already in canonical form are not copied
+        self.assertIs(eliminator.eliminate(new_expr), new_expr)
+
+    def test_sparse_matrices(self):
+        y = pybamm.StateVector(slice(0, 2))
+        A = pybamm.Matrix(csr_matrix(np.array([[1, 2], [0, 3]])))
+        B = pybamm.Matrix(csr_matrix(np.array([[0, 1], [4, 0]])))
+        expr = pybamm.Multiplication(pybamm.Addition(A, B), y) + pybamm.Multiplication(
+            y, pybamm.Addition(B, A)
+        )
+        new_expr = pybamm.CommonSubexpressionEliminator().eliminate(expr)
+        self.assertEqual(
+            pybamm.count_distinct_nodes(new_expr),
+            pybamm.count_distinct_nodes(expr) - 2,
+        )
+        y0 = np.array([[2.0], [5.0]])
+        np.testing.assert_array_equal(
+            expr.evaluate(y=y0).toarray(), new_expr.evaluate(y=y0).toarray()
+        )
+
+    def test_numpy_matrices(self):
+        # the sum of a sparse and a dense matrix is a numpy matrix, whose products
+        # are matrix products, so the operands of its products are not swapped
+        A = pybamm.Matrix(csr_matrix(np.array([[1.0, 2], [0, 3]])))
+        B = pybamm.Matrix(np.array([[0.0, 1], [4, 0]]))
+        C = pybamm.Matrix(np.array([[1.0, 5], [2, 1]]))
+        self.assertIsInstance((A + B).evaluate(), np.matrix)
+        for expr in [
+            pybamm.Multiplication(A + B, C),
+            pybamm.Multiplication(C, A + B),
+        ]:
+            new_expr = pybamm.CommonSubexpressionEliminator().eliminate(expr)
+            self.assertEqual(new_expr.children[0].id, expr.children[0].id)
+            np.testing.assert_array_equal(new_expr.evaluate(), expr.evaluate())
+
+        # products of columns are commutative, and are reordered without
+        # evaluating the operands
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        eliminator = pybamm.CommonSubexpressionEliminator()
+        ab = eliminator.process_symbol(pybamm.Multiplication(a * 2, b))
+        ba = eliminator.process_symbol(pybamm.Multiplication(b, a * 2))
+        self.assertEqual(ab.id, ba.id)
+
+    def test_evaluators(self):
+        a = pybamm.StateVector(slice(0, 1))
+        b = pybamm.StateVector(slice(1, 2))
+        expr = pybamm.Multiplication(a, b) * pybamm.Multiplication(b, a)
+        y = np.array([[2.0], [3.0]])
+        evaluator = pybamm.EvaluatorPython(expr)
+        self.assertEqual(evaluator.evaluate(y=y), 36)
+        # a, b, a*b, b*a and the product are calculated
+        self.assertEqual(evaluator._python_str.count("\n   var_"), 5)
+
+        evaluator = pybamm.EvaluatorPython(expr, eliminate_common_subexpressions=True)
+        self.assertEqual(evaluator.evaluate(y=y), 36)
+        # a, b, a*b and the product are calculated
+        self.assertEqual(evaluator._python_str.count("\n   var_"), 4)
+
+        casadi_y = casadi.MX.sym("y", 2)
+        casadi_expr = pybamm.CommonSubexpressionEliminator().eliminate(expr)
+        casadi_expr = casadi_expr.to_casadi(y=casadi_y)
+        f = casadi.Function("f", [casadi_y], [casadi_expr])
+        self.assertEqual(f(y).full(), 36)
+
+    def test_errors(self):
+        expr = pybamm.Symbol("a", children=[pybamm.Symbol("b")])
+        eliminator = pybamm.CommonSubexpressionEliminator()
+        # unchanged nodes are returned as they are
+        self.assertIs(eliminator.process_symbol(expr), expr)
+
+        a = pybamm.StateVector(slice(0, 1))
+        b = pybamm.StateVector(slice(1, 2))
+        expr = pybamm.Symbol(
+            "a", children=[pybamm.Multiplication(a, b), pybamm.Multiplication(b, a)]
+        )
+        with self.assertRaisesRegex(NotImplementedError, "Cannot eliminate"):
+            eliminator.process_symbol(expr)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
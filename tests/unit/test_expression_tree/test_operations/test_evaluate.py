@@ -7,7 +7,9 @@ from tests import get_discretisation_for_testing, get_1p1d_discretisation_for_te
 import unittest
 import numpy as np
 import scipy.sparse
+import pickle
 from collections import OrderedDict
+from pybamm.expression_tree.operations import evaluate
 from platform import system
 
 
@@ -328,7 +330,7 @@ class TestEvaluate(unittest.TestCase):
         self.assertEqual(result, 6)
 
         # test a larger expression
-        expr = a * b + b + a ** 2 / b + 2 * a + b / 2 + 4
+        expr = a * b + b + a**2 / b + 2 * a + b / 2 + 4
         evaluator = pybamm.EvaluatorPython(expr)
         for y in y_tests:
             result = evaluator.evaluate(t=None, y=y)
@@ -453,6 +455,116 @@ class TestEvaluate(unittest.TestCase):
             result = evaluator.evaluate(t=t, y=y)
             np.testing.assert_allclose(result, expr.evaluate(t=t, y=y))
 
+    def test_evaluator_python_preallocate(self):
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        A = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[1.0, 0], [2, 4]])))
+        B = pybamm.Matrix(np.array([[1.0, 3], [0, 2]]))
+        t = pybamm.t
+        y_tests = [np.array([[2.0], [3], [4], [5]]), np.array([1.0, 3, 2, 1])]
+
+        exprs = [
+            a * b + t,
+            pybamm.minimum(a, b) - pybamm.maximum(2 * a, b) / b,
+            -abs(a) ** 2,
+            pybamm.exp(A @ a) + B @ b,
+            pybamm.sin(a) * pybamm.Function(test_function, b),
+            pybamm.NumpyConcatenation(a * b, 2 * a, b),
+            pybamm.Index(a * b, 1),
+        ]
+        for expr in exprs:
+            evaluator = pybamm.EvaluatorPython(expr, preallocate=True)
+            for y in y_tests:
+                result = evaluator.evaluate(t=2, y=y)
+                np.testing.assert_allclose(result, expr.evaluate(t=2, y=y))
+
+        # the dense vectors are calculated in place
+        evaluator = pybamm.EvaluatorPython(exprs[3], preallocate=True)
+        self.assertIn("out=buf_", evaluator._python_str)
+        self.assertIn("matvec_into(", evaluator._python_str)
+
+        # the public API of scipy is used if its sparse kernel can't be imported
+        csr_matvec = evaluate.csr_matvec
+        try:
+            evaluate.csr_matvec = None
+            for y in y_tests:
+                np.testing.assert_allclose(
+                    evaluator.evaluate(t=2, y=y), exprs[3].evaluate(t=2, y=y)
+                )
+        finally:
+            evaluate.csr_matvec = csr_matvec
+
+        # the result can be kept, as the preallocated arrays are overwritten
+        expr = a * b
+        evaluator = pybamm.EvaluatorPython(expr, preallocate=True)
+        first = evaluator.evaluate(y=y_tests[0])
+        evaluator.evaluate(y=y_tests[1])
+        np.testing.assert_array_equal(first, expr.evaluate(y=y_tests[0]))
+
+        # other shapes of y, t and the inputs are calculated in new arrays, e.g. y
+        # with several columns, as for the solution at several times
+        y = np.array([[2.0, 1], [3, 10], [4, 2], [5, 1]])
+        t = np.array([[1.0, 2]])
+        p = pybamm.InputParameter("p")
+        q = pybamm.InputParameter("q", domain="test")
+        q._expected_size = 2
+        inputs = {"p": np.array([[1.0, 2]]), "q": np.array([[1.0], [2]])}
+        for expr in exprs + [A @ a, B @ b, A @ a + pybamm.t * b, p * a + q]:
+            evaluator = pybamm.EvaluatorPython(expr, preallocate=True)
+            np.testing.assert_array_equal(
+                evaluator.evaluate(t=2, y=y, inputs=inputs),
+                expr.evaluate(t=2, y=y, inputs=inputs),
+            )
+            np.testing.assert_array_equal(
+                evaluator.evaluate(t=t, y=y, inputs=inputs),
+                expr.evaluate(t=t, y=y, inputs=inputs),
+            )
+        evaluator = pybamm.EvaluatorPython(A @ a, preallocate=True)
+        np.testing.assert_array_equal(
+            evaluator.evaluate(y=y), np.array([[2.0, 1], [16, 42]])
+        )
+        evaluator = pybamm.EvaluatorPython(p * a + q, preallocate=True)
+        for inputs in [
+            {"p": 2, "q": np.array([[1.0], [2]])},
+            {"p": np.array([[1.0, 2]]), "q": np.array([[1.0], [2]])},
+            {"p": 2, "q": np.array([[1.0, 3], [2, 4]])},
+        ]:
+            np.testing.assert_array_equal(
+                evaluator.evaluate(y=y_tests[0], inputs=inputs),
+                (p * a + q).evaluate(y=y_tests[0], inputs=inputs),
+            )
+
+        # sparse results are not preallocated
+        expr = a * A
+        evaluator = pybamm.EvaluatorPython(expr, preallocate=True)
+        for y in y_tests:
+            np.testing.assert_array_equal(
+                evaluator.evaluate(y=y).toarray(), expr.evaluate(y=y).toarray()
+            )
+
+        # pickled evaluators are compiled again
+        evaluator = pybamm.EvaluatorPython(exprs[0], preallocate=True)
+        evaluator = pickle.loads(pickle.dumps(evaluator))
+        y = y_tests[0]
+        np.testing.assert_array_equal(
+            evaluator.evaluate(t=1, y=y), exprs[0].evaluate(t=1, y=y)
+        )
+
+    def test_evaluator_python_preallocate_domain_concatenation(self):
+        disc = get_1p1d_discretisation_for_testing()
+        a = pybamm.Variable("a", domain=["negative electrode"])
+        b = pybamm.Variable("b", domain=["separator"])
+        c = pybamm.Variable("c", domain=["positive electrode"])
+        conc = pybamm.Concatenation(2 * a, 3 * b, c)
+        disc.set_variable_slices([a, b, c])
+        expr = disc.process_symbol(conc)
+        self.assertIsInstance(expr, pybamm.DomainConcatenation)
+
+        evaluator = pybamm.EvaluatorPython(expr, preallocate=True)
+        self.assertIn("scatter_into(", evaluator._python_str)
+        y = np.arange(expr._size, dtype=float).reshape(-1, 1)
+        np.testing.assert_array_equal(evaluator.evaluate(y=y), expr.evaluate(y=y))
+
     @unittest.skipIf(system() == "Windows", "JAX not supported on windows")
     def test_find_symbols_jax(self):
         # test sparse conversion
@@ -505,7 +617,7 @@ class TestEvaluate(unittest.TestCase):
         self.assertEqual(result, 6)
 
         # test a larger expression
-        expr = a * b + b + a ** 2 / b + 2 * a + b / 2 + 4
+        expr = a * b + b + a**2 / b + 2 * a + b / 2 + 4
         evaluator = pybamm.EvaluatorJax(expr)
         for y in y_tests:
             result = evaluator.evaluate(t=None, y=y)
@@ -633,7 +745,7 @@ class TestEvaluate(unittest.TestCase):
         a = pybamm.StateVector(slice(0, 1))
         y_tests = [np.array([[2.0]]), np.array([[1.0]]), np.array([1.0])]
 
-        expr = a ** 2
+        expr = a**2
         expr_jac = 2 * a
         evaluator = pybamm.EvaluatorJax(expr)
         evaluator_jac_test = evaluator.get_jacobian()
@@ -646,7 +758,7 @@ class TestEvaluate(unittest.TestCase):
     @unittest.skipIf(system() == "Windows", "JAX not supported on windows")
     def test_evaluator_jax_debug(self):
         a = pybamm.StateVector(slice(0, 1))
-        expr = a ** 2
+        expr = a**2
         y_test = np.array([[2.0], [3.0]])
         evaluator = pybamm.EvaluatorJax(expr)
         evaluator.debug(y=y_test)
@@ -654,7 +766,7 @@ class TestEvaluate(unittest.TestCase):
     @unittest.skipIf(system() == "Windows", "JAX not supported on windows")
     def test_evaluator_jax_inputs(self):
         a = pybamm.InputParameter("a")
-        expr = a ** 2
+        expr = a**2
         evaluator = pybamm.EvaluatorJax(expr)
         result = evaluator.evaluate(inputs={"a": 2})
         self.assertEqual(result, 4)
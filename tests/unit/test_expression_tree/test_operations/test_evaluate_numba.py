@@ -0,0 +1,187 @@
+#
+# Tests for the numba evaluator
+#
+import pybamm
+
+from tests import get_mesh_for_testing, get_1p1d_discretisation_for_testing
+import unittest
+import numpy as np
+import scipy.sparse
+import pickle
+import tempfile
+import os
+
+
+@unittest.skipIf(not pybamm.have_numba(), "numba is not installed")
+class TestEvaluateNumba(unittest.TestCase):
+    def test_evaluator_numba(self):
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        A = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[1.0, 0], [2, 4]])))
+        B = pybamm.Matrix(np.array([[1.0, 3], [0, 2]]))
+        t = pybamm.t
+        y_tests = [np.array([[2.0], [3], [4], [5]]), np.array([1.0, 3, 2, 1])]
+
+        exprs = [
+            pybamm.Scalar(2),
+            a * b + t,
+            pybamm.minimum(a, b) - pybamm.maximum(2 * a, b) / b,
+            -abs(a) ** 2,
+            pybamm.exp(A @ a) + B @ b,
+            pybamm.sin(a) * pybamm.sign(b),
+            pybamm.NumpyConcatenation(a * b, 2 * a, b),
+            pybamm.Index(a * b, 1),
+            pybamm.min(a * b),
+            a / (b - b),
+        ]
+        for expr in exprs:
+            evaluator = pybamm.EvaluatorNumba(expr)
+            for y in y_tests:
+                result = evaluator.evaluate(t=2, y=y)
+                np.testing.assert_allclose(result, expr.evaluate(t=2, y=y))
+
+        # several values of y at once
+        y = np.array([[2.0, 1], [3, 3], [4, 2], [5, 1]])
+        evaluator = pybamm.EvaluatorNumba(exprs[1])
+        np.testing.assert_allclose(
+            evaluator.evaluate(t=2, y=y), exprs[1].evaluate(2, y)
+        )
+
+        # known_evals
+        result, known_evals = evaluator.evaluate(t=2, y=y_tests[0], known_evals={})
+        np.testing.assert_allclose(result, exprs[1].evaluate(t=2, y=y_tests[0]))
+        self.assertEqual(known_evals, {})
+
+    def test_evaluator_numba_sparse(self):
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        A = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[1.0, 0], [2, 4]])))
+        B = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[0.0, 3], [0, 2]])))
+        y = np.array([1.0, 3, 2, 1])
+
+        exprs = [
+            a * A,
+            -(A / b),
+            A + B,
+            A - a * B,
+            A @ B,
+            pybamm.SparseStack(A, B),
+        ]
+        for expr in exprs:
+            evaluator = pybamm.EvaluatorNumba(expr)
+            result = evaluator.evaluate(y=y)
+            self.assertIsInstance(result, scipy.sparse.csr_matrix)
+            np.testing.assert_allclose(result.toarray(), expr.evaluate(y=y).toarray())
+
+    def test_evaluator_numba_jacobian(self):
+        disc = get_1p1d_discretisation_for_testing()
+        a = pybamm.Variable("a", domain=["negative electrode"])
+        b = pybamm.Variable("b", domain=["separator"])
+        c = pybamm.Variable("c", domain=["positive electrode"])
+        var = pybamm.Concatenation(a, b, c)
+        disc.set_variable_slices([var])
+        expr = disc.process_symbol(
+            pybamm.Concatenation(a ** 2, pybamm.exp(b) * 3, 2 * c - c ** 3)
+        )
+        y = pybamm.StateVector(slice(0, expr.size))
+        jac = expr.jac(y)
+        y_test = np.linspace(0, 1, expr.size)
+
+        evaluator = pybamm.EvaluatorNumba(expr)
+        np.testing.assert_allclose(
+            evaluator.evaluate(y=y_test), expr.evaluate(y=y_test[:, np.newaxis])
+        )
+        evaluator = pybamm.EvaluatorNumba(jac)
+        np.testing.assert_allclose(
+            evaluator.evaluate(y=y_test).toarray(),
+            jac.evaluate(y=y_test[:, np.newaxis]).toarray(),
+        )
+
+    def test_evaluator_numba_inputs(self):
+        a = pybamm.StateVector(slice(0, 2))
+        p = pybamm.InputParameter("p")
+        q = pybamm.InputParameter("q")
+        q.set_expected_size(2)
+        expr = p * a + q
+        evaluator = pybamm.EvaluatorNumba(expr)
+        inputs = {"p": 2, "q": np.array([1.0, 2])}
+        y = np.array([3.0, 4])
+        np.testing.assert_allclose(
+            evaluator.evaluate(y=y, inputs=inputs),
+            expr.evaluate(y=y[:, np.newaxis], inputs=inputs),
+        )
+        with self.assertRaisesRegex(KeyError, "Input parameter 'q' not found"):
+            evaluator.evaluate(y=y, inputs={"p": 2})
+
+    def test_evaluator_numba_errors(self):
+        a = pybamm.StateVector(slice(0, 2))
+        interp = pybamm.Interpolant(np.linspace(0, 1, 3), np.linspace(0, 1, 3), a)
+        with self.assertRaisesRegex(NotImplementedError, "Cannot compile function"):
+            pybamm.EvaluatorNumba(interp)
+
+    def test_evaluator_numba_pickle(self):
+        a = pybamm.StateVector(slice(0, 2))
+        expr = 2 * a + pybamm.t
+        y = np.array([1.0, 2])
+        evaluator = pickle.loads(pickle.dumps(pybamm.EvaluatorNumba(expr)))
+        np.testing.assert_allclose(
+            evaluator.evaluate(t=1, y=y), expr.evaluate(t=1, y=y[:, np.newaxis])
+        )
+
+    def test_evaluator_numba_cache(self):
+        a = pybamm.StateVector(slice(0, 2))
+        A = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[1.0, 0], [2, 4]])))
+        expr = pybamm.exp(A @ a)
+        y = np.array([1.0, 2])
+        with tempfile.TemporaryDirectory() as cache_dir:
+            evaluator = pybamm.EvaluatorNumba(expr, cache_dir=cache_dir)
+            np.testing.assert_allclose(
+                evaluator.evaluate(y=y), expr.evaluate(y=y[:, np.newaxis])
+            )
+            # the generated module and its constants are stored in the cache
+            files = os.listdir(cache_dir)
+            self.assertEqual(len([f for f in files if f.endswith(".py")]), 1)
+            self.assertEqual(len([f for f in files if f.endswith(".npz")]), 1)
+
+            # the same code is loaded from the same module
+            pybamm.set_numba_cache(cache_dir)
+            try:
+                evaluator = pybamm.EvaluatorNumba(expr)
+            finally:
+                pybamm.set_numba_cache(None)
+            np.testing.assert_allclose(
+                evaluator.evaluate(y=y), expr.evaluate(y=y[:, np.newaxis])
+            )
+            self.assertEqual(len(os.listdir(cache_dir)), len(files))
+
+    def test_solver_numba(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "numba"
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var=0.5", pybamm.min(var - 0.5))]
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 10, 100)
+        solution = solver.solve(model, t_eval, inputs={"rate": 0.1})
+        self.assertIsInstance(model.rhs_eval._function.__self__, pybamm.EvaluatorNumba)
+        self.assertEqual(solution.termination, "event: var=0.5")
+        np.testing.assert_allclose(
+            solution.y[0], np.exp(-0.1 * solution.t), rtol=1e-6, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
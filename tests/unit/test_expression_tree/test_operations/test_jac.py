@@ -70,19 +70,19 @@ class TestJacobian(unittest.TestCase):
 
         y0 = np.array([1, 2, 3, 4])
 
-        func = v ** 2
+        func = v**2
         jacobian = np.array([[0, 0, 6, 0], [0, 0, 0, 8]])
         dfunc_dy = func.jac(y).evaluate(y=y0)
         np.testing.assert_array_equal(jacobian, dfunc_dy.toarray())
 
-        func = 2 ** v
+        func = 2**v
         jacobian = np.array(
-            [[0, 0, 2 ** 3 * np.log(2), 0], [0, 0, 0, 2 ** 4 * np.log(2)]]
+            [[0, 0, 2**3 * np.log(2), 0], [0, 0, 0, 2**4 * np.log(2)]]
         )
         dfunc_dy = func.jac(y).evaluate(y=y0)
         np.testing.assert_array_equal(jacobian, dfunc_dy.toarray())
 
-        func = v ** v
+        func = v**v
         jacobian = [[0, 0, 27 * (1 + np.log(3)), 0], [0, 0, 0, 256 * (1 + np.log(4))]]
         dfunc_dy = func.jac(y).evaluate(y=y0)
         np.testing.assert_array_almost_equal(jacobian, dfunc_dy.toarray())
@@ -256,7 +256,7 @@ class TestJacobian(unittest.TestCase):
         divide = a / b
         self.assertEqual(divide.jac(y).evaluate(), 0)
 
-        power = a ** b
+        power = a**b
         self.assertEqual(power.jac(y).evaluate(), 0)
 
     def test_jac_of_symbol(self):
@@ -299,11 +299,11 @@ class TestJacobian(unittest.TestCase):
         a = pybamm.Scalar(1)
         y = pybamm.StateVector(slice(0, 5))
         np.testing.assert_array_equal(
-            ((a < y) * y ** 2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
+            ((a < y) * y**2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
             10 * np.eye(5),
         )
         np.testing.assert_array_equal(
-            ((a < y) * y ** 2).jac(y).evaluate(y=-5 * np.ones(5)).toarray(), 0
+            ((a < y) * y**2).jac(y).evaluate(y=-5 * np.ones(5)).toarray(), 0
         )
 
     def test_jac_of_modulo(self):
@@ -313,15 +313,15 @@ class TestJacobian(unittest.TestCase):
             (a % (3 * a)).jac(y).evaluate(y=5 * np.ones(5)), 0
         )
         np.testing.assert_array_equal(
-            ((y % a) * y ** 2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
+            ((y % a) * y**2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
             45 * np.eye(5),
         )
         np.testing.assert_array_equal(
-            ((a % y) * y ** 2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
+            ((a % y) * y**2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
             30 * np.eye(5),
         )
         np.testing.assert_array_equal(
-            (((y + 1) ** 2 % y) * y ** 2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
+            (((y + 1) ** 2 % y) * y**2).jac(y).evaluate(y=5 * np.ones(5)).toarray(),
             135 * np.eye(5),
         )
 
@@ -329,11 +329,11 @@ class TestJacobian(unittest.TestCase):
         y = pybamm.StateVector(slice(0, 10))
         y_test = np.linspace(0, 2, 10)
         np.testing.assert_array_equal(
-            np.diag(pybamm.minimum(1, y ** 2).jac(y).evaluate(y=y_test).toarray()),
+            np.diag(pybamm.minimum(1, y**2).jac(y).evaluate(y=y_test).toarray()),
             2 * y_test * (y_test < 1),
         )
         np.testing.assert_array_equal(
-            np.diag(pybamm.maximum(1, y ** 2).jac(y).evaluate(y=y_test).toarray()),
+            np.diag(pybamm.maximum(1, y**2).jac(y).evaluate(y=y_test).toarray()),
             2 * y_test * (y_test > 1),
         )
 
@@ -438,6 +438,44 @@ class TestJacobian(unittest.TestCase):
         ):
             conc.jac(y)
 
+    def test_jac_and_sparsity(self):
+        y = pybamm.StateVector(slice(0, 4))
+        u = pybamm.StateVector(slice(0, 2))
+        v = pybamm.StateVector(slice(2, 4))
+        A = pybamm.Matrix(np.array([[1.0, 0], [2, 0]]))
+
+        # the entries that are zero for some values of t and y (e.g. in the minimum)
+        # are in the pattern
+        func = pybamm.NumpyConcatenation(
+            A @ (u * v) + pybamm.minimum(u, 2 * v), pybamm.t * u
+        )
+        jacobian = pybamm.Jacobian()
+        jac, sparsity = jacobian.jac_and_sparsity(func, y)
+        np.testing.assert_array_equal(
+            sparsity.toarray(),
+            np.array(
+                [
+                    [1, 0, 1, 0],
+                    [1, 1, 1, 1],
+                    [1, 0, 0, 0],
+                    [0, 1, 0, 0],
+                ],
+                dtype=bool,
+            ),
+        )
+        y0 = np.array([1.0, 2, 3, -4])
+        np.testing.assert_array_equal(
+            jac.evaluate(t=1, y=y0).toarray(), func.jac(y).evaluate(t=1, y=y0).toarray()
+        )
+        # every nonzero value is in the pattern
+        nonzero = jac.evaluate(t=1, y=y0).toarray() != 0
+        self.assertTrue(np.all(sparsity.toarray()[nonzero]))
+
+        # jacobian that doesn't depend on y
+        jac, sparsity = pybamm.Jacobian().jac_and_sparsity(pybamm.t * u, v)
+        self.assertEqual(sparsity.shape, (2, 2))
+        self.assertEqual(sparsity.nnz, 0)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
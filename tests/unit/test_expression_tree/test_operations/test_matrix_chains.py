@@ -0,0 +1,156 @@
+#
+# Tests for the folding of constant matrix chains
+#
+import pybamm
+
+import numpy as np
+import unittest
+from scipy.sparse import csr_matrix, eye
+
+from tests import get_mesh_for_testing
+
+
+class TestMatrixChainOptimiser(unittest.TestCase):
+    def test_fold_scalings(self):
+        x = pybamm.StateVector(slice(0, 3))
+        A = pybamm.Matrix(csr_matrix(np.array([[1.0, 2, 0], [0, 3, 4]])))
+        v = pybamm.Vector(np.array([1.0, 2, 3]))
+        w = pybamm.Vector(np.array([5.0, 6]))
+        y = np.array([[0.3], [1.7], [-2.0]])
+
+        exprs = [
+            pybamm.MatrixMultiplication(A, pybamm.Multiplication(v, x)),
+            pybamm.MatrixMultiplication(A, pybamm.Multiplication(x, v)),
+            pybamm.MatrixMultiplication(A, pybamm.Division(x, v)),
+            pybamm.MatrixMultiplication(A, pybamm.Negate(x)),
+            pybamm.Multiplication(w, pybamm.MatrixMultiplication(A, x)),
+            pybamm.Division(pybamm.MatrixMultiplication(A, x), w),
+            pybamm.Negate(pybamm.MatrixMultiplication(A, x)),
+            pybamm.Multiplication(
+                w,
+                pybamm.MatrixMultiplication(
+                    A, pybamm.Multiplication(v, pybamm.Negate(x))
+                ),
+            ),
+        ]
+        for expr in exprs:
+            optimiser = pybamm.MatrixChainOptimiser()
+            new_expr = optimiser.optimise(expr)
+            # the scalings are folded into the matrix
+            self.assertIsInstance(new_expr, pybamm.MatrixMultiplication)
+            self.assertIsInstance(new_expr.left, pybamm.Matrix)
+            self.assertEqual(new_expr.right.id, x.id)
+            np.testing.assert_allclose(new_expr.evaluate(y=y), expr.evaluate(y=y))
+            self.assertGreater(optimiser.flops_saved, 0)
+
+        # scalings that change the shape of the argument are not folded
+        p = pybamm.InputParameter("p")
+        expr = pybamm.MatrixMultiplication(A, pybamm.Multiplication(v, p))
+        new_expr = pybamm.MatrixChainOptimiser().optimise(expr)
+        self.assertEqual(new_expr.id, expr.id)
+
+        # products that are also used elsewhere are not scaled
+        product = pybamm.MatrixMultiplication(A, x)
+        expr = pybamm.Multiplication(w, product) + product
+        optimiser = pybamm.MatrixChainOptimiser()
+        self.assertEqual(optimiser.optimise(expr).id, expr.id)
+        self.assertEqual(optimiser.flops_saved, 0)
+
+    def test_fold_matrix_chains(self):
+        x = pybamm.StateVector(slice(0, 3))
+        A = pybamm.Matrix(csr_matrix(np.array([[1.0, 2, 0], [0, 3, 4]])))
+        B = pybamm.Matrix(csr_matrix(np.array([[1.0, 0, 0], [0, 0, 2], [0, 1, 0]])))
+        v = pybamm.Vector(np.array([1.0, 2, 3]))
+        y = np.array([[0.3], [1.7], [-2.0]])
+
+        # A @ (v * (B @ x)) is calculated as (A @ diag(v) @ B) @ x
+        expr = pybamm.MatrixMultiplication(
+            A, pybamm.Multiplication(v, pybamm.MatrixMultiplication(B, x))
+        )
+        optimiser = pybamm.MatrixChainOptimiser()
+        new_expr = optimiser.optimise(expr)
+        self.assertIsInstance(new_expr, pybamm.MatrixMultiplication)
+        self.assertEqual(new_expr.right.id, x.id)
+        np.testing.assert_allclose(new_expr.evaluate(y=y), expr.evaluate(y=y))
+        self.assertEqual(optimiser.flops_before, 4 * 2 + 3 + 3 * 2)
+        self.assertEqual(optimiser.flops_after, 4 * 2)
+
+        # products with more nonzero entries than the chain are not precomputed
+        C = pybamm.Matrix(csr_matrix(np.ones((4, 1))))
+        D = pybamm.Matrix(csr_matrix(np.ones((1, 3))))
+        expr = pybamm.MatrixMultiplication(C, pybamm.MatrixMultiplication(D, x))
+        self.assertEqual(pybamm.MatrixChainOptimiser().optimise(expr).id, expr.id)
+
+    def test_diagonal_matrices(self):
+        x = pybamm.StateVector(slice(0, 3))
+        y = np.array([[0.3], [1.7], [-2.0]])
+
+        # diagonal matrices are replaced by elementwise multiplications
+        D = pybamm.Matrix(csr_matrix(np.diag([1.0, 2, 3])))
+        expr = pybamm.MatrixMultiplication(D, x)
+        new_expr = pybamm.MatrixChainOptimiser().optimise(expr)
+        self.assertIsInstance(new_expr, pybamm.Multiplication)
+        self.assertIsInstance(new_expr.left, pybamm.Vector)
+        np.testing.assert_array_equal(new_expr.evaluate(y=y), expr.evaluate(y=y))
+
+        # identity matrices are removed
+        v = pybamm.Vector(np.array([1.0, 2, 3]))
+        for identity in [pybamm.Matrix(eye(3, format="csr")), pybamm.Matrix(np.eye(3))]:
+            expr = pybamm.MatrixMultiplication(identity, pybamm.exp(x))
+            new_expr = pybamm.MatrixChainOptimiser().optimise(expr)
+            self.assertEqual(new_expr.id, pybamm.exp(x).id)
+            expr = pybamm.MatrixMultiplication(
+                identity, pybamm.Division(pybamm.Multiplication(x, v), v)
+            )
+            new_expr = pybamm.MatrixChainOptimiser().optimise(expr)
+            self.assertEqual(new_expr.id, x.id)
+
+    def test_count_flops(self):
+        x = pybamm.StateVector(slice(0, 3))
+        A = pybamm.Matrix(csr_matrix(np.array([[1.0, 2, 0], [0, 3, 4]])))
+        self.assertEqual(pybamm.count_flops(x), 0)
+        self.assertEqual(pybamm.count_flops(A), 0)
+        # each distinct subexpression is counted once
+        expr = pybamm.exp(x) * pybamm.exp(x) + 2 * pybamm.Index(x, slice(0, 3))
+        self.assertEqual(pybamm.count_flops(expr), 3 + 3 + 3 + 3)
+        expr = pybamm.MatrixMultiplication(A, x)
+        self.assertEqual(pybamm.count_flops(expr), 2 * 4)
+
+    def test_discretised_model(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var", domain=["negative electrode"])
+        x_edge = pybamm.SpatialVariableEdge("x_n", domain=["negative electrode"])
+        model.rhs = {var: pybamm.div(x_edge * pybamm.grad(var) ** 2)}
+        model.initial_conditions = {var: 1}
+        model.boundary_conditions = {
+            var: {"left": (0, "Neumann"), "right": (1, "Dirichlet")}
+        }
+        mesh = get_mesh_for_testing()
+        disc = pybamm.Discretisation(
+            mesh, {"negative electrode": pybamm.FiniteVolume()}
+        )
+        disc.process_model(model)
+
+        # the divergence matrix is scaled by x_edge
+        self.assertIsInstance(model.rhs[var].right, pybamm.Multiplication)
+        self.assertIsInstance(model.concatenated_rhs.children[0].right, pybamm.Power)
+        y = np.linspace(0, 1, model.concatenated_rhs.size)[:, np.newaxis]
+        np.testing.assert_allclose(
+            model.concatenated_rhs.evaluate(y=y),
+            model.rhs[var].evaluate(y=y),
+            rtol=1e-12,
+        )
+        self.assertLess(
+            pybamm.count_flops(model.concatenated_rhs),
+            pybamm.count_flops(model.rhs[var]),
+        )
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -15,27 +15,78 @@ class TestSymbol(unittest.TestCase):
         self.assertEqual(sym.name, "a symbol")
         self.assertEqual(str(sym), "a symbol")
 
-    def test_cached_children(self):
+    def test_children(self):
         symc1 = pybamm.Symbol("child1")
         symc2 = pybamm.Symbol("child2")
-        symc3 = pybamm.Symbol("child3")
         symp = pybamm.Symbol("parent", children=[symc1, symc2])
 
-        # test tuples of children for equality based on their name
-        def check_are_equal(children1, children2):
-            self.assertEqual(len(children1), len(children2))
-            for i in range(len(children1)):
-                self.assertEqual(children1[i].name, children2[i].name)
+        # children are stored in a tuple, and are not copied
+        self.assertIsInstance(symp.children, tuple)
+        self.assertEqual(symp.children, (symc1, symc2))
 
-        check_are_equal(symp.children, super(pybamm.Symbol, symp).children)
-        check_are_equal(symp.children, (symc1, symc2))
+        # the same child can be used by several parents
+        symp2 = pybamm.Symbol("parent2", children=[symc1])
+        self.assertIs(symp2.children[0], symp.children[0])
 
-        # update children, since we cache the children they will be unchanged
-        symc3.parent = symp
-        check_are_equal(symp.children, (symc1, symc2))
+        # nodes are slotted
+        self.assertNotIn("_children", symp.__dict__)
 
-        # check that the *actual* children are updated
-        check_are_equal(super(pybamm.Symbol, symp).children, (symc1, symc2, symc3))
+    def test_pre_order(self):
+        a = pybamm.Symbol("a")
+        b = pybamm.Symbol("b")
+        c = pybamm.Symbol("c")
+        expr = pybamm.Symbol("p", children=[pybamm.Symbol("q", children=[a, b]), c])
+        self.assertEqual(
+            [node.name for node in expr.pre_order()], ["p", "q", "a", "b", "c"]
+        )
+
+        # the traversal doesn't recurse, so works for very deep trees
+        deep = a
+        for _ in range(5000):
+            deep = pybamm.Symbol("n", children=[deep])
+        self.assertEqual(len(list(deep.pre_order())), 5001)
+
+    def test_stable_hash(self):
+        self.assertEqual(pybamm.stable_hash("a", 1), pybamm.stable_hash("a", 1))
+        self.assertNotEqual(pybamm.stable_hash("a", 1), pybamm.stable_hash("a", 2))
+
+        # the hash doesn't depend on the process, so it can be compared with a value
+        # computed before
+        self.assertEqual(pybamm.stable_hash("a", 1), -6002542039282450534)
+        a = pybamm.Symbol("a", domain="negative electrode")
+        self.assertEqual(a.id, 6591650145768825229)
+
+        # arrays with the same entries have the same id
+        self.assertEqual(pybamm.Array(np.arange(3)).id, pybamm.Array(np.arange(3)).id)
+        self.assertNotEqual(
+            pybamm.Array(np.arange(3)).id, pybamm.Array(np.arange(3.0)).id
+        )
+
+    def test_intern_symbol(self):
+        a = pybamm.Symbol("a")
+        expr = pybamm.intern_symbol(a + 1)
+        self.assertIs(pybamm.intern_symbol(pybamm.Symbol("a") + 1), expr)
+        self.assertIsNot(pybamm.intern_symbol(a + 2), expr)
+
+        # functions with the same name but different functions are not shared
+        def f(x):
+            return x
+
+        def g(x):
+            return 2 * x
+
+        g.__name__ = "f"
+        fun = pybamm.intern_symbol(pybamm.Function(f, a))
+        other_fun = pybamm.Function(g, a)
+        self.assertEqual(fun.id, other_fun.id)
+        self.assertIs(pybamm.intern_symbol(other_fun), other_fun)
+
+        # variables with different bounds are not shared
+        var = pybamm.intern_symbol(pybamm.Variable("x", bounds=(0, 1)))
+        other_var = pybamm.Variable("x")
+        self.assertIs(pybamm.intern_symbol(other_var), other_var)
+        self.assertIs(pybamm.intern_symbol(pybamm.Variable("x")), other_var)
+        self.assertIsNot(var, other_var)
 
     def test_symbol_domains(self):
         a = pybamm.Symbol("a", domain="test")
@@ -413,8 +464,7 @@ class TestSymbol(unittest.TestCase):
         summ = a + b
 
         a_orp, b_orp = summ.orphans
-        self.assertIsNone(a_orp.parent)
-        self.assertIsNone(b_orp.parent)
+        self.assertEqual(summ.orphans, summ.children)
         self.assertEqual(a.id, a_orp.id)
         self.assertEqual(b.id, b_orp.id)
 
@@ -481,6 +531,57 @@ class TestSymbol(unittest.TestCase):
         with self.assertRaises(pybamm.ShapeError):
             (y1 + y2).test_shape()
 
+    def test_shape_from_children(self):
+        y = pybamm.StateVector(slice(0, 5))
+        A = pybamm.Matrix(coo_matrix(np.ones((3, 5))))
+        var = pybamm.Variable("var", domain="negative electrode")
+        exprs = [
+            (pybamm.exp(A @ y) * 2, (3, 1)),
+            (pybamm.Index(A @ y, slice(1, 3)), (2, 1)),
+            (pybamm.NumpyConcatenation(y, A @ y), (8, 1)),
+            (pybamm.SparseStack(A, A), (6, 5)),
+            (pybamm.min(y) + pybamm.t, ()),
+            (-var * var, (11, 1)),
+        ]
+        for expr, shape in exprs:
+            self.assertEqual(expr.shape_for_testing, shape)
+            # the shape is found without evaluating the expression
+            self.assertFalse(hasattr(expr, "_saved_evaluate_for_shape"))
+            if not expr.has_symbol_of_classes(pybamm.Variable):
+                self.assertEqual(expr.shape, shape)
+                self.assertEqual(expr._evaluate_shape(), shape)
+
+        self.assertEqual(pybamm.elementwise_shape((3, 1), (), (1, 4)), (3, 4))
+        with self.assertRaisesRegex(ValueError, "inconsistent shapes"):
+            pybamm.elementwise_shape((3, 1), (4, 1))
+        with self.assertRaisesRegex(pybamm.ShapeError, "dimension mismatch"):
+            (A @ A).test_shape()
+        with self.assertRaisesRegex(pybamm.ShapeError, "cannot concatenate"):
+            pybamm.SparseStack(A, pybamm.Matrix(np.ones((2, 4)))).test_shape()
+
+    def test_test_shape_debug_mode(self):
+        # operator for which the shape found from the child is wrong
+        class Flatten(pybamm.UnaryOperator):
+            def __init__(self, child):
+                super().__init__("flatten", child)
+
+            def _unary_evaluate(self, child):
+                return child.flatten()
+
+            def _evaluate_for_shape(self):
+                return self._unary_evaluate(self.child.evaluate_for_shape())
+
+        expr = Flatten(pybamm.StateVector(slice(0, 10)))
+        debug_mode = pybamm.settings.debug_mode
+        try:
+            pybamm.settings.debug_mode = False
+            expr.test_shape()
+            pybamm.settings.debug_mode = True
+            with self.assertRaisesRegex(pybamm.ShapeError, "does not match"):
+                expr.test_shape()
+        finally:
+            pybamm.settings.debug_mode = debug_mode
+
 
 class TestIsZero(unittest.TestCase):
     def test_is_scalar_zero(self):
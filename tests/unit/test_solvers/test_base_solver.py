@@ -2,9 +2,12 @@
 # Tests for the Base Solver class
 #
 import casadi
+import gc
 import pybamm
+import weakref
 import numpy as np
 from scipy.sparse import csr_matrix
+from tests import get_mesh_for_testing
 
 import unittest
 
@@ -279,6 +282,90 @@ class TestBaseSolver(unittest.TestCase):
         self.assertEqual(model.convert_to_format, "casadi")
         pybamm.set_logging_level("WARNING")
 
+    def test_jacobians_memoised_on_model(self):
+        model = pybamm.BaseModel()
+        a = pybamm.Variable("a")
+        b = pybamm.Variable("b")
+        model.rhs = {a: a * b}
+        model.algebraic = {b: b - 2}
+        model.initial_conditions = {a: 1, b: 2}
+        model.convert_to_format = "python"
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        pybamm.BaseSolver().set_up(model)
+        jacobians = {
+            name: jac for name, (_, jac, _) in model._set_up_jacobians.items()
+        }
+        self.assertEqual(set(jacobians), {"RHS", "algebraic", "residuals"})
+
+        # setting up the same model again (here with another solver) doesn't
+        # differentiate the equations again
+        pybamm.BaseSolver(rtol=1e-3).set_up(model)
+        for name, (_, jac, _) in model._set_up_jacobians.items():
+            self.assertIs(jac, jacobians[name])
+
+        # new equations are differentiated again
+        model.concatenated_rhs = -model.concatenated_rhs
+        pybamm.BaseSolver().set_up(model)
+        jac = model._set_up_jacobians["RHS"][1]
+        self.assertIsNot(jac, jacobians["RHS"])
+        np.testing.assert_array_equal(
+            model.jacobian_eval(0, np.array([1.0, 2]), {}).toarray(),
+            np.array([[-2.0, -1], [0, 1]]),
+        )
+
+        # models that don't use their Jacobian don't calculate it
+        model = pybamm.BaseModel()
+        model.rhs = {a: a * b, b: -b}
+        model.initial_conditions = {a: 1, b: 2}
+        model.convert_to_format = "python"
+        model.use_jacobian = False
+        pybamm.Discretisation().process_model(model)
+        pybamm.BaseSolver().set_up(model)
+        self.assertEqual(model._set_up_jacobians, {})
+        self.assertIsNone(model.jacobian_sparsity)
+
+    def test_casadi_common_subexpressions(self):
+        # a * b and b * a are only calculated once by the casadi functions
+        model = pybamm.BaseModel()
+        a = pybamm.Variable("a")
+        b = pybamm.Variable("b")
+        model.rhs = {
+            a: pybamm.exp(pybamm.Multiplication(a, b))
+            + pybamm.sin(pybamm.Multiplication(b, a)),
+            b: -b,
+        }
+        model.initial_conditions = {a: 1, b: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # and by the python code
+        model.convert_to_format = "python"
+        pybamm.BaseSolver().set_up(model)
+        python_str = model.rhs_eval._function.__self__._python_str
+        self.assertEqual(python_str.count(" * "), 1)
+
+        model.convert_to_format = "casadi"
+        pybamm.CasadiSolver().set_up(model)
+
+        t = casadi.MX.sym("t")
+        y = casadi.MX.sym("y", 2)
+        p = casadi.MX.sym("p", 0)
+        rhs = model.concatenated_rhs
+        without_elimination = casadi.Function(
+            "rhs", [t, y, p], [rhs.to_casadi(t=t, y=y)]
+        )
+        self.assertEqual(
+            model.rhs_eval._function.n_instructions(),
+            without_elimination.n_instructions() - 1,
+        )
+        y0 = np.array([0.5, 2])
+        np.testing.assert_allclose(
+            np.array(model.rhs_eval(0, y0, casadi.vertcat())).flatten(),
+            rhs.evaluate(y=y0).flatten(),
+        )
+
     def test_timescale_input_fail(self):
         # Make sure timescale can't depend on inputs
         model = pybamm.BaseModel()
@@ -322,6 +409,141 @@ class TestBaseSolver(unittest.TestCase):
         with self.assertWarns(pybamm.SolverWarning):
             solver.solve(model, t_eval=[0, 1])
 
+    def test_check_extrapolation_sub_solutions(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        model.rhs = {v: -1}
+        model.initial_conditions = {v: 1}
+        model.events = [
+            pybamm.Event(
+                "Late event",
+                v - 0.25,
+                pybamm.EventType.INTERPOLANT_EXTRAPOLATION,
+            ),
+            pybamm.Event(
+                "Ignored event",
+                v + 10,
+                pybamm.EventType.INTERPOLANT_EXTRAPOLATION,
+            ),
+        ]
+        solver = pybamm.ScipySolver()
+        solver.set_up(model)
+        # Only the second sub-solution goes below v = 0.25
+        t1 = np.linspace(0, 0.5, 10)
+        t2 = np.linspace(0.6, 1, 10)
+        solution = pybamm.Solution(
+            [t1, t2], [1 - t1[np.newaxis, :], 1 - t2[np.newaxis, :]], model, [{}, {}]
+        )
+        extrapolation = solver.check_extrapolation(solution, model.events)
+        self.assertEqual(extrapolation, ["Late event"])
+        self.assertEqual(
+            solution.extrap_events, {"Late event": True, "Ignored event": False}
+        )
+
+        solution = pybamm.Solution(t1, 1 - t1[np.newaxis, :], model, {})
+        self.assertEqual(solver.check_extrapolation(solution, model.events), [])
+
+    def test_fused_events(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v", domain="negative electrode")
+        a = pybamm.InputParameter("a")
+        model.rhs = {v: -a}
+        model.initial_conditions = {v: 1}
+        model.events = [
+            pybamm.Event("v = 0.5", pybamm.min(v - 0.5)),
+            pybamm.Event("t = a", a - pybamm.t),
+            pybamm.Event(
+                "Extrapolation", v + 1, pybamm.EventType.INTERPOLANT_EXTRAPOLATION
+            ),
+        ]
+        mesh = get_mesh_for_testing()
+        disc = pybamm.Discretisation(
+            mesh, {"negative electrode": pybamm.FiniteVolume()}
+        )
+        disc.process_model(model)
+        solver = pybamm.ScipySolver()
+        solver.set_up(model, inputs={"a": 2})
+
+        events_eval = model.terminate_events_eval
+        self.assertEqual(len(events_eval), 2)
+        self.assertEqual(
+            [event.name for event in events_eval.events], ["v = 0.5", "t = a"]
+        )
+        self.assertEqual(len(model.interpolant_extrapolation_events_eval), 1)
+
+        y = np.linspace(0.6, 0.9, model.concatenated_initial_conditions.size)
+        np.testing.assert_allclose(events_eval(1, y, {"a": 2}), [0.1, 1])
+        np.testing.assert_allclose(events_eval(1, y, casadi.DM(3)), [0.1, 2])
+
+        # Evaluate at several times at once
+        ts = np.array([0, 1, 2])
+        ys = np.column_stack([y, y - 0.1, y - 0.2])
+        np.testing.assert_allclose(
+            events_eval.evaluate_at_times(ts, ys, {"a": 2}),
+            [[0.1, 0, -0.1], [2, 1, 0]],
+            atol=1e-14,
+        )
+
+    def test_worker_pool_reused(self):
+        model = pybamm.BaseModel()
+        v = pybamm.Variable("v")
+        model.rhs = {v: -pybamm.InputParameter("rate") * v}
+        model.initial_conditions = {v: 1}
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        t_eval = np.linspace(0, 1, 10)
+        inputs_list = [{"rate": 0.1 * (i + 1)} for i in range(4)]
+
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        pool = solver._worker_pool[0]
+        for i, solution in enumerate(solutions):
+            self.assertIs(solution.model, model)
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-0.1 * (i + 1) * t_eval), rtol=1e-6
+            )
+
+        # Second call re-uses the same pool
+        solutions = solver.solve(model, t_eval, inputs=inputs_list[::-1], nproc=2)
+        self.assertIs(solver._worker_pool[0], pool)
+        np.testing.assert_allclose(solutions[0].y[0], np.exp(-0.4 * t_eval), rtol=1e-6)
+
+        # Changing the number of processes restarts the pool
+        solver.solve(model, t_eval, inputs=inputs_list, nproc=3)
+        self.assertIsNot(solver._worker_pool[0], pool)
+
+        # Changing the solver restarts the pool, so the workers use the new tolerances
+        pool = solver._worker_pool[0]
+        solver.rtol = solver.atol = 1e-3
+        loose_solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=3)
+        self.assertIsNot(solver._worker_pool[0], pool)
+        for inputs, solution in zip(inputs_list, loose_solutions):
+            single = solver.solve(model, t_eval, inputs=inputs)
+            np.testing.assert_array_equal(solution.y, single.y)
+        pool = solver._worker_pool[0]
+        solver.extra_options["max_step"] = 0.01
+        solver.solve(model, t_eval, inputs=inputs_list, nproc=3)
+        self.assertIsNot(solver._worker_pool[0], pool)
+        del solver.extra_options["max_step"]
+
+        # Copies of the solver don't share the pool
+        self.assertIsNone(solver.copy()._worker_pool)
+
+        # Setting up the model again restarts the pool
+        solver.set_up(model, inputs=inputs_list[0])
+        self.assertIsNone(solver._worker_pool)
+
+        solver.terminate_workers()
+        self.assertIsNone(solver._worker_pool)
+
+        # Deleting the solver stops the worker processes
+        solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        pool = solver._worker_pool[0]
+        solver_ref = weakref.ref(solver)
+        del solver
+        gc.collect()
+        self.assertIsNone(solver_ref())
+        pool.join()
+        self.assertFalse(any(process.is_alive() for process in pool._pool))
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
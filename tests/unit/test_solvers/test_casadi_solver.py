@@ -1,6 +1,7 @@
 #
 # Tests for the Casadi Solver class
 #
+import casadi
 import pybamm
 import unittest
 import numpy as np
@@ -52,6 +53,41 @@ class TestCasadiSolver(unittest.TestCase):
             solution.y.full()[0], np.exp(0.1 * solution.t), decimal=5
         )
 
+    def test_solver_stats(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("an event", var + 1)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 1, 100)
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8)
+        solution = solver.solve(model, t_eval)
+        stats = solution.solver_stats
+        self.assertGreater(stats["number of steps"], 0)
+        self.assertGreater(stats["number of RHS evaluations"], 0)
+        self.assertGreater(stats["number of event evaluations"], 0)
+        # All the global steps have the same shape, so share one integrator
+        self.assertEqual(stats["number of integrator creations"], 1)
+        self.assertIn("RHS set-up time", stats)
+        self.assertIn("events set-up time", stats)
+
+        # Set-up is not repeated, so its time is only reported the first time
+        solution = solver.solve(model, t_eval)
+        self.assertNotIn("RHS set-up time", solution.solver_stats)
+        # The integrators are reused
+        self.assertEqual(solution.solver_stats["number of integrator creations"], 0)
+
+        # Stepping adds the statistics of each step
+        step_sol = solver.step(None, model, 0.5)
+        step_sol = solver.step(step_sol, model, 0.5)
+        self.assertEqual(
+            step_sol.solver_stats["number of steps"],
+            sum(sol.solver_stats["number of steps"] for sol in step_sol.sub_solutions),
+        )
+
     def test_model_solver_python(self):
         # Create model
         pybamm.set_logging_level("ERROR")
@@ -178,6 +214,133 @@ class TestCasadiSolver(unittest.TestCase):
         np.testing.assert_array_less(solution.y.full()[0], 1.02 + 1e-10)
         np.testing.assert_array_almost_equal(solution.y[0, -1], 1.02, decimal=2)
 
+    def test_event_location(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -var}
+        model.initial_conditions = {var: 1}
+        model.events = [
+            pybamm.Event("var = 0.5", var - 0.5),
+            pybamm.Event("var = 0.3", var - 0.3),
+        ]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # The event is located to solver tolerance, even with a coarse t_eval
+        for mode in ["safe", "safe without grid"]:
+            solver = pybamm.CasadiSolver(mode=mode, rtol=1e-10, atol=1e-10)
+            solution = solver.solve(model, np.linspace(0, 2, 5))
+            self.assertEqual(solution.termination, "event: var = 0.5")
+            self.assertAlmostEqual(solution.t_event[0], np.log(2), places=8)
+            self.assertAlmostEqual(solution.y_event[0, 0], 0.5, places=8)
+            self.assertEqual(solution.t[-1], solution.t_event[0])
+
+        # The event time is located to the tolerance, whatever the scale of the
+        # event values compared with the absolute tolerance of the states
+        model = pybamm.BaseModel()
+        model.rhs = {var: -var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("small event", 1e-12 * (var - 0.5))]
+        disc.process_model(model)
+        solver = pybamm.CasadiSolver(rtol=1e-10, atol=1e-10)
+        solution = solver.solve(model, np.linspace(0, 2, 5))
+        self.assertEqual(solution.termination, "event: small event")
+        self.assertAlmostEqual(solution.t_event[0], np.log(2), places=8)
+
+        # An event that is crossed at the start of the window (here, exactly zero
+        # initially) is located there, without searching for it
+        model = pybamm.BaseModel()
+        model.rhs = {var: -var}
+        model.initial_conditions = {var: 1}
+        model.events = [
+            pybamm.Event("var = 1", var - 1),
+            pybamm.Event("var = 0.5", var - 0.5),
+        ]
+        disc.process_model(model)
+        solver = pybamm.CasadiSolver()
+        solver.set_up(model)
+        inputs = casadi.vertcat()
+        init_event_signs = np.sign(
+            model.terminate_events_eval(0, np.array([1.0]), inputs)
+        )
+        ts = np.array([0, 0.5, 1])
+        # the last state is not the solution, so is wrong if it is integrated from
+        step_sol = pybamm.Solution(ts, casadi.DM([[1, np.exp(-0.5), 5]]), model, {})
+        step_sol.integration_time = 0
+        t_event, y_event = solver._locate_event(
+            model, step_sol, {}, inputs, init_event_signs
+        )
+        self.assertEqual(t_event, 0)
+        np.testing.assert_array_equal(y_event, [1])
+
+    def test_adaptive_dt_max(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var = 0.5", var - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 1001)
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8)
+        solution = solver.solve(model, t_eval)
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8, dt_max="adaptive")
+        adaptive_solution = solver.solve(model, t_eval)
+
+        self.assertEqual(adaptive_solution.termination, "event: var = 0.5")
+        self.assertAlmostEqual(adaptive_solution.t_event[0], 10 * np.log(2), places=5)
+        # same output times, except for the event time (which is more accurate with
+        # fewer global steps)
+        np.testing.assert_array_equal(adaptive_solution.t[:-1], solution.t[:-1])
+        np.testing.assert_array_almost_equal(
+            adaptive_solution.y.full()[0], np.exp(-0.1 * adaptive_solution.t)
+        )
+        self.assertLess(
+            adaptive_solution.solver_stats["number of global steps"],
+            solution.solver_stats["number of global steps"] / 5,
+        )
+
+    def test_adaptive_dt_max_multiple_inputs(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        rate = pybamm.InputParameter("rate")
+        model.rhs = {var: -rate * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var = 0.5", var - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 1001)
+        rates = [0.01, 0.1, 0.2]
+        inputs_list = [{"rate": rate} for rate in rates]
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8)
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8, dt_max="adaptive")
+        adaptive_solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+
+        for rate, solution, adaptive_solution in zip(
+            rates, solutions, adaptive_solutions
+        ):
+            with self.subTest(rate=rate):
+                np.testing.assert_array_almost_equal(
+                    adaptive_solution.y.full()[0], np.exp(-rate * adaptive_solution.t)
+                )
+                if rate > 0.07:
+                    self.assertEqual(adaptive_solution.termination, "event: var = 0.5")
+                    self.assertAlmostEqual(
+                        adaptive_solution.t_event[0], np.log(2) / rate, places=4
+                    )
+                else:
+                    self.assertEqual(adaptive_solution.termination, "final time")
+                    np.testing.assert_array_equal(adaptive_solution.t, t_eval)
+                # the input sets integrated together take the smallest of their
+                # predicted steps, which is still larger than the default step
+                self.assertLess(
+                    adaptive_solution.solver_stats["number of global steps"],
+                    solution.solver_stats["number of global steps"],
+                )
+
     def test_model_step(self):
         # Create model
         model = pybamm.BaseModel()
@@ -331,6 +494,60 @@ class TestCasadiSolver(unittest.TestCase):
             solution.y.full()[0], np.exp(-1.1 * solution.t), rtol=1e-04
         )
 
+    def test_model_solver_multiple_inputs(self):
+        # Create model
+        model = pybamm.BaseModel()
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var1 = pybamm.Variable("var1", domain=domain)
+        var2 = pybamm.Variable("var2", domain=domain)
+        rate = pybamm.InputParameter("rate")
+        model.rhs = {var1: -rate * var1}
+        model.algebraic = {var2: 2 * var1 - var2}
+        model.initial_conditions = {var1: 1, var2: 2}
+        model.events = [pybamm.Event("var1=0.5", pybamm.min(var1 - 0.5))]
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 100)
+        # The event is only triggered for the last two input sets
+        rates = [0.01, 0.05, 0.1, 0.2]
+        inputs_list = [{"rate": rate} for rate in rates]
+        for mode in ["fast", "safe"]:
+            solver = pybamm.CasadiSolver(mode=mode, rtol=1e-8, atol=1e-8)
+            solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+            # the input sets are solved in threads, not in worker processes
+            self.assertIsNone(solver._worker_pool)
+            for rate, solution in zip(rates, solutions):
+                with self.subTest(mode=mode, rate=rate):
+                    y = solution.y.full()
+                    np.testing.assert_allclose(
+                        y[0], np.exp(-rate * solution.t), rtol=1e-4
+                    )
+                    np.testing.assert_allclose(y[-1], 2 * y[0], rtol=1e-4)
+                    if mode == "safe" and rate > 0.07:
+                        self.assertEqual(solution.termination, "event: var1=0.5")
+                        self.assertAlmostEqual(
+                            solution.t[-1], np.log(2) / rate, places=4
+                        )
+                    else:
+                        self.assertEqual(solution.termination, "final time")
+                        np.testing.assert_array_equal(solution.t, t_eval)
+                    if mode == "safe":
+                        # the mapped integrator doesn't report its statistics, so
+                        # they are left out rather than partly counted
+                        stats = solution.solver_stats
+                        self.assertNotIn("number of steps", stats)
+                        self.assertGreater(stats["number of event evaluations"], 0)
+                        single_solution = solver.solve(
+                            model, t_eval, inputs={"rate": rate}
+                        )
+                        self.assertEqual(
+                            stats["number of global steps"],
+                            single_solution.solver_stats["number of global steps"],
+                        )
+
     def test_model_solver_dae_inputs_in_initial_conditions(self):
         # Create model
         model = pybamm.BaseModel()
@@ -498,6 +715,20 @@ class TestCasadiSolver(unittest.TestCase):
         with self.assertRaisesRegex(pybamm.SolverError, "interpolation bounds"):
             solver.solve(model, t_eval=[0, 1])
 
+        # The extrapolation is checked at the end of each global step, at the time
+        # of the final state
+        model = pybamm.BaseModel()
+        model.rhs = {v: -1}
+        model.initial_conditions = {v: 1}
+        model.events.append(
+            pybamm.Event(
+                "Time event", 1 - pybamm.t, pybamm.EventType.INTERPOLANT_EXTRAPOLATION
+            )
+        )
+        solver = pybamm.CasadiSolver(mode="safe", dt_max=0.5)
+        with self.assertRaisesRegex(pybamm.SolverError, "interpolation bounds"):
+            solver.solve(model, t_eval=np.linspace(0, 1.5, 4))
+
 
 class TestCasadiSolverSensitivity(unittest.TestCase):
     def test_solve_with_symbolic_input(self):
@@ -132,6 +132,13 @@ class TestScikitsSolvers(unittest.TestCase):
         np.testing.assert_array_equal(solution.t, t_eval)
         np.testing.assert_allclose(solution.y[0], np.exp(0.1 * solution.t))
 
+        # statistics of the CVODE integrator
+        stats = solution.solver_stats
+        self.assertGreater(stats["number of steps"], 0)
+        self.assertGreater(stats["number of linear solver setups"], 0)
+        self.assertIn("number of error test failures", stats)
+        self.assertGreater(stats["number of RHS evaluations"], stats["number of steps"])
+
     def test_model_solver_ode_events_python(self):
         model = pybamm.BaseModel()
         model.convert_to_format = "python"
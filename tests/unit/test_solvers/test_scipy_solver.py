@@ -363,6 +363,66 @@ class TestScipySolver(unittest.TestCase):
         )
         np.testing.assert_allclose(solution.y[0], 1 - 0.5 * solution.t, rtol=1e-06)
 
+    def test_model_solver_jacobian_sparsity(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "python"
+        model.use_jacobian = False
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=whole_cell)
+        model.rhs = {var: pybamm.div(pybamm.grad(var))}
+        model.boundary_conditions = {
+            var: {"left": (0, "Neumann"), "right": (0, "Neumann")}
+        }
+        model.initial_conditions = {
+            var: pybamm.exp(-pybamm.SpatialVariable("x", whole_cell))
+        }
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+
+        # the Jacobian is approximated by finite differences, using the sparsity
+        # pattern of the symbolic Jacobian
+        t_eval = np.linspace(0, 1, 10)
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8)
+        solution = solver.solve(model, t_eval)
+        n = model.concatenated_rhs.size
+        self.assertEqual(model.jacobian_sparsity.shape, (n, n))
+        self.assertEqual(model.jacobian_sparsity.nnz, 3 * n - 2)
+
+        # compare with a dense finite-difference Jacobian
+        solver = pybamm.ScipySolver(
+            rtol=1e-8, atol=1e-8, extra_options={"jac_sparsity": None}
+        )
+        dense_solution = solver.solve(model, t_eval)
+        self.assertIsNone(model.jacobian_sparsity)
+        np.testing.assert_allclose(solution.y, dense_solution.y, rtol=1e-6)
+        self.assertLess(
+            solution.solver_stats["number of RHS evaluations"],
+            dense_solution.solver_stats["number of RHS evaluations"],
+        )
+        # statistics of solve_ivp, including the Jacobians approximated by finite
+        # differences
+        stats = solution.solver_stats
+        self.assertGreater(stats["number of steps"], 0)
+        self.assertGreater(stats["number of LU decompositions"], 0)
+        self.assertGreater(stats["number of Jacobian evaluations"], 0)
+        self.assertGreater(stats["number of RHS evaluations"], stats["number of steps"])
+
+        # methods that don't use the sparsity pattern don't calculate it
+        solver = pybamm.ScipySolver(method="RK45", rtol=1e-8, atol=1e-8)
+        solution = solver.solve(model, t_eval)
+        self.assertIsNone(model.jacobian_sparsity)
+        self.assertGreater(solution.solver_stats["number of steps"], 0)
+        self.assertNotIn("number of LU decompositions", solution.solver_stats)
+
+        # the symbolic Jacobian is counted when it is evaluated
+        model.use_jacobian = True
+        solution = pybamm.ScipySolver(rtol=1e-8, atol=1e-8).solve(model, t_eval)
+        stats = solution.solver_stats
+        self.assertGreater(stats["number of Jacobian evaluations"], 0)
+        self.assertGreater(stats["number of LU decompositions"], 0)
+
     def test_model_solver_with_event_with_casadi(self):
         # Create model
         model = pybamm.BaseModel()
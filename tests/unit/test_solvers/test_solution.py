@@ -39,6 +39,7 @@ class TestSolution(unittest.TestCase):
         sol1 = pybamm.Solution(t1, y1, pybamm.BaseModel(), {"a": 1})
         sol1.solve_time = 1.5
         sol1.integration_time = 0.3
+        sol1.solver_stats = {"number of steps": 10, "RHS set-up time": 0.1}
 
         # Set up second solution
         t2 = np.linspace(1, 2)
@@ -46,11 +47,22 @@ class TestSolution(unittest.TestCase):
         sol2 = pybamm.Solution(t2, y2, pybamm.BaseModel(), {"a": 2})
         sol2.solve_time = 1
         sol2.integration_time = 0.5
+        sol2.solver_stats = {"number of steps": 5, "number of RHS evaluations": 7}
         sol_sum = sol1 + sol2
 
         # Test
         self.assertEqual(sol_sum.solve_time, 2.5)
         self.assertEqual(sol_sum.integration_time, 0.8)
+        self.assertEqual(
+            sol_sum.solver_stats,
+            {
+                "number of steps": 15,
+                "number of RHS evaluations": 7,
+                "RHS set-up time": 0.1,
+            },
+        )
+        # Statistics of the original solutions are unchanged
+        self.assertEqual(sol1.solver_stats["number of steps"], 10)
         np.testing.assert_array_equal(sol_sum.t, np.concatenate([t1, t2[1:]]))
         np.testing.assert_array_equal(
             sol_sum.y, np.concatenate([y1, y2[:, 1:]], axis=1)
@@ -70,7 +82,9 @@ class TestSolution(unittest.TestCase):
         t3 = np.array([2])
         y3 = np.ones((20, 1))
         sol3 = pybamm.Solution(t3, y3, pybamm.BaseModel(), {"a": 3})
+        sol3.solver_stats = {"number of steps": 1}
         self.assertEqual((sol_sum + sol3).all_ts, sol_sum.copy().all_ts)
+        self.assertEqual((sol_sum + sol3).solver_stats["number of steps"], 16)
 
     def test_copy(self):
         # Set up first solution
@@ -81,6 +95,7 @@ class TestSolution(unittest.TestCase):
         sol1.set_up_time = 0.5
         sol1.solve_time = 1.5
         sol1.integration_time = 0.3
+        sol1.solver_stats = {"number of steps": 10}
 
         sol_copy = sol1.copy()
         self.assertEqual(sol_copy.all_ts, sol1.all_ts)
@@ -90,6 +105,8 @@ class TestSolution(unittest.TestCase):
         self.assertEqual(sol_copy.set_up_time, sol1.set_up_time)
         self.assertEqual(sol_copy.solve_time, sol1.solve_time)
         self.assertEqual(sol_copy.integration_time, sol1.integration_time)
+        self.assertEqual(sol_copy.solver_stats, sol1.solver_stats)
+        self.assertIsNot(sol_copy.solver_stats, sol1.solver_stats)
 
     def test_cycles(self):
         model = pybamm.lithium_ion.SPM()
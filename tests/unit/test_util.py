@@ -3,6 +3,7 @@
 #
 import numpy as np
 import os
+import pickle
 import pybamm
 import tempfile
 import unittest
@@ -86,6 +87,48 @@ class TestUtil(unittest.TestCase):
         with self.assertRaisesRegex(KeyError, "'test3' not found. Best matches are "):
             d["test3"]
 
+    def test_lazy_fuzzy_dict(self):
+        processed = []
+
+        def process(value):
+            processed.append(value)
+            return 10 * value
+
+        d = pybamm.LazyFuzzyDict({"test": 1, "test2": 2}, process)
+        self.assertEqual(len(d), 2)
+        self.assertIn("test", d)
+        self.assertEqual(processed, [])
+
+        # values are processed once, when first accessed
+        self.assertEqual(d["test"], 10)
+        self.assertEqual(d["test"], 10)
+        self.assertEqual(processed, [1])
+        self.assertTrue(d.is_processed("test"))
+        self.assertFalse(d.is_processed("test2"))
+        self.assertEqual(list(d.raw_values()), [10, 2])
+        with self.assertRaisesRegex(KeyError, "'test3' not found. Best matches are "):
+            d["test3"]
+
+        # copies are processed independently
+        d_copy = d.copy()
+        self.assertEqual(d_copy.get("test2"), 20)
+        self.assertFalse(d.is_processed("test2"))
+
+        # new values are not processed
+        d["test3"] = 3
+        self.assertEqual(d.get("test3"), 3)
+        self.assertEqual(dict(d), {"test": 10, "test2": 20, "test3": 3})
+        self.assertEqual(list(d.values()), [10, 20, 3])
+        self.assertEqual(d, {"test": 10, "test2": 20, "test3": 3})
+        self.assertEqual(d.pop("test3"), 3)
+        self.assertIsNone(d.pop("test3", None))
+
+        # pickled as a FuzzyDict of processed values
+        d = pybamm.LazyFuzzyDict({"test": 1}, abs)
+        d_pickled = pickle.loads(pickle.dumps(d))
+        self.assertIs(type(d_pickled), pybamm.FuzzyDict)
+        self.assertEqual(d_pickled, {"test": 1})
+
     def test_get_parameters_filepath(self):
         tempfile_obj = tempfile.NamedTemporaryFile("w", dir=".")
         self.assertTrue(